@@ -0,0 +1,242 @@
+"""
+종단간(end-to-end) 처리량/지연 벤치마크
+
+    python -m benchmarks.bench_e2e --concurrency 1,4,16,64 --requests 400 --cells 50 --save
+    python -m benchmarks.bench_e2e --compare benchmarks/results/<이전 결과>.json
+
+로컬 가짜 기상청 서버(benchmarks.fake_kma)를 띄운 뒤 다음 경로를 동시성 단계별로 호출합니다.
+- get_current_weather   : 도구 함수를 직접 호출 (격자 변환 -> 캐시/업스트림 -> 파싱 -> 문자열 생성)
+- get_coords_by_city    : 지역명 조회
+- mcp:get_current_weather: 메모리 내 MCP 클라이언트 세션을 통한 전체 도구 호출 경로
+
+초당 요청 수, p50/p95/p99 지연, 단계별 평균 시간을 출력하며 --save로 결과를 저장해
+다른 커밋의 결과와 --compare로 비교할 수 있습니다. 각 단계는 새 서버 수명(빈 캐시)으로 시작합니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StageTimer:
+    """weather_server의 단계별 함수를 감싸 호출 시간을 모읍니다."""
+
+    def __init__(self, module, sync_stages, async_stages):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        for stage, name in sync_stages.items():
+            setattr(module, name, self._wrap_sync(stage, getattr(module, name)))
+        for stage, name in async_stages.items():
+            setattr(module, name, self._wrap_async(stage, getattr(module, name)))
+
+    def _wrap_sync(self, stage, fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+                self.counts[stage] += 1
+        return wrapper
+
+    def _wrap_async(self, stage, fn):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+                self.counts[stage] += 1
+        return wrapper
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+
+    def snapshot(self) -> dict:
+        return {stage: {"calls": self.counts[stage], "mean_ms": self.totals[stage] / self.counts[stage] * 1000}
+                for stage in self.counts}
+
+
+async def run_load(call, workload, concurrency):
+    """workload의 인자들을 concurrency개의 작업자로 나눠 호출하고 지연 시간을 측정합니다."""
+    latencies, errors = [], 0
+    queue = iter(workload)
+
+    async def worker():
+        nonlocal errors
+        for args in queue:
+            start = time.perf_counter()
+            ok = await call(*args)
+            latencies.append(time.perf_counter() - start)
+            errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {"requests": len(latencies), "errors": errors, "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000, "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000}
+
+
+def is_ok(text: str) -> bool:
+    return not (text.startswith("오류") or "실패했습니다" in text)
+
+
+def start_fake_server(args) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, '-m', 'benchmarks.fake_kma', '--port', str(args.port),
+                             '--latency', str(args.latency), '--jitter', str(args.jitter),
+                             '--error-rate', str(args.error_rate)])
+    import httpx
+    for _ in range(100):
+        try:
+            httpx.get(f'http://127.0.0.1:{args.port}/stats', timeout=0.2)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("가짜 기상청 서버를 시작하지 못했습니다.")
+
+
+async def benchmark(args) -> list[dict]:
+    import weather_server as ws
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from weather_grid import KMA_GRID
+
+    ws.URL = f'http://127.0.0.1:{args.port}/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
+    timer = StageTimer(ws, {"grid": "convert_to_grid", "parse": "parse_ultra_short_term_weather",
+                            "render": "format_weather_report"},
+                       {"upstream": "st_forecast"})
+
+    rng = random.Random(args.seed)
+    cells = [(rng.randint(55, 100), rng.randint(70, 130)) for _ in range(args.cells)]
+    lats, lons = KMA_GRID.inverse([c[0] for c in cells], [c[1] for c in cells])
+    points = list(zip(lats.tolist(), lons.tolist()))
+    workload = [rng.choice(points) for _ in range(args.requests)]
+    cities = [(rng.choice(["서울", "부산", "대", "ㅈㅈ", "없는곳"]),) for _ in range(args.requests)]
+
+    runs = []
+
+    def record(scenario, concurrency, result):
+        result.update(scenario=scenario, concurrency=concurrency, stages=timer.snapshot())
+        runs.append(result)
+        print(f"{scenario:<26}{concurrency:>6}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+    print(f"{'시나리오':<22}{'동시성':>6}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'오류':>6}")
+    for concurrency in args.concurrency:
+        async with ws.app_lifespan(ws.mcp) as app:
+            ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=app))
+
+            async def call_weather(lat, lon):
+                return is_ok(await ws.get_current_weather(ctx, lat, lon))
+
+            async def call_city(city):
+                return is_ok(await ws.get_coords_by_city(city))
+
+            timer.reset()
+            record("get_current_weather", concurrency, await run_load(call_weather, workload, concurrency))
+            timer.reset()
+            record("get_coords_by_city", concurrency, await run_load(call_city, cities, concurrency))
+
+        async with create_connected_server_and_client_session(ws.mcp._mcp_server) as client:
+            async def call_mcp(lat, lon):
+                result = await client.call_tool('get_current_weather', {'lat': lat, 'lon': lon})
+                return not result.isError and is_ok(result.content[0].text)
+
+            timer.reset()
+            record("mcp:get_current_weather", concurrency, await run_load(call_mcp, workload, concurrency))
+    return runs
+
+
+def print_stages(runs):
+    print("\n단계별 평균 시간(ms) [호출 수]")
+    for run in runs:
+        if not run["stages"]: continue
+        stages = ", ".join(f"{name} {s['mean_ms']:.3f} [{s['calls']}]" for name, s in sorted(run["stages"].items()))
+        print(f"- {run['scenario']} x{run['concurrency']}: {stages}")
+
+
+def compare(runs, previous_path):
+    previous = json.loads(Path(previous_path).read_text(encoding='utf-8'))
+    before = {(r["scenario"], r["concurrency"]): r for r in previous["runs"]}
+    print(f"\n비교 대상: {previous_path} ({previous['meta'].get('commit')})")
+    for run in runs:
+        old = before.get((run["scenario"], run["concurrency"]))
+        if old is None: continue
+        print(f"- {run['scenario']} x{run['concurrency']}: "
+              f"req/s {old['rps']:.1f} -> {run['rps']:.1f} ({(run['rps'] / old['rps'] - 1) * 100:+.1f}%), "
+              f"p95 {old['p95_ms']:.2f} -> {run['p95_ms']:.2f} ms")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', default='1,4,16,64', help='쉼표로 구분한 동시성 단계')
+    parser.add_argument('--requests', type=int, default=400, help='단계별 요청 수')
+    parser.add_argument('--cells', type=int, default=50, help='요청이 분포할 서로 다른 격자 수')
+    parser.add_argument('--latency', type=float, default=0.05, help='가짜 서버 평균 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.01, help='가짜 서버 지연 표준편차(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='가짜 서버 오류 비율')
+    parser.add_argument('--data-type', default='JSON', choices=['JSON', 'XML'])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', action='store_true', help='결과를 benchmarks/results/에 저장')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+    args = parser.parse_args()
+    args.concurrency = [int(c) for c in args.concurrency.split(',')]
+
+    # weather_server는 가져올 때 환경 변수를 읽으므로 먼저 설정합니다.
+    os.environ.setdefault('KOREA_WEATHER_API_KEY', 'benchmark')
+    os.environ['KOREA_WEATHER_DATA_TYPE'] = args.data_type
+    os.environ.setdefault('KOREA_WEATHER_PREFETCH_TOP_K', '0')
+    os.environ.setdefault('KOREA_WEATHER_UPSTREAM_RATE', '100000')
+    os.environ.setdefault('KOREA_WEATHER_UPSTREAM_BURST', '100000')
+
+    server = start_fake_server(args)
+    try:
+        runs = asyncio.run(benchmark(args))
+    finally:
+        server.terminate()
+        server.wait()
+    print_stages(runs)
+
+    if args.compare:
+        compare(runs, args.compare)
+    if args.save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        commit = git_commit()
+        path = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+        meta = {"commit": commit, "timestamp": datetime.now().isoformat(timespec='seconds'),
+                "args": {k: v for k, v in vars(args).items() if k not in ('save', 'compare')}}
+        path.write_text(json.dumps({"meta": meta, "runs": runs}, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
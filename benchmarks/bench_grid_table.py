@@ -0,0 +1,119 @@
+"""
+위경도 -> 격자 조회 표(GridLookupTable)와 직접 계산(LCCProjection)의 처리량/메모리 비교 벤치마크
+
+    python -m benchmarks.bench_grid_table --resolution 0.001 --points 1000000
+
+--table을 주지 않으면 임시 디렉터리에 --resolution 해상도의 표를 만들어 사용합니다.
+- 단일 좌표: KMA_GRID.to_grid 와 GridLookupTable.to_grid 의 초당 처리량
+            (표는 페이지를 처음 읽는 첫 회와, 읽은 페이지가 메모리에 남아 있는 두 번째 회를 따로 잽니다)
+- 배열     : KMA_GRID.forward 와 GridLookupTable.forward 의 초당 처리량
+- 결과 불일치 수와 표에서 바로 찾지 못해 직접 계산한 비율
+- 상주 메모리: 새 프로세스에서 같은 점들을 변환한 뒤 늘어난 RSS (표는 실제로 읽은 페이지만 올라옵니다)
+
+불일치가 하나라도 있으면 종료 코드 1로 끝납니다.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from weather_grid import KMA_GRID
+from weather_gridtable import GridLookupTable, build_grid_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 새 프로세스에서 변환 전후의 RSS(KB)를 잽니다. (Linux /proc 기준)
+RSS_CHILD = """
+import json, sys
+import numpy as np
+from weather_grid import KMA_GRID
+from weather_gridtable import GridLookupTable
+
+def rss():
+    for line in open('/proc/self/status'):
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1])
+
+mode, path, n = sys.argv[1], sys.argv[2], int(sys.argv[3])
+rng = np.random.default_rng(1)
+points = list(zip(rng.uniform(33.0, 38.7, n).tolist(), rng.uniform(124.5, 131.0, n).tolist()))
+before = rss()
+convert = GridLookupTable(path).to_grid if mode == 'table' else KMA_GRID.to_grid
+for lat, lon in points:
+    convert(lat, lon)
+print(json.dumps({"before": before, "after": rss()}))
+"""
+
+
+def rss_growth(mode: str, path: str, n: int) -> dict:
+    out = subprocess.run([sys.executable, '-c', RSS_CHILD, mode, path, str(n)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def rate(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolution', type=float, default=0.001, help='표 해상도(도)')
+    parser.add_argument('--table', default=None, help='이미 만든 표 파일 (없으면 임시로 생성)')
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--scalar-points', type=int, default=200_000, help='단일 좌표 경로를 잴 표본 수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.table
+        if path is None:
+            path = str(Path(tmp) / 'grid_table.bin')
+            elapsed, info = rate(build_grid_table, path, args.resolution)
+            print(f"표 생성: {info['rows']} x {info['cols']}칸, {info['bytes'] / 1e6:.1f}MB, "
+                  f"{elapsed:.1f}초, 표로 바로 찾는 칸 {info['coverage'] * 100:.1f}%")
+        table = GridLookupTable(path)
+
+        rng = np.random.default_rng(0)
+        lat = rng.uniform(33.0, 38.7, args.points)
+        lon = rng.uniform(124.5, 131.0, args.points)
+        n_scalar = min(args.points, args.scalar_points)
+        points = list(zip(lat[:n_scalar].tolist(), lon[:n_scalar].tolist()))
+
+        computed_elapsed, computed = rate(lambda: [KMA_GRID.to_grid(a, b) for a, b in points])
+        cold_elapsed, looked_up = rate(lambda: [table.to_grid(a, b) for a, b in points])
+        scalar_fallbacks = table.fallbacks
+        warm_elapsed, _ = rate(lambda: [table.to_grid(a, b) for a, b in points])
+        scalar_mismatches = sum(c != t for c, t in zip(computed, looked_up))
+
+        forward_elapsed, (ex, ey) = rate(KMA_GRID.forward, lat, lon)
+        table.fallbacks = 0
+        lookup_elapsed, (tx, ty) = rate(table.forward, lat, lon)
+        vector_mismatches = int(((ex != tx) | (ey != ty)).sum())
+
+        print(f"단일 좌표 ({n_scalar:,}개)")
+        print(f"  직접 계산: {n_scalar / computed_elapsed:>14,.0f} 점/초")
+        print(f"  조회 표  : {n_scalar / cold_elapsed:>14,.0f} 점/초 (x{computed_elapsed / cold_elapsed:.2f}, 첫 회, "
+              f"직접 계산으로 넘긴 비율 {scalar_fallbacks / n_scalar * 100:.1f}%)")
+        print(f"  조회 표  : {n_scalar / warm_elapsed:>14,.0f} 점/초 (x{computed_elapsed / warm_elapsed:.2f}, 두 번째 회)")
+        print(f"배열 ({args.points:,}개)")
+        print(f"  직접 계산: {args.points / forward_elapsed:>14,.0f} 점/초")
+        print(f"  조회 표  : {args.points / lookup_elapsed:>14,.0f} 점/초 (x{forward_elapsed / lookup_elapsed:.2f}, "
+              f"직접 계산으로 넘긴 비율 {table.fallbacks / args.points * 100:.1f}%)")
+
+        print(f"상주 메모리 증가 ({n_scalar:,}개 변환, 표 파일 {table.stats()['bytes'] / 1e6:.1f}MB)")
+        for mode in ('computed', 'table'):
+            r = rss_growth(mode, path, n_scalar)
+            print(f"  {'직접 계산' if mode == 'computed' else '조회 표  '}: {(r['after'] - r['before']) / 1024:>8.1f}MB "
+                  f"(변환 전 {r['before'] / 1024:.1f}MB)")
+        table.close()
+
+    print(f"불일치: 단일 {scalar_mismatches}개, 배열 {vector_mismatches}개")
+    return 1 if scalar_mismatches or vector_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
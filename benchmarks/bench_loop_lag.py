@@ -0,0 +1,99 @@
+"""
+응답 파싱 위치에 따른 이벤트 루프 지연 벤치마크
+
+    python -m benchmarks.bench_loop_lag --seconds 3 --big-rows 1000 --big-rate 20
+
+한 이벤트 루프에서 다음 부하를 함께 돌리며 PayloadParser의 실행 방식(inline, thread, process)을 비교합니다.
+- 작은 요청: 초단기 실황 응답(약 1KB)을 1ms 간격으로 파싱 (다른 MCP 요청을 흉내)
+- 큰 요청  : 예보 XML 페이지(--big-rows 행)를 초당 --big-rate건 파싱
+- 지연 측정: 1ms마다 깨어나는 작업이 예정보다 늦게 깨어난 시간(이벤트 루프 지연)
+
+루프 지연 p50/p99/최대, 작은 요청 지연 p50/p99, 처리한 큰 응답 수를 출력합니다.
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.bench_e2e import percentile
+from benchmarks.kma_payloads import forecast_rows, forecast_xml, observation_json
+from weather_payload import PayloadParser, parse_forecast_payload, parse_observation_payload
+
+
+async def run_mode(mode: str, args) -> dict:
+    parser = PayloadParser(mode, threshold=32768, workers=args.workers)
+    small = observation_json('20250101', '1200', 60, 127)
+    rows = forecast_rows('village', '20250101', '0500', 60, 127)
+    big = forecast_xml(rows, '20250101', '0500', 60, 127, 1, args.big_rows)
+    # 프로세스 풀 기동 시간은 측정에서 뺍니다.
+    await parser.run(parse_forecast_payload, big)
+
+    lags, small_latencies, big_done = [], [], 0
+    deadline = time.perf_counter() + args.seconds
+
+    async def ticker():
+        while time.perf_counter() < deadline:
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    async def small_requests():
+        pending = set()
+
+        async def one():
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            await parser.run(parse_observation_payload, small)
+            small_latencies.append(time.perf_counter() - start)
+
+        while time.perf_counter() < deadline:
+            task = asyncio.ensure_future(one())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*pending)
+
+    async def big_requests():
+        pending = set()
+
+        async def one():
+            nonlocal big_done
+            await parser.run(parse_forecast_payload, big)
+            big_done += 1
+
+        while time.perf_counter() < deadline:
+            task = asyncio.ensure_future(one())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            await asyncio.sleep(1 / args.big_rate)
+        await asyncio.gather(*pending)
+
+    await asyncio.gather(ticker(), small_requests(), big_requests())
+    parser.shutdown()
+    lags.sort()
+    small_latencies.sort()
+    return {"mode": mode, "lag_p50_ms": percentile(lags, 50) * 1000, "lag_p99_ms": percentile(lags, 99) * 1000,
+            "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+            "small_p50_ms": percentile(small_latencies, 50) * 1000,
+            "small_p99_ms": percentile(small_latencies, 99) * 1000,
+            "small": len(small_latencies), "big": big_done, "big_bytes": len(big)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--big-rows', type=int, default=1000, help='큰 응답 한 건의 예보 행 수')
+    parser.add_argument('--big-rate', type=float, default=20.0, help='초당 큰 응답 파싱 건수')
+    parser.add_argument('--workers', type=int, default=None, help='풀 크기 (기본값: 실행기 기본)')
+    parser.add_argument('--modes', default='inline,thread,process')
+    args = parser.parse_args()
+
+    print(f"{'방식':<10}{'lag p50':>10}{'lag p99':>10}{'lag max':>10}{'small p50':>11}{'small p99':>11}"
+          f"{'small':>8}{'big':>6}")
+    for mode in args.modes.split(','):
+        r = asyncio.run(run_mode(mode, args))
+        print(f"{r['mode']:<10}{r['lag_p50_ms']:>10.2f}{r['lag_p99_ms']:>10.2f}{r['lag_max_ms']:>10.2f}"
+              f"{r['small_p50_ms']:>11.2f}{r['small_p99_ms']:>11.2f}{r['small']:>8}{r['big']:>6}")
+    print(f"(큰 응답 크기: {r['big_bytes']} 바이트, 단위 ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+응답 파싱 시간/메모리 벤치마크
+
+    python -m benchmarks.bench_parse [반복 횟수]
+
+기존 경로(xmltodict.parse 후 item 순회)와 새 경로(JSON 파서, iterparse XML 파서)의
+응답 1건당 파싱 시간과 최대 할당 메모리(tracemalloc)를 비교합니다.
+"""
+import sys
+import time
+import tracemalloc
+import xmltodict
+from benchmarks.kma_payloads import observation_json, observation_xml
+from weather_payload import parse_json_observation, parse_xml_observation
+
+
+def legacy_parse(content: bytes) -> dict:
+    # 기존 st_forecast + parse_ultra_short_term_weather의 추출 과정
+    items = xmltodict.parse(content.decode())['response']['body']['items']['item']
+    return {'baseDate': items[0]['baseDate'], 'baseTime': items[0]['baseTime'],
+            'values': {item['category']: item['obsrValue'] for item in items}}
+
+
+def measure(parse, content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(content)
+    per_call = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def main(repeat=20_000):
+    xml_body = observation_xml('20250805', '2000', 60, 127)
+    json_body = observation_json('20250805', '2000', 60, 127)
+    assert legacy_parse(xml_body) == parse_xml_observation(xml_body) == parse_json_observation(json_body)
+
+    cases = [("xmltodict (기존)", legacy_parse, xml_body),
+             ("XML iterparse", parse_xml_observation, xml_body),
+             ("JSON", parse_json_observation, json_body)]
+    print(f"{'경로':<18}{'본문(B)':>10}{'1건당(us)':>12}{'최대 메모리(B)':>16}")
+    for name, parse, content in cases:
+        per_call, peak = measure(parse, content, repeat)
+        print(f"{name:<18}{len(content):>10}{per_call * 1e6:>12.1f}{peak:>16,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
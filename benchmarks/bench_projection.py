@@ -0,0 +1,47 @@
+"""
+위경도 -> 격자 변환 처리량 벤치마크
+
+    python -m benchmarks.bench_projection [점 개수]
+
+기존 단일 좌표 변환(convert_to_grid)과 NumPy 배열 변환(KMA_GRID.forward)의
+초당 처리량을 비교하고, 두 경로의 결과가 동일한지 확인합니다.
+"""
+import sys
+import time
+import numpy as np
+from weather_grid import KMA_GRID
+from weather_server import convert_to_grid
+
+
+def main(n_points=1_000_000):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(33.0, 38.7, n_points)
+    lon = rng.uniform(124.5, 131.0, n_points)
+
+    # 단일 좌표 경로는 느리므로 일부 표본으로 측정해 처리량을 구합니다.
+    n_scalar = min(n_points, 100_000)
+    lat_list, lon_list = lat[:n_scalar].tolist(), lon[:n_scalar].tolist()
+    start = time.perf_counter()
+    scalar = [convert_to_grid(a, b) for a, b in zip(lat_list, lon_list)]
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nx, ny = KMA_GRID.forward(lat, lon)
+    vector_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    KMA_GRID.inverse(nx, ny)
+    inverse_elapsed = time.perf_counter() - start
+
+    mismatches = sum(1 for i, g in enumerate(scalar) if (g['x'], g['y']) != (nx[i], ny[i]))
+
+    print(f"점 개수: {n_points:,}")
+    print(f"convert_to_grid (단일) : {n_scalar / scalar_elapsed:>14,.0f} 점/초 ({n_scalar:,}개 표본)")
+    print(f"KMA_GRID.forward (배열): {n_points / vector_elapsed:>14,.0f} 점/초 ({vector_elapsed * 1000:.1f} ms)")
+    print(f"KMA_GRID.inverse (배열): {n_points / inverse_elapsed:>14,.0f} 점/초 ({inverse_elapsed * 1000:.1f} ms)")
+    print(f"불일치: {mismatches}개")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
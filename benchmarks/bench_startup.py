@@ -0,0 +1,77 @@
+"""
+서버 시작 시간 벤치마크 (새 프로세스의 첫 도구 응답까지 걸리는 시간)
+
+    python -m benchmarks.bench_startup --runs 5 --max-ms 2500
+
+stdio 전송은 클라이언트 세션마다 서버 프로세스를 새로 띄우므로, 매번 다음 시간을 그대로 치르게 됩니다.
+- import : 새 인터프리터에서 weather_server를 가져오는 데 걸린 시간
+- init   : 프로세스 실행부터 MCP initialize 응답까지
+- first  : 프로세스 실행부터 첫 도구(get_coords_by_city) 응답까지
+
+중앙값의 first가 --max-ms를 넘으면 종료 코드 1로 끝나므로 CI에서 회귀 검사로 쓸 수 있습니다.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_import() -> float:
+    code = "import time; t = time.perf_counter(); import weather_server; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c', code], cwd=ROOT, env=os.environ,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+async def measure_first_response() -> tuple[float, float]:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=['-W', 'ignore', 'weather_server.py'],
+                                   cwd=str(ROOT), env=dict(os.environ))
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                init = time.perf_counter() - start
+                result = await session.call_tool('get_coords_by_city', {'city': '서울'})
+                first = time.perf_counter() - start
+    if result.isError:
+        raise RuntimeError(result.content[0].text)
+    return init, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=float(os.environ.get('KOREA_WEATHER_STARTUP_MAX_MS', '2500')),
+                        help='첫 도구 응답 시간 중앙값의 허용 상한(ms)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('KOREA_WEATHER_PREFETCH_TOP_K', '0')
+    imports, inits, firsts = [], [], []
+    print(f"{'회차':>4}{'import(ms)':>12}{'init(ms)':>12}{'first(ms)':>12}")
+    for run in range(1, args.runs + 1):
+        imports.append(measure_import() * 1000)
+        init, first = asyncio.run(measure_first_response())
+        inits.append(init * 1000)
+        firsts.append(first * 1000)
+        print(f"{run:>4}{imports[-1]:>12.1f}{inits[-1]:>12.1f}{firsts[-1]:>12.1f}")
+
+    median = statistics.median(firsts)
+    print(f"중앙값: import {statistics.median(imports):.1f}ms, init {statistics.median(inits):.1f}ms, "
+          f"first {median:.1f}ms (상한 {args.max_ms:.0f}ms)")
+    if median > args.max_ms:
+        print("첫 도구 응답 시간이 상한을 넘었습니다.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
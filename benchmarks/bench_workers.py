@@ -0,0 +1,126 @@
+"""
+작업 프로세스 수에 따른 네트워크(streamable-http) 서버 처리량 부하 테스트
+
+    python -m benchmarks.bench_workers --workers 1,2,4 --clients 32 --duration 10
+
+로컬 가짜 기상청 서버를 띄우고, 작업 프로세스 수를 바꿔 가며 weather_server를
+streamable-http 모드로 실행한 뒤 여러 부하 생성 프로세스에서 MCP 세션을 열어
+get_current_weather를 반복 호출합니다. 초당 요청 수와 1개 작업 프로세스 대비 배율을 출력합니다.
+(작업 프로세스 수만큼 CPU 코어가 있어야 배율이 의미 있습니다.)
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_e2e import percentile, start_fake_server
+
+
+def load_worker(url, sessions, duration, points, seed):
+    """한 부하 생성 프로세스: sessions개의 MCP 세션으로 duration초 동안 요청을 보냅니다."""
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+
+    async def session_loop(deadline):
+        nonlocal errors
+        async with streamablehttp_client(url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                while time.perf_counter() < deadline:
+                    lat, lon = rng.choice(points)
+                    start = time.perf_counter()
+                    try:
+                        result = await session.call_tool('get_current_weather', {'lat': lat, 'lon': lon})
+                        ok = not result.isError
+                    except Exception:
+                        ok = False
+                    latencies.append(time.perf_counter() - start)
+                    errors += 0 if ok else 1
+
+    async def run():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(session_loop(deadline) for _ in range(sessions)))
+
+    asyncio.run(run())
+    return latencies, errors
+
+
+def wait_until_ready(url, timeout=30.0):
+    import httpx
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url.replace('/mcp', '/metrics'), timeout=0.5)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("날씨 서버를 시작하지 못했습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default='1,2,4', help='쉼표로 구분한 작업 프로세스 수')
+    parser.add_argument('--clients', type=int, default=32, help='동시 MCP 세션 수')
+    parser.add_argument('--load-procs', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='부하 생성 프로세스 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='단계별 측정 시간(초)')
+    parser.add_argument('--cells', type=int, default=200, help='요청이 분포할 격자 수')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8765, help='가짜 기상청 서버 포트')
+    parser.add_argument('--server-port', type=int, default=8800)
+    args = parser.parse_args()
+
+    from weather_grid import KMA_GRID
+    rng = random.Random(0)
+    cells = [(rng.randint(55, 100), rng.randint(70, 130)) for _ in range(args.cells)]
+    lats, lons = KMA_GRID.inverse([c[0] for c in cells], [c[1] for c in cells])
+    points = list(zip(lats.tolist(), lons.tolist()))
+
+    fake = start_fake_server(args)
+    url = f'http://127.0.0.1:{args.server_port}/mcp/'
+    baseline = None
+    print(f"{'작업 프로세스':>12}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'오류':>8}{'배율':>8}")
+    try:
+        for workers in [int(w) for w in args.workers.split(',')]:
+            env = dict(os.environ,
+                       KOREA_WEATHER_API_KEY='benchmark', KOREA_WEATHER_PREFETCH_TOP_K='0',
+                       KOREA_WEATHER_API_URL=f'http://127.0.0.1:{args.port}/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst',
+                       KOREA_WEATHER_UPSTREAM_RATE='100000', KOREA_WEATHER_UPSTREAM_BURST='100000',
+                       KOREA_WEATHER_CACHE_DB=os.path.join(tempfile.mkdtemp(), 'cache.db'),
+                       FASTMCP_LOG_LEVEL='WARNING')
+            server = subprocess.Popen([sys.executable, 'weather_server.py', '--transport', 'streamable-http',
+                                       '--port', str(args.server_port), '--workers', str(workers)], env=env)
+            try:
+                wait_until_ready(url)
+                per_proc = max(1, args.clients // args.load_procs)
+                with multiprocessing.Pool(args.load_procs) as pool:
+                    results = pool.starmap(load_worker, [(url, per_proc, args.duration, points, seed)
+                                                         for seed in range(args.load_procs)])
+            finally:
+                # SIGINT로 종료해 uvicorn의 정상 종료(처리 중인 요청 마무리) 경로를 거칩니다.
+                server.send_signal(signal.SIGINT)
+                server.wait(timeout=60)
+
+            latencies = sorted(l for lat, _ in results for l in lat)
+            errors = sum(e for _, e in results)
+            rps = len(latencies) / args.duration
+            baseline = baseline or rps
+            print(f"{workers:>12}{rps:>10.1f}{percentile(latencies, 50) * 1000:>10.2f}"
+                  f"{percentile(latencies, 95) * 1000:>10.2f}{errors:>8}{rps / baseline:>8.2f}")
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == "__main__":
+    main()
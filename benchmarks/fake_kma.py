@@ -0,0 +1,86 @@
+"""
+로컬 가짜 기상청 동네예보 서버 (초단기실황/초단기예보/단기예보)
+
+    python -m benchmarks.fake_kma --port 8765 --latency 0.05 --jitter 0.02 --error-rate 0.01
+
+요청한 dataType(JSON/XML)에 맞는 실제 형식의 응답을 돌려주며, 응답 지연과
+오류 비율(HTTP 503 / resultCode 01 절반씩)을 지정할 수 있습니다.
+"""
+import argparse
+import asyncio
+import random
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.kma_payloads import (SAMPLE_VALUES, forecast_json, forecast_rows, forecast_xml,
+                                     observation_json, observation_xml, result_error_xml)
+
+SERVICE = '/1360000/VilageFcstInfoService_2.0'
+PATH = SERVICE + '/getUltraSrtNcst'
+
+
+def create_app(latency=0.05, jitter=0.0, error_rate=0.0):
+    stats = {"requests": 0, "errors": 0}
+
+    async def simulate():
+        """지연을 흉내 내고, 오류를 돌려줄 차례이면 오류 응답을 반환합니다."""
+        stats["requests"] += 1
+        await asyncio.sleep(max(0.0, random.gauss(latency, jitter)) if jitter else latency)
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            if random.random() < 0.5:
+                return Response(status_code=503)
+            return Response(result_error_xml('01', 'APPLICATION_ERROR'), media_type='application/xml')
+        return None
+
+    async def ultra_srt_ncst(request):
+        if (error := await simulate()) is not None:
+            return error
+        params = request.query_params
+
+        # 격자마다 값이 조금씩 다르게 나오도록 기온/습도를 바꿉니다.
+        nx, ny = int(params.get('nx', 0)), int(params.get('ny', 0))
+        values = dict(SAMPLE_VALUES, T1H=f"{(nx * 7 + ny * 3) % 350 / 10:.1f}", REH=str((nx + ny) % 100))
+        args = (params.get('base_date'), params.get('base_time'), nx, ny, values)
+        if params.get('dataType', 'XML').upper() == 'JSON':
+            return Response(observation_json(*args), media_type='application/json')
+        return Response(observation_xml(*args), media_type='application/xml')
+
+    def forecast_endpoint(kind):
+        async def endpoint(request):
+            if (error := await simulate()) is not None:
+                return error
+            params = request.query_params
+            nx, ny = int(params.get('nx', 0)), int(params.get('ny', 0))
+            base_date, base_time = params.get('base_date'), params.get('base_time')
+            rows = forecast_rows(kind, base_date, base_time, nx, ny)
+            args = (rows, base_date, base_time, nx, ny, int(params.get('pageNo', 1)), int(params.get('numOfRows', 10)))
+            if params.get('dataType', 'XML').upper() == 'JSON':
+                return Response(forecast_json(*args), media_type='application/json')
+            return Response(forecast_xml(*args), media_type='application/xml')
+        return endpoint
+
+    async def stats_endpoint(request):
+        return Response(f'{stats["requests"]} {stats["errors"]}', media_type='text/plain')
+
+    return Starlette(routes=[Route(PATH, ultra_srt_ncst),
+                             Route(SERVICE + '/getUltraSrtFcst', forecast_endpoint('ultra')),
+                             Route(SERVICE + '/getVilageFcst', forecast_endpoint('village')),
+                             Route('/stats', stats_endpoint)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='평균 응답 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연 표준편차(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율(0~1)')
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.jitter, args.error_rate),
+                host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
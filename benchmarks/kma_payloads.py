@@ -0,0 +1,85 @@
+"""벤치마크용 기상청 초단기 실황 응답 본문 생성기"""
+import json
+
+# 실제 응답과 같은 순서의 8개 category 관측값
+SAMPLE_VALUES = {'PTY': '0', 'REH': '65', 'RN1': '0', 'T1H': '26.2',
+                 'UUU': '-0.9', 'VEC': '121', 'VVV': '0.5', 'WSD': '1.1'}
+
+
+def observation_json(base_date, base_time, nx, ny, values=SAMPLE_VALUES) -> bytes:
+    items = [{'baseDate': base_date, 'baseTime': base_time, 'category': category,
+              'nx': nx, 'ny': ny, 'obsrValue': value} for category, value in values.items()]
+    body = {'response': {'header': {'resultCode': '00', 'resultMsg': 'NORMAL_SERVICE'},
+                         'body': {'dataType': 'JSON', 'items': {'item': items},
+                                  'pageNo': 1, 'numOfRows': 30, 'totalCount': len(items)}}}
+    return json.dumps(body).encode()
+
+
+def observation_xml(base_date, base_time, nx, ny, values=SAMPLE_VALUES) -> bytes:
+    items = ''.join(
+        f'<item><baseDate>{base_date}</baseDate><baseTime>{base_time}</baseTime>'
+        f'<category>{category}</category><nx>{nx}</nx><ny>{ny}</ny>'
+        f'<obsrValue>{value}</obsrValue></item>'
+        for category, value in values.items())
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response>'
+            '<header><resultCode>00</resultCode><resultMsg>NORMAL_SERVICE</resultMsg></header>'
+            f'<body><dataType>XML</dataType><items>{items}</items><numOfRows>30</numOfRows>'
+            f'<pageNo>1</pageNo><totalCount>{len(values)}</totalCount></body></response>').encode()
+
+
+def result_error_xml(code='03', message='NO_DATA') -> bytes:
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response>'
+            f'<header><resultCode>{code}</resultCode><resultMsg>{message}</resultMsg></header>'
+            '</response>').encode()
+
+
+def forecast_rows(kind, base_date, base_time, nx, ny):
+    """초단기예보(6시간)/단기예보(약 3일) 형태의 (fcstDate, fcstTime, category, fcstValue) 행 목록"""
+    from datetime import datetime, timedelta
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M").replace(minute=0) + timedelta(hours=1)
+    if kind == 'ultra':
+        hours, categories = 6, ('LGT', 'PTY', 'RN1', 'SKY', 'T1H', 'REH', 'UUU', 'VVV', 'VEC', 'WSD')
+    else:
+        end = (base + timedelta(days=3)).replace(hour=23)
+        hours = int((end - base).total_seconds() // 3600) + 1
+        categories = ('TMP', 'UUU', 'VVV', 'VEC', 'WSD', 'SKY', 'PTY', 'POP', 'WAV', 'PCP', 'REH', 'SNO')
+    rows = []
+    for h in range(hours):
+        t = base + timedelta(hours=h)
+        date, time = t.strftime("%Y%m%d"), t.strftime("%H%M")
+        temperature = 15 + 8 * ((t.hour - 5) % 24) / 23 + (nx + ny) % 5
+        wet = (t.day + t.hour) % 7 == 0
+        values = {'TMP': f"{temperature:.0f}", 'T1H': f"{temperature:.1f}", 'UUU': '-1.2', 'VVV': '0.8',
+                  'VEC': '120', 'WSD': f"{(t.hour % 5) + 0.5:.1f}", 'SKY': '4' if wet else '1',
+                  'PTY': '1' if wet else '0', 'POP': '60' if wet else '10', 'WAV': '0',
+                  'PCP': '1.0mm' if wet else '강수없음', 'RN1': '1.0mm' if wet else '강수없음',
+                  'REH': str(50 + t.hour), 'SNO': '적설없음', 'LGT': '0'}
+        rows.extend((date, time, category, values[category]) for category in categories)
+        if kind != 'ultra' and time == '0600':
+            rows.append((date, time, 'TMN', f"{temperature - 2:.1f}"))
+        if kind != 'ultra' and time == '1500':
+            rows.append((date, time, 'TMX', f"{temperature + 2:.1f}"))
+    return rows
+
+
+def forecast_json(rows, base_date, base_time, nx, ny, page, num_rows) -> bytes:
+    page_rows = rows[(page - 1) * num_rows:page * num_rows]
+    items = [{'baseDate': base_date, 'baseTime': base_time, 'category': category, 'fcstDate': date,
+              'fcstTime': time, 'fcstValue': value, 'nx': nx, 'ny': ny} for date, time, category, value in page_rows]
+    body = {'response': {'header': {'resultCode': '00', 'resultMsg': 'NORMAL_SERVICE'},
+                         'body': {'dataType': 'JSON', 'items': {'item': items},
+                                  'pageNo': page, 'numOfRows': num_rows, 'totalCount': len(rows)}}}
+    return json.dumps(body, ensure_ascii=False).encode()
+
+
+def forecast_xml(rows, base_date, base_time, nx, ny, page, num_rows) -> bytes:
+    page_rows = rows[(page - 1) * num_rows:page * num_rows]
+    items = ''.join(
+        f'<item><baseDate>{base_date}</baseDate><baseTime>{base_time}</baseTime><category>{category}</category>'
+        f'<fcstDate>{date}</fcstDate><fcstTime>{time}</fcstTime><fcstValue>{value}</fcstValue>'
+        f'<nx>{nx}</nx><ny>{ny}</ny></item>'
+        for date, time, category, value in page_rows)
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response>'
+            '<header><resultCode>00</resultCode><resultMsg>NORMAL_SERVICE</resultMsg></header>'
+            f'<body><dataType>XML</dataType><items>{items}</items><numOfRows>{num_rows}</numOfRows>'
+            f'<pageNo>{page}</pageNo><totalCount>{len(rows)}</totalCount></body></response>').encode()
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from benchmarks.kma_payloads import (forecast_json, forecast_rows, observation_json, observation_xml,
+                                     result_error_xml)
+
+
+class FakeKMA:
+    """
+    httpx.MockTransport로 붙이는 가짜 기상청 응답입니다.
+    초단기 실황은 published가 None이면 모든 정각, 아니면 published에 든 정각만 자료를 주고 나머지는 NO_DATA입니다.
+    calls에는 (API 이름, 요청 파라미터) 순서로 기록합니다.
+    """
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+        self.published: set[datetime] | None = None
+        self.delay = 0.0
+
+    def hours(self, api: str = 'getUltraSrtNcst') -> list[datetime]:
+        return [datetime.strptime(p['base_date'] + p['base_time'], "%Y%m%d%H%M") for name, p in self.calls
+                if name == api]
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        api = request.url.path.rsplit('/', 1)[-1]
+        p = dict(request.url.params)
+        self.calls.append((api, p))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if api == 'getUltraSrtNcst':
+            hour = datetime.strptime(p['base_date'] + p['base_time'], "%Y%m%d%H%M")
+            if self.published is not None and hour not in self.published:
+                return httpx.Response(200, content=result_error_xml('03', 'NO_DATA'))
+            payload = observation_json if p.get('dataType') == 'JSON' else observation_xml
+            return httpx.Response(200, content=payload(p['base_date'], p['base_time'], p['nx'], p['ny']))
+        kind = 'ultra' if api == 'getUltraSrtFcst' else 'village'
+        rows = forecast_rows(kind, p['base_date'], p['base_time'], int(p['nx']), int(p['ny']))
+        return httpx.Response(200, content=forecast_json(rows, p['base_date'], p['base_time'], p['nx'], p['ny'],
+                                                         int(p['pageNo']), int(p['numOfRows'])))
+
+
+@pytest.fixture
+def kma(monkeypatch) -> FakeKMA:
+    """weather_server가 가짜 기상청에 요청하도록 바꿉니다. (영속 캐시 없이, 속도 제한은 사실상 없이)"""
+    import weather_server as ws
+
+    fake = FakeKMA()
+    monkeypatch.setattr(ws, 'create_http_client',
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)))
+    monkeypatch.setattr(ws, 'API_KEY', 'test-key')
+    monkeypatch.setattr(ws, 'DATA_TYPE', 'JSON')
+    monkeypatch.setattr(ws, 'CACHE_DB_PATH', None)
+    monkeypatch.setattr(ws, 'UPSTREAM_RATE', 1000)
+    monkeypatch.setattr(ws, 'UPSTREAM_BURST', 1000)
+    return fake
+
+
+async def call_tool(name: str, arguments: dict):
+    """메모리 안에서 MCP 세션을 열어 도구를 호출하고 결과(CallToolResult)를 반환합니다."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+    import weather_server as ws
+
+    async with create_connected_server_and_client_session(ws.mcp._mcp_server) as client:
+        return await client.call_tool(name, arguments)
@@ -0,0 +1,23 @@
+import asyncio
+import pytest
+import weather_server as ws
+from conftest import call_tool
+
+SEOUL = {"lat": 37.5665, "lon": 126.978}
+
+
+@pytest.mark.parametrize("name, arguments", [
+    ('get_current_weather', SEOUL),
+    ('get_current_weather_data', SEOUL),
+    ('get_current_weather_batch', {"points": [SEOUL]}),
+    ('get_weather_history', SEOUL),
+    ('get_region_snapshot', {"region": "서울"}),
+    ('get_forecast', SEOUL),
+    ('get_daily_forecast', SEOUL),
+])
+@pytest.mark.parametrize("key", [None, '<your_api_key>'])
+def test_tools_refuse_without_api_key(name, arguments, key, kma, monkeypatch):
+    monkeypatch.setattr(ws, 'API_KEY', key)
+    result = asyncio.run(call_tool(name, arguments))
+    assert ws.API_KEY_ERROR in result.content[0].text
+    assert kma.calls == []
@@ -0,0 +1,18 @@
+import asyncio
+from conftest import call_tool
+
+
+def test_bad_points_fail_alone(kma):
+    points = [{"lat": 37.5665, "lon": 126.978}, {"lat": "nan", "lon": 127.0}, {"lat": 37.0, "lon": "inf"},
+              {"lat": -90, "lon": 0}, {"lat": 90, "lon": 127}, {"lat": 37.0}, {"lat": 35.1796, "lon": 129.0756}]
+    for interpolate in (False, True):
+        result = asyncio.run(call_tool('get_current_weather_batch',
+                                       {"points": points, "include_place": True, "interpolate": interpolate}))
+        assert not result.isError, result.content[0].text
+        reports = result.content[0].text.split("\n# [")
+        assert reports[0].startswith("요청 위치 7개, 조회한 격자 2개")
+        assert "기온: 26.2℃" in reports[1] and "가까운 지역: 서울" in reports[1]
+        assert "유한한 숫자" in reports[2] and "유한한 숫자" in reports[3]
+        assert "격자 범위를 벗어난" in reports[4] and "격자 범위를 벗어난" in reports[5]
+        assert "잘못된 위치 형식" in reports[6]
+        assert "기온: 26.2℃" in reports[7] and "가까운 지역: 부산" in reports[7]
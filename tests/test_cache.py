@@ -0,0 +1,152 @@
+import asyncio
+import sqlite3
+import time
+from weather_cache import ObservationCache, SQLiteObservationStore
+
+LATER = time.time() + 3600
+
+
+def key(base_time: str, nx: int = 60, ny: int = 127) -> tuple:
+    return (nx, ny, "20260101", base_time)
+
+
+def test_get_or_fetch_is_single_flight():
+    cache = ObservationCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"t1h": 1.0}
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_fetch(key("0900"), fetch, LATER) for _ in range(10)))
+        again = await cache.get_or_fetch(key("0900"), fetch, LATER)
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert calls == 1
+    assert all(r is results[0] for r in results) and again is results[0]
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+    assert cache.stats()["inflight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    cache = ObservationCache()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_fetch(key("0900"), fetch, LATER))
+        second = asyncio.ensure_future(cache.get_or_fetch(key("0900"), fetch, LATER))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "value"
+    assert cache.get(key("0900")) == "value"
+
+
+def test_errors_are_not_cached():
+    cache = ObservationCache()
+    results = iter([{"error": "timeout"}, "value"])
+
+    async def fetch():
+        return next(results)
+
+    async def main():
+        return [await cache.get_or_fetch(key("0900"), fetch, LATER) for _ in range(2)]
+
+    assert asyncio.run(main()) == [{"error": "timeout"}, "value"]
+    assert cache.misses == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ObservationCache(maxsize=2)
+    cache.put(key("0900", nx=1), "a", LATER)
+    cache.put(key("0900", nx=2), "b", LATER)
+    assert cache.get(key("0900", nx=1)) == "a"
+    cache.put(key("0900", nx=3), "c", LATER)
+    assert cache.get(key("0900", nx=2)) is None
+    assert cache.get(key("0900", nx=1)) == "a" and cache.get(key("0900", nx=3)) == "c"
+    assert cache.evictions == 1 and len(cache) == 2
+
+
+def test_expired_entry_is_kept_as_latest():
+    cache = ObservationCache()
+    now = time.time()
+    cache.put(key("0900"), "old", now - 10)
+    assert cache.get(key("0900")) is None
+    assert cache.get_latest(60, 127, max_stale=60) == "old"
+    assert cache.get_latest(60, 127, max_stale=5) is None
+
+
+def test_latest_tracks_newest_base_time():
+    cache = ObservationCache(maxsize=3)
+    cache.put(key("1000"), "10", LATER)
+    # 늦게 도착한 이전 발표시각 자료가 최신 자료를 가리지 않습니다.
+    cache.put(key("0900"), "09", LATER)
+    assert cache.get_latest(60, 127, 0) == "10"
+    cache.put(key("1100"), "11", LATER)
+    assert cache.get_latest(60, 127, 0) == "11"
+    assert cache.get_latest(61, 127, 0) is None
+
+    # 최신 항목이 LRU로 밀려나면 그 격자의 대체 응답도 없어집니다.
+    cache.get(key("1000"))
+    cache.get(key("0900"))
+    cache.put(key("0900", nx=1), "other", LATER)
+    assert cache.get(key("1100")) is None
+    assert cache.get_latest(60, 127, 0) is None
+
+
+def test_store_is_checked_before_fetch(tmp_path):
+    store = SQLiteObservationStore(str(tmp_path / "cache.db"))
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {"t1h": 1.5}
+
+    async def main(cache):
+        return await cache.get_or_fetch(key("0900"), fetch, LATER)
+
+    try:
+        assert asyncio.run(main(ObservationCache(store=store))) == {"t1h": 1.5}
+        # 다른 프로세스(새 캐시)도 저장소의 항목을 업스트림 요청 없이 씁니다.
+        other = ObservationCache(store=store)
+        assert asyncio.run(main(other)) == {"t1h": 1.5}
+        assert calls == 1 and other.store_hits == 1
+        store.put(key("0800"), {"t1h": 0.0}, time.time() - 1)
+        assert store.get(key("0800")) is None
+        assert store.purge_expired() == 1
+    finally:
+        store.close()
+
+
+class LockedStore:
+    """모든 읽기/쓰기가 'database is locked'로 실패하는 저장소"""
+    path = "locked.db"
+
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, value, expires_at):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_store_errors_fall_back_to_memory():
+    cache = ObservationCache(store=LockedStore())
+
+    async def fetch():
+        return {"t1h": 2.0}
+
+    async def main():
+        return [await cache.get_or_fetch(key("0900"), fetch, LATER) for _ in range(2)]
+
+    assert asyncio.run(main()) == [{"t1h": 2.0}, {"t1h": 2.0}]
+    assert cache.get(key("0900")) == {"t1h": 2.0}
+    assert cache.misses == 1 and cache.hits == 1 and cache.stats()["store_errors"] == 2
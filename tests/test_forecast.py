@@ -0,0 +1,54 @@
+import asyncio
+import math
+import warnings
+import numpy as np
+import weather_server as ws
+from benchmarks.kma_payloads import forecast_rows
+from weather_forecast import VILLAGE_URL, ForecastTable
+
+ROWS = forecast_rows('village', '20260101', '0500', 60, 127)
+
+
+def test_daily_summary_skips_columns_without_values():
+    # 다음 날 POP와 WSD만 값이 비어 있는 표
+    rows = [row for row in ROWS if not (row[0] == '20260102' and row[2] in ('POP', 'WSD'))]
+    table = ForecastTable.from_rows('20260101', '0500', rows)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        summary = table.daily_summary('20260102')
+    assert 'max_pop' not in summary and 'max_wind' not in summary
+    assert not math.isnan(summary['min_temp']) and summary['hours'] == 24
+    assert table.daily_summary('20260101')['max_pop'] == 60.0
+
+
+def test_forecast_pages_are_fetched_and_joined(kma, monkeypatch):
+    monkeypatch.setattr(ws, 'FORECAST_PAGE_SIZE', 100)
+
+    async def main():
+        async with ws.open_app_context() as app:
+            return await ws.kma_forecast(app.client, ws.API_KEY, VILLAGE_URL, 60, 127, '20260101', '0500', app.guard)
+
+    table = asyncio.run(main())
+    pages = sorted(int(p['pageNo']) for api, p in kma.calls)
+    assert pages == list(range(1, -(-len(ROWS) // 100) + 1))
+    expected = ForecastTable.from_rows('20260101', '0500', ROWS)
+    assert table.times == expected.times
+    assert table.columns.keys() == expected.columns.keys() and table.text == expected.text
+    for category, column in expected.columns.items():
+        np.testing.assert_array_equal(table.columns[category], column)
+
+
+def test_daily_forecast_reuses_cached_table(kma):
+    async def main():
+        # 한 세션 안의 호출은 같은 lifespan(캐시)을 공유합니다.
+        from mcp.shared.memory import create_connected_server_and_client_session
+        async with create_connected_server_and_client_session(ws.mcp._mcp_server) as client:
+            return [await client.call_tool('get_daily_forecast', {"lat": 37.5665, "lon": 126.978, "days_ahead": d})
+                    for d in (0, 1, 1, 2)]
+
+    results = asyncio.run(main())
+    assert all(not r.isError for r in results)
+    assert "최저 기온" in results[1].content[0].text and results[1].content[0].text == results[2].content[0].text
+    # 첫 호출에서 받은 단기예보 표로 나머지 날짜도 답하고 다시 요청하지 않습니다.
+    pages = -(-len(forecast_rows('village', *ws.village_base_datetime(), 60, 127)) // ws.FORECAST_PAGE_SIZE)
+    assert len(kma.calls) == pages and {api for api, _ in kma.calls} == {'getVilageFcst'}
@@ -0,0 +1,103 @@
+import csv
+import math
+from pathlib import Path
+import numpy as np
+from weather_grid import KMA_GRID
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'kma_grid_latlon.csv'
+GRID_NX, GRID_NY = 149, 253
+
+# 원래 서버의 convert_to_grid와 LCC DFS GRID C 프로그램의 역변환을 그대로 옮긴 기준 구현입니다.
+RE, GRID, SLAT1, SLAT2, OLON, OLAT, XO, YO = 6371.00877, 5.0, 30.0, 60.0, 126.0, 38.0, 43, 136
+DEGRAD, RADDEG = math.pi / 180.0, 180.0 / math.pi
+
+
+def baseline_constants():
+    slat1, slat2 = SLAT1 * DEGRAD, SLAT2 * DEGRAD
+    olat = OLAT * DEGRAD
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = (sf ** sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = RE / GRID * sf / (ro ** sn)
+    return sn, sf, ro
+
+
+def baseline_to_grid(lat, lon):
+    sn, sf, ro = baseline_constants()
+    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
+    ra = RE / GRID * sf / (ra ** sn)
+    theta = lon * DEGRAD - OLON * DEGRAD
+    if theta > math.pi: theta -= 2 * math.pi
+    if theta < -math.pi: theta += 2 * math.pi
+    theta *= sn
+    x = ra * math.sin(theta) + XO
+    y = ro - ra * math.cos(theta) + YO
+    return int(x + 0.5), int(y + 0.5)
+
+
+def baseline_to_latlon(nx, ny):
+    sn, sf, ro = baseline_constants()
+    xn = nx - XO
+    yn = ro - ny + YO
+    ra = math.sqrt(xn * xn + yn * yn)
+    if sn < 0.0: ra = -ra
+    alat = (RE / GRID * sf / ra) ** (1.0 / sn)
+    alat = 2.0 * math.atan(alat) - math.pi * 0.5
+    if abs(xn) <= 0.0:
+        theta = 0.0
+    elif abs(yn) <= 0.0:
+        theta = -math.pi * 0.5 if xn < 0.0 else math.pi * 0.5
+    else:
+        theta = math.atan2(xn, yn)
+    alon = theta / sn + OLON * DEGRAD
+    return alat * RADDEG, alon * RADDEG
+
+
+def domain_latlon_grid(step: float = 0.05):
+    """격자 영역 네 모서리를 모두 포함하는 위경도 범위(영역 밖으로 약간 넘침)를 step 간격으로 나눕니다."""
+    corners = [baseline_to_latlon(nx, ny) for nx in (1, GRID_NX) for ny in (1, GRID_NY)]
+    lats = [lat for lat, _ in corners]
+    lons = [lon for _, lon in corners]
+    lat = np.arange(min(lats) - 0.5, max(lats) + 0.5, step)
+    lon = np.arange(min(lons) - 0.5, max(lons) + 0.5, step)
+    return np.meshgrid(lat, lon, indexing='ij')
+
+
+def test_forward_matches_baseline_over_domain():
+    lat, lon = domain_latlon_grid()
+    nx, ny = KMA_GRID.forward(lat, lon)
+    expected = np.array([baseline_to_grid(a, b) for a, b in zip(lat.ravel().tolist(), lon.ravel().tolist())])
+    assert (nx.ravel() == expected[:, 0]).all()
+    assert (ny.ravel() == expected[:, 1]).all()
+    # 영역 가장자리 격자도 범위에 포함되었는지 확인합니다.
+    assert nx.min() < 1 and nx.max() > GRID_NX and ny.min() < 1 and ny.max() > GRID_NY
+
+
+def test_scalar_to_grid_matches_baseline_at_edges():
+    for nx in (1, 2, GRID_NX - 1, GRID_NX):
+        for ny in (1, 2, GRID_NY - 1, GRID_NY):
+            lat, lon = baseline_to_latlon(nx, ny)
+            assert KMA_GRID.to_grid(lat, lon) == baseline_to_grid(lat, lon) == (nx, ny)
+
+
+def test_inverse_matches_baseline_for_every_cell():
+    nx, ny = np.meshgrid(np.arange(1, GRID_NX + 1), np.arange(1, GRID_NY + 1), indexing='ij')
+    lat, lon = KMA_GRID.inverse(nx, ny)
+    expected = np.array([baseline_to_latlon(a, b) for a, b in zip(nx.ravel().tolist(), ny.ravel().tolist())])
+    np.testing.assert_allclose(lat.ravel(), expected[:, 0], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(lon.ravel(), expected[:, 1], rtol=0, atol=1e-9)
+    # 격자 중심을 다시 변환하면 같은 격자로 돌아옵니다.
+    back_nx, back_ny = KMA_GRID.forward(lat, lon)
+    assert (back_nx == nx).all() and (back_ny == ny).all()
+
+
+def test_forward_matches_kma_reference_points():
+    with open(FIXTURE, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    lat = [float(row['위도(초/100)']) for row in rows]
+    lon = [float(row['경도(초/100)']) for row in rows]
+    nx, ny = KMA_GRID.forward(lat, lon)
+    assert nx.tolist() == [int(row['격자 X']) for row in rows]
+    assert ny.tolist() == [int(row['격자 Y']) for row in rows]
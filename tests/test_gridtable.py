@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from weather_grid import KMA_GRID
+from weather_gridtable import GridLookupTable, build_grid_table, load_grid_table
+from weather_region import GRID_NX, GRID_NY
+
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp('grid') / 'grid_table.bin'
+    info = build_grid_table(path, resolution=0.01)
+    assert info['coverage'] > 0.5
+    table = GridLookupTable(path)
+    yield table
+    table.close()
+
+
+def sample_points(seed: int = 3):
+    """격자 영역 전체의 무작위 지점, 격자 경계 바로 양쪽 지점, 표 범위 밖 지점"""
+    rnd = np.random.default_rng(seed)
+    lat = [rnd.uniform(30, 45, 20000)]
+    lon = [rnd.uniform(118, 136, 20000)]
+    # 격자 경계(반 칸 위치) 위와 그 양옆 아주 가까운 곳
+    bx, by = rnd.uniform(1, GRID_NX, 2000), rnd.uniform(1, GRID_NY, 2000)
+    for dx, dy in ((0.5, 0.0), (0.0, 0.5)):
+        for eps in (-1e-7, 0.0, 1e-7):
+            edge_lat, edge_lon = KMA_GRID.inverse(np.floor(bx) + dx + eps, np.floor(by) + dy + eps)
+            lat.append(edge_lat)
+            lon.append(edge_lon)
+    lat.append(np.array([0.0, 60.0, 37.5, -37.5]))
+    lon.append(np.array([127.0, 127.0, 180.0, 127.0]))
+    return np.concatenate(lat), np.concatenate(lon)
+
+
+def test_forward_matches_projection(table):
+    lat, lon = sample_points()
+    nx, ny = table.forward(lat, lon)
+    expected_nx, expected_ny = KMA_GRID.forward(lat, lon)
+    assert (nx == expected_nx).all() and (ny == expected_ny).all()
+    # 경계 근처와 범위 밖은 직접 계산으로 넘겨집니다.
+    assert 0 < table.fallbacks < len(lat)
+
+
+def test_scalar_lookup_matches_projection(table):
+    lat, lon = sample_points(seed=4)
+    for a, b in zip(lat[::7].tolist(), lon[::7].tolist()):
+        assert table.to_grid(a, b) == KMA_GRID.to_grid(a, b), (a, b)
+
+
+def test_bad_table_file_is_ignored(tmp_path):
+    path = tmp_path / 'broken.bin'
+    path.write_bytes(b'not a grid table')
+    assert load_grid_table(path) is None
+    assert load_grid_table(tmp_path / 'missing.bin') is None
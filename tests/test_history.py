@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+import weather_server as ws
+from weather_history import FIELDS, ObservationHistory, hour_index
+from weather_observation import Observation
+
+START = datetime(2026, 1, 1, 0)
+
+
+def observation(hour: int, nx: int = 60, ny: int = 127) -> Observation:
+    t = START + timedelta(hours=hour)
+    return Observation(t.strftime("%Y%m%d"), t.strftime("%H00"), nx, ny, t1h=float(hour), reh=50.0)
+
+
+def index(hour: int) -> int:
+    t = START + timedelta(hours=hour)
+    return hour_index(t.strftime("%Y%m%d"), t.strftime("%H00"))
+
+
+def test_ring_buffer_wraps_around():
+    history = ObservationHistory(hours=24)
+    for hour in range(30):
+        history.record(observation(hour))
+    hours = [index(h) for h in range(30)]
+    # 24시간보다 오래된 시각은 같은 칸의 새 값으로 덮여 더 이상 보관되지 않습니다.
+    assert history.missing(60, 127, hours) == hours[:6]
+    series = history.series(60, 127, hours)
+    t1h = series[:, FIELDS.index('t1h')]
+    assert np.isnan(t1h[:6]).all()
+    assert t1h[6:].tolist() == list(range(6, 30))
+    assert np.isnan(series[:, FIELDS.index('rn1')]).all()
+
+
+def test_late_old_observation_does_not_overwrite_newer():
+    history = ObservationHistory(hours=24)
+    history.record(observation(30))
+    history.record(observation(6))
+    assert history.missing(60, 127, [index(30), index(6)]) == [index(6)]
+    assert history.series(60, 127, [index(30)])[0, FIELDS.index('t1h')] == 30
+
+
+def test_least_recently_used_cell_is_evicted():
+    per_cell = 24 * (len(FIELDS) * 4 + 4)
+    history = ObservationHistory(hours=24, max_bytes=2 * per_cell)
+    assert history.max_cells == 2
+    history.record(observation(0, nx=1))
+    history.record(observation(0, nx=2))
+    history.missing(1, 127, [index(0)])
+    history.record(observation(1, nx=3))
+    assert len(history) == 2 and history.evictions == 1
+    assert history.missing(2, 127, [index(0)]) == [index(0)]
+    assert history.missing(1, 127, [index(0)]) == []
+    # 빈 칸을 물려받은 격자에는 이전 격자의 값이 남아 있지 않습니다.
+    assert history.missing(3, 127, [index(0), index(1)]) == [index(0)]
+
+
+def test_unknown_cell_is_all_missing():
+    history = ObservationHistory(hours=6)
+    assert history.missing(1, 1, [1, 2]) == [1, 2]
+    assert np.isnan(history.series(1, 1, [1, 2])).all()
+    assert history.values is None
+
+
+def test_concurrent_backfills_share_upstream_requests(kma):
+    kma.delay = 0.01
+
+    async def main():
+        async with ws.open_app_context() as app:
+            results = await asyncio.gather(*(ws.get_observation_history(app, 60, 127, 6) for _ in range(3)))
+            return results, app.cache.stats()
+
+    results, stats = asyncio.run(main())
+    times, series = results[0]
+    # 동시에 들어온 같은 격자 이력 요청은 시각마다 업스트림을 한 번만 부릅니다.
+    assert sorted(kma.hours()) == times
+    assert stats["coalesced"] == 2 * len(times)
+    assert not np.isnan(series[FIELDS.index("t1h")]).any()
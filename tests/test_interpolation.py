@@ -0,0 +1,74 @@
+import math
+import pytest
+from weather_interpolation import NEIGHBOR_OFFSETS, interpolate_observations
+from weather_observation import Observation
+
+OWN = (60, 127)
+
+
+def grid(values: dict):
+    """{(nx, ny): 필드 딕셔너리}로 lookup 함수를 만듭니다."""
+    cells = {cell: Observation("20260101", "0900", *cell, **fields) for cell, fields in values.items()}
+    return lambda nx, ny: cells.get((nx, ny))
+
+
+def neighbors(**fields):
+    return {(OWN[0] + dx, OWN[1] + dy): dict(fields) for dx, dy in NEIGHBOR_OFFSETS}
+
+
+def reference_idw(x, y, cells: dict, name: str) -> float:
+    """역거리 제곱 가중 평균을 한 위치씩 직접 계산합니다."""
+    weights = {cell: 1.0 / ((cell[0] - x) ** 2 + (cell[1] - y) ** 2) for cell in cells}
+    return sum(w * cells[cell][name] for cell, w in weights.items()) / sum(weights.values())
+
+
+def test_matches_reference_weights():
+    cells = {cell: {"t1h": 0.5 * cell[0] - 0.3 * cell[1] + (cell[0] * cell[1]) % 3, "reh": 40.0 + cell[0] - cell[1],
+                    "uuu": 1.0, "vvv": -1.0} for cell in neighbors()}
+    points = [(60.2, 127.1), (59.7, 126.6), (60.45, 127.45)]
+    results = interpolate_observations(points, grid(cells), "20260101", "0900")
+    for (x, y), result in zip(points, results):
+        assert (result.nx, result.ny) == OWN and result.interpolated
+        assert result.t1h == round(reference_idw(x, y, cells, "t1h"), 1)
+        assert result.reh == round(reference_idw(x, y, cells, "reh"), 0)
+
+
+@pytest.mark.parametrize("uuu, vvv, vec", [(3.0, 0.0, 270), (-3.0, 0.0, 90), (0.0, -2.0, 0), (0.0, 2.0, 180),
+                                           (-1.0, -1.0, 45), (1.0, 1.0, 225)])
+def test_wind_is_derived_from_components(uuu, vvv, vec):
+    # 이웃의 VEC/WSD 값은 쓰지 않고 보간한 바람성분으로 다시 계산합니다.
+    cells = neighbors(uuu=uuu, vvv=vvv, vec=999.0, wsd=99.0, t1h=1.0)
+    [result] = interpolate_observations([(60.1, 127.2)], grid(cells), "20260101", "0900")
+    assert (result.uuu, result.vvv) == (uuu, vvv)
+    assert result.vec == vec
+    assert result.wsd == round(math.hypot(uuu, vvv), 1)
+
+
+def test_opposing_winds_cancel_in_components():
+    # 동풍과 서풍을 풍향 각도로 평균하면 엉뚱한 방향이 나오지만, 성분으로 평균하면 약한 바람이 됩니다.
+    cells = neighbors(t1h=1.0)
+    for cell in cells:
+        cells[cell].update(uuu=2.0 if cell[0] > OWN[0] else -2.0 if cell[0] < OWN[0] else 0.0, vvv=0.0)
+    [result] = interpolate_observations([(60.0, 127.0)], grid(cells), "20260101", "0900")
+    assert result.wsd == 0.0
+
+
+def test_discrete_fields_come_from_nearest_neighbor():
+    cells = neighbors(t1h=1.0, pty=0, rn1=0.0)
+    cells[(61, 127)] = {"t1h": 1.0, "pty": 1, "rn1": 2.5}
+    [near, far] = interpolate_observations([(60.45, 127.1), (59.6, 127.1)], grid(cells), "20260101", "0900")
+    assert (near.pty, near.rn1) == (1, 2.5)
+    assert (far.pty, far.rn1) == (0, 0.0)
+
+
+def test_exact_cell_and_too_few_neighbors_are_not_interpolated():
+    cells = neighbors(t1h=1.0)
+    cells[OWN] = {"t1h": 5.0}
+    # 위치가 속한 격자 자료가 있으면 보간하지 않습니다. (원래 값을 그대로 씀)
+    assert interpolate_observations([(60.3, 126.8)], grid(cells), "20260101", "0900") == [None]
+
+    sparse = dict(list(neighbors(t1h=1.0).items())[:3])
+    assert interpolate_observations([(60.0, 127.0)], grid(sparse), "20260101", "0900", min_neighbors=4) == [None]
+    [result] = interpolate_observations([(60.0, 127.0)], grid(sparse), "20260101", "0900", min_neighbors=3)
+    assert result.t1h == 1.0 and result.reh is None
+    assert interpolate_observations([], grid(cells), "20260101", "0900") == []
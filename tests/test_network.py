@@ -0,0 +1,19 @@
+import os
+import pytest
+import weather_server as ws
+
+
+def test_private_cache_dir_is_user_only(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    path = ws.private_cache_dir()
+    assert path == str(tmp_path / 'mkweather')
+    assert os.stat(path).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX 권한 검사")
+def test_private_cache_dir_rejects_shared_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    (tmp_path / 'mkweather').mkdir()
+    os.chmod(tmp_path / 'mkweather', 0o777)
+    with pytest.raises(SystemExit):
+        ws.private_cache_dir()
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from benchmarks.kma_payloads import (forecast_json, forecast_rows, forecast_xml, observation_json, observation_xml,
+                                     result_error_xml)
+from weather_payload import (MALFORMED_ERROR, PayloadParser, parse_forecast_payload, parse_observation_payload)
+
+ROWS = forecast_rows('village', '20260101', '0500', 60, 127)
+
+
+def forecast_pages(render, num_rows=1000):
+    pages = (len(ROWS) + num_rows - 1) // num_rows
+    return [render(ROWS, '20260101', '0500', 60, 127, page, num_rows) for page in range(1, pages + 1)]
+
+
+def test_observation_json_and_xml_agree():
+    json_result = parse_observation_payload(observation_json('20260101', '0900', 60, 127))
+    xml_result = parse_observation_payload(observation_xml('20260101', '0900', 60, 127))
+    assert json_result == xml_result
+    assert json_result['baseTime'] == '0900' and json_result['values']['T1H'] == '26.2'
+
+
+def test_forecast_json_and_xml_agree():
+    for json_page, xml_page in zip(forecast_pages(forecast_json), forecast_pages(forecast_xml)):
+        assert parse_forecast_payload(json_page) == parse_forecast_payload(xml_page)
+    assert sum(len(parse_forecast_payload(p)['rows']) for p in forecast_pages(forecast_xml)) == len(ROWS)
+
+
+def test_errors_agree():
+    no_data = parse_observation_payload(result_error_xml('03', 'NO_DATA'))
+    assert no_data['result_code'] == '03' and not no_data['retryable']
+    assert parse_forecast_payload(result_error_xml('03', 'NO_DATA')) == no_data
+    assert parse_observation_payload(result_error_xml('02', 'DB_ERROR'))['retryable']
+    for broken in (b'{"response": ', b'<response><header>', b''):
+        assert parse_observation_payload(broken) == {"error": MALFORMED_ERROR}
+        assert parse_forecast_payload(broken) == {"error": MALFORMED_ERROR}
+
+
+@pytest.mark.parametrize("mode", ['inline', 'thread', 'process'])
+def test_parser_modes_give_same_result(mode):
+    parser = PayloadParser(mode, threshold=4096, workers=2)
+    small = observation_json('20260101', '0900', 60, 127)
+    pages = forecast_pages(forecast_xml)
+    assert all(len(page) >= parser.threshold for page in pages)
+
+    async def main():
+        return await asyncio.gather(parser.run(parse_observation_payload, small),
+                                    *(parser.run(parse_forecast_payload, page) for page in pages))
+
+    try:
+        observation, *forecasts = asyncio.run(main())
+    finally:
+        parser.shutdown()
+    assert observation == parse_observation_payload(small)
+    assert forecasts == [parse_forecast_payload(page) for page in pages]
+    # 작은 응답은 항상 바로 처리하고, 큰 응답은 inline이 아닐 때만 풀로 넘깁니다.
+    offloaded = 0 if mode == 'inline' else len(pages)
+    assert (parser.inline, parser.offloaded) == (1 + len(pages) - offloaded, offloaded)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        PayloadParser('fork')
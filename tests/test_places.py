@@ -0,0 +1,74 @@
+import csv
+import math
+import random
+from pathlib import Path
+from weather_grid import KMA_GRID
+from weather_places import PLACES, SHORT_NAMES, Place, PlaceGridIndex, PlaceIndex, build_places_file
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'kma_grid_latlon.csv'
+
+
+def test_shipped_short_names_resolve():
+    for short in SHORT_NAMES:
+        assert len(PLACES.get(short)) == 1, short
+
+
+def test_build_places_file_keeps_short_names(tmp_path):
+    out = tmp_path / 'places.tsv'
+    count = build_places_file(FIXTURE, out)
+    index = PlaceIndex.load(out)
+    assert count == len(index)
+
+    # 생성한 파일에서도 약칭은 해당 시도 한 곳으로만 찾아집니다.
+    for short, full_names in SHORT_NAMES.items():
+        found = index.get(short)
+        assert len(found) == 1, short
+        full = [p for name in full_names for p in index.get(name) if p.name == name]
+        assert (found[0].nx, found[0].ny) == (full[0].nx, full[0].ny)
+
+    assert [p.name for p in index.get('청운효자동')] == ['서울특별시 종로구 청운효자동']
+    assert [p.name for p in index.get('광주시')] == ['경기도 광주시']
+    assert index.lookup('서울특')[0].name.startswith('서울특별시')
+
+
+def test_build_places_file_grid_matches_kma(tmp_path):
+    out = tmp_path / 'places.tsv'
+    build_places_file(FIXTURE, out)
+    index = PlaceIndex.load(out)
+    with open(FIXTURE, encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            name = " ".join(row[col] for col in ('1단계', '2단계', '3단계') if row[col])
+            place = index.get(name)[0]
+            assert (place.nx, place.ny) == (int(row['격자 X']), int(row['격자 Y']))
+
+
+def brute_force(xy, lat, lon, k, max_km=None):
+    """모든 지역과의 거리(km)를 계산해 가까운 순서로 k개를 고릅니다."""
+    x, y = KMA_GRID.to_xy(lat, lon)
+    distances = sorted(round(math.hypot(px - x, py - y) * KMA_GRID.grid_km, 2) for px, py in xy)
+    return [d for d in distances[:k] if max_km is None or d <= max_km]
+
+
+def test_grid_index_matches_brute_force():
+    rnd = random.Random(7)
+    # 도심처럼 몰린 지역과 드문드문 흩어진 지역을 섞습니다.
+    places = [Place(f"p{i}", 37.5 + rnd.gauss(0, 0.05), 127.0 + rnd.gauss(0, 0.05), 0, 0) for i in range(200)]
+    places += [Place(f"q{i}", rnd.uniform(33, 38.6), rnd.uniform(124.5, 131), 0, 0) for i in range(300)]
+    index = PlaceGridIndex(places, bucket=4)
+    xy = [KMA_GRID.to_xy(p.lat, p.lon) for p in places]
+    # 색인 범위 밖(바다, 먼 곳)의 질의도 포함합니다.
+    queries = [(37.5, 127.0), (45.0, 140.0), (20.0, 110.0)]
+    queries += [(rnd.uniform(32, 39.5), rnd.uniform(123, 132)) for _ in range(200)]
+    for k in (1, 3, 10):
+        for max_km in (None, 5.0, 30.0):
+            results = index.nearest_many(queries, k, max_km)
+            for (lat, lon), found in zip(queries, results):
+                assert [d for _, d in found] == brute_force(xy, lat, lon, k, max_km), (lat, lon, k, max_km)
+
+
+def test_grid_index_edge_cases():
+    assert PlaceGridIndex([]).nearest(37.5, 127.0) == []
+    index = PlaceGridIndex([Place("a", 37.5, 127.0, 0, 0)])
+    assert index.nearest(37.5, 127.0, k=0) == []
+    assert [p.name for p, _ in index.nearest(33.0, 126.5, k=5)] == ["a"]
+    assert index.nearest(33.0, 126.5, max_km=20) == []
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import weather_server as ws
+
+CELLS = [(60 + dx, 127) for dx in range(6)]
+
+
+def newest_hour() -> datetime:
+    return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+
+@pytest.mark.parametrize("published_newest", [False, True])
+def test_post_probe_fetches_stay_within_prefetch_limits(published_newest, kma):
+    newest = newest_hour()
+    before = newest - timedelta(hours=1)
+    kma.published = {before} | ({newest} if published_newest else set())
+    kma.delay = 0.01
+    handler, inflight, peak = kma.handler, 0, 0
+
+    async def counting(request):
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        try:
+            return await handler(request)
+        finally:
+            inflight -= 1
+
+    kma.handler = counting
+
+    async def main():
+        async with ws.open_app_context() as app:
+            app.publication.min_latency = app.publication.latency = 0
+            prefetcher = app.prefetcher
+            prefetcher.max_jitter, prefetcher.concurrency = 0, 2
+            for nx, ny in CELLS:
+                prefetcher.record(nx, ny)
+            await prefetcher.run_once()
+            # 시험 요청 뒤의 최신 자료 요청도 run_once 안에서 끝나며 백그라운드로 남지 않습니다.
+            assert not app.background
+            return prefetcher.stats()
+
+    stats = asyncio.run(main())
+    assert peak <= 2
+    hours = kma.hours()
+    if published_newest:
+        assert sorted(hours) == [newest] * len(CELLS)
+        assert (stats["refreshed"], stats["stale"]) == (len(CELLS), 0)
+    else:
+        # 최신 자료는 한 번만 확인하고, 이전 자료로 대신한 격자는 갱신된 것으로 세지 않습니다.
+        assert hours.count(newest) == 1 and hours.count(before) == len(CELLS)
+        assert (stats["refreshed"], stats["stale"]) == (0, len(CELLS))
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from weather_publication import PublicationTracker
+
+HOUR = datetime(2026, 1, 1, 9)
+
+
+def record(tracker, hour, published, seconds):
+    tracker.record(hour.strftime("%Y%m%d"), hour.strftime("%H00"), published, hour + timedelta(seconds=seconds))
+
+
+def test_base_hour_follows_latency_and_confirmation():
+    tracker = PublicationTracker(initial_latency=2400)
+    assert tracker.base_hour(HOUR + timedelta(minutes=30)) == HOUR - timedelta(hours=1)
+    assert tracker.base_hour(HOUR + timedelta(minutes=41)) == HOUR
+    record(tracker, HOUR, True, 1500)
+    assert tracker.is_published(HOUR)
+    assert tracker.base_hour(HOUR + timedelta(minutes=26)) == HOUR
+
+
+def test_bracketed_success_is_a_sample():
+    tracker = PublicationTracker(initial_latency=2400, alpha=0.5)
+    record(tracker, HOUR, False, 2000)
+    record(tracker, HOUR, True, 2300)
+    assert tracker.samples == 1
+    assert tracker.latency == pytest.approx(2400 + 0.5 * (2150 - 2400))
+
+
+def test_unbracketed_success_only_caps_latency():
+    tracker = PublicationTracker(initial_latency=2400)
+    # 지연보다 늦게 받은 자료는 언제 발표되었는지 알 수 없으므로 추정을 올리지 않습니다.
+    record(tracker, HOUR, True, 3300)
+    assert tracker.latency == 2400
+    assert tracker.samples == 0
+    # 지연보다 이르게 받은 자료는 추정을 그 시점으로 낮춥니다.
+    record(tracker, HOUR + timedelta(hours=1), True, 1800)
+    assert tracker.latency == 1800
+
+
+def test_late_no_data_pushes_latency_back():
+    tracker = PublicationTracker(initial_latency=2400, late_margin=60)
+    record(tracker, HOUR, False, 2500)
+    assert tracker.latency == 2560
+    assert tracker.base_hour(HOUR + timedelta(seconds=2530)) == HOUR - timedelta(hours=1)
+
+
+def test_ignores_unrelated_hours():
+    tracker = PublicationTracker(initial_latency=2400)
+    record(tracker, HOUR, True, 5 * 3600)
+    record(tracker, HOUR, False, -60)
+    assert tracker.latency == 2400 and tracker.no_data == 0 and not tracker.is_published(HOUR)
+
+
+def test_should_probe_window_and_interval():
+    tracker = PublicationTracker(initial_latency=2400, probe_window=600, probe_interval=30)
+    assert not tracker.should_probe(HOUR + timedelta(seconds=1700))
+    assert tracker.should_probe(HOUR + timedelta(seconds=1800))
+    assert not tracker.should_probe(HOUR + timedelta(seconds=1820))
+    assert tracker.should_probe(HOUR + timedelta(seconds=1830))
+    record(tracker, HOUR, True, 1840)
+    assert not tracker.should_probe(HOUR + timedelta(seconds=1900))
+
+
+def test_no_data_counts_as_probe():
+    tracker = PublicationTracker(initial_latency=2400, probe_window=600, probe_interval=30)
+    record(tracker, HOUR, False, 2410)
+    assert not tracker.should_probe(HOUR + timedelta(seconds=2420))
+    assert tracker.should_probe(HOUR + timedelta(seconds=2440))
+
+
+def simulate(requests_per_hour: float, true_latency: float, hours: int, seed: int):
+    """
+    요청이 드문드문 오는 서버를 흉내 냅니다. 요청마다 base_hour를 따르고, should_probe이면 이번 정각도 시험 요청합니다.
+    (요청 시점의 지연 추정 평균, 이미 발표된 자료 대신 이전 자료를 받은 요청의 비율)을 반환합니다.
+    """
+    rnd = random.Random(seed)
+    tracker = PublicationTracker(initial_latency=true_latency)
+    now = HOUR
+    end = HOUR + timedelta(hours=hours)
+    estimates, stale = [], 0
+    while now < end:
+        now += timedelta(seconds=rnd.expovariate(requests_per_hour / 3600))
+        newest = tracker.newest_hour(now)
+        published = (now - newest).total_seconds() >= true_latency
+
+        def request(hour):
+            ok = hour < newest or published
+            tracker.record(hour.strftime("%Y%m%d"), hour.strftime("%H00"), ok, now)
+            return ok
+
+        hour = tracker.base_hour(now)
+        if hour != newest and tracker.should_probe(now):
+            request(newest)
+        ok = request(hour)
+        estimates.append(tracker.latency)
+        if published and (hour != newest or not ok):
+            stale += 1
+    return sum(estimates) / len(estimates), stale / len(estimates)
+
+
+@pytest.mark.parametrize("requests_per_hour", [1, 3, 30])
+@pytest.mark.parametrize("seed", range(3))
+def test_sparse_traffic_does_not_bias_latency(requests_per_hour, seed):
+    # 드문 요청에서 정상 응답의 요청 시각을 그대로 표본으로 쓰면 추정이 실제 지연보다 크게 늘고
+    # 이미 발표된 자료 대신 이전 자료를 받는 요청이 늘어납니다.
+    latency, stale = simulate(requests_per_hour, 2400, hours=300, seed=seed)
+    assert 2300 <= latency <= 2650
+    assert stale < 0.05
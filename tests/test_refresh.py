@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import weather_server as ws
+from weather_observation import Observation
+
+CELLS = [(60 + dx, 127 + dy) for dx in range(-3, 4) for dy in range(-3, 4)]
+
+
+def newest_hour() -> datetime:
+    return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+
+def due_but_unconfirmed(app: ws.AppContext):
+    """최신 정각 자료가 나올 시각은 지났지만 아직 확인되지 않은 상태로 만듭니다."""
+    app.publication.min_latency = app.publication.latency = 0
+
+
+async def snapshot(kma):
+    """격자 49개를 16개씩 동시에 처음 조회합니다."""
+    async with ws.open_app_context() as app:
+        due_but_unconfirmed(app)
+        semaphore = asyncio.Semaphore(16)
+
+        async def one(nx, ny):
+            async with semaphore:
+                return await ws.refresh_observation(app, nx, ny)
+
+        return await asyncio.gather(*(one(nx, ny) for nx, ny in CELLS))
+
+
+@pytest.mark.parametrize("published_newest", [False, True])
+def test_cold_snapshot_probes_newest_hour_once(published_newest, kma):
+    newest = newest_hour()
+    kma.published = {newest - timedelta(hours=1)} | ({newest} if published_newest else set())
+    kma.delay = 0.02
+    results = asyncio.run(snapshot(kma))
+    assert all(isinstance(r, Observation) for r in results)
+    # 최신 정각은 시험 요청 한 번으로만 확인하고(발표되었으면 이후 격자는 최신 자료를 요청),
+    # 나머지 격자는 격자당 한 번씩만 요청합니다.
+    calls = kma.hours()
+    assert len(calls) == len(CELLS) + 1
+    if not published_newest:
+        assert calls.count(newest) == 1
+
+
+def test_older_cached_hour_is_not_served_as_previous(kma):
+    newest = newest_hour()
+    before, older = newest - timedelta(hours=1), newest - timedelta(hours=2)
+    kma.published = {before, older}
+
+    async def main():
+        async with ws.open_app_context() as app:
+            due_but_unconfirmed(app)
+            app.cache.put((60, 127, older.strftime("%Y%m%d"), older.strftime("%H00")),
+                          Observation(older.strftime("%Y%m%d"), older.strftime("%H00"), 60, 127, t1h=1.0),
+                          ws.observation_expiry(older.strftime("%Y%m%d"), older.strftime("%H00")))
+            return await ws.refresh_observation(app, 60, 127)
+
+    result = asyncio.run(main())
+    # 두 시간 전 자료 대신, 시험 요청과 함께 바로 이전 정각 자료를 받아 돌려줍니다.
+    assert result.base_time == before.strftime("%H00") and result.stale
+    assert sorted(kma.hours()) == [before, newest]
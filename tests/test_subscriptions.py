@@ -0,0 +1,127 @@
+import asyncio
+from dataclasses import replace
+import anyio
+import mcp.types as types
+import pytest
+from mcp.shared.exceptions import McpError
+from pydantic import AnyUrl
+import weather_server as ws
+from weather_observation import Observation
+from weather_subscriptions import ObservationSubscriptions
+
+BASE = Observation("20260101", "0900", 60, 127, t1h=1.0, reh=50.0)
+
+
+class FakeSession:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent: list[str] = []
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise anyio.ClosedResourceError
+        self.sent.append(uri)
+
+
+def subscriptions(refresh=None) -> ObservationSubscriptions:
+    return ObservationSubscriptions(refresh, lambda nx, ny: f"mkweather://obs/{nx}/{ny}", interval=0)
+
+
+def test_only_changes_are_notified():
+    subs = subscriptions()
+    first, second, other = FakeSession(), FakeSession(), FakeSession()
+    subs.subscribe(first, 60, 127, BASE)
+    subs.subscribe(second, 60, 127)
+    subs.subscribe(other, 61, 127)
+
+    async def main():
+        return [await subs.publish(o) for o in (
+            BASE,                                          # 구독 시점과 같은 자료
+            BASE.as_stale(),                               # 이전 자료 표시만 다름
+            replace(BASE, t1h=2.0),                        # 같은 발표시각의 값 변경
+            replace(BASE, base_time="0800", t1h=9.0),      # 더 오래된 발표 자료
+            replace(BASE, base_time="1000"),               # 새 발표시각
+        )]
+
+    assert asyncio.run(main()) == [0, 0, 2, 0, 2]
+    assert first.sent == second.sent == ["mkweather://obs/60/127"] * 2
+    assert other.sent == [] and subs.notifications == 4
+
+
+def test_run_once_refreshes_each_cell_once():
+    calls = []
+    values = {(60, 127): BASE, (61, 127): {"error": "timeout"}}
+
+    async def refresh(nx, ny):
+        calls.append((nx, ny))
+        return values[(nx, ny)]
+
+    subs = subscriptions(refresh)
+    sessions = [FakeSession() for _ in range(5)]
+    for session in sessions:
+        subs.subscribe(session, 60, 127)
+    subs.subscribe(sessions[0], 61, 127)
+
+    asyncio.run(subs.run_once())
+    assert sorted(calls) == [(60, 127), (61, 127)]
+    # 구독 시점 자료가 없었으므로 처음 받은 자료부터 알립니다.
+    assert all(s.sent == ["mkweather://obs/60/127"] for s in sessions)
+    assert subs.failed == 1
+    asyncio.run(subs.run_once())
+    assert all(len(s.sent) == 1 for s in sessions)
+
+
+def test_closed_and_dropped_sessions_are_removed():
+    subs = subscriptions()
+    closed, kept = FakeSession(fail=True), FakeSession()
+    subs.subscribe(closed, 60, 127)
+    subs.subscribe(kept, 60, 127)
+    assert asyncio.run(subs.publish(BASE)) == 1
+    assert subs.stats()["subscribers"] == 1
+
+    del kept
+    assert subs.cells() == [] and subs.stats()["cells"] == 0
+
+
+def test_subscribed_session_receives_update(kma, monkeypatch):
+    uri = AnyUrl("mkweather://obs/60/127")
+    received = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ResourceUpdatedNotification):
+            received.append(str(message.root.params.uri))
+
+    async def main():
+        from mcp.shared.memory import create_connected_server_and_client_session
+        async with ws.open_app_context() as app:
+            monkeypatch.setattr(ws, '_process_app', app)
+            async with create_connected_server_and_client_session(ws.mcp._mcp_server,
+                                                                  message_handler=on_message) as client:
+                await client.subscribe_resource(uri)
+                current = app.cache.get_latest(60, 127, ws.STALE_MAX_AGE)
+                await app.subscriptions.publish(current)
+                await app.subscriptions.publish(replace(current, t1h=current.t1h + 1))
+                await client.send_ping()
+                await client.unsubscribe_resource(uri)
+                await app.subscriptions.publish(replace(current, t1h=current.t1h + 2))
+                await client.send_ping()
+
+    asyncio.run(main())
+    # 구독 시점과 같은 자료는 알리지 않고, 구독을 해지한 뒤에는 알림이 오지 않습니다.
+    assert received == [str(uri)]
+
+
+def test_subscription_requires_api_key(kma, monkeypatch):
+    monkeypatch.setattr(ws, 'API_KEY', None)
+
+    async def main():
+        from mcp.shared.memory import create_connected_server_and_client_session
+        async with ws.open_app_context() as app:
+            monkeypatch.setattr(ws, '_process_app', app)
+            async with create_connected_server_and_client_session(ws.mcp._mcp_server) as client:
+                with pytest.raises(McpError, match="API 키"):
+                    await client.subscribe_resource(AnyUrl("mkweather://obs/60/127"))
+            return app.subscriptions.stats()
+
+    assert asyncio.run(main())["subscribers"] == 0
+    assert kma.calls == []
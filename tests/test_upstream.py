@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from weather_upstream import CircuitBreaker, UpstreamGuard, UpstreamLimiter
+
+
+def expire(breaker: CircuitBreaker):
+    """차단 시간이 지난 것처럼 만듭니다."""
+    breaker.opened_at -= breaker.cooldown
+
+
+def opened(threshold: int = 3, cooldown: float = 30.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold, cooldown)
+    for _ in range(threshold):
+        assert breaker.allow()
+        breaker.record(success=False)
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(3, 30.0)
+    for _ in range(2):
+        breaker.record(success=False)
+    breaker.record(success=True)
+    breaker.record(success=False)
+    assert breaker.state == "closed"
+
+    breaker = opened(3)
+    assert breaker.state == "open"
+    assert not breaker.allow() and breaker.rejected == 1
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = opened()
+    expire(breaker)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow() and not breaker.allow()
+    assert breaker.rejected == 2
+
+
+@pytest.mark.parametrize("success, state", [(True, "closed"), (False, "open")])
+def test_trial_result_closes_or_reopens(success, state):
+    breaker = opened()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record(success=success)
+    assert breaker.state == state
+    # 다시 열리면 차단 시간을 처음부터 셉니다.
+    assert breaker.allow() is success
+
+
+def guard_for(breaker: CircuitBreaker, max_retries: int = 0) -> UpstreamGuard:
+    return UpstreamGuard(UpstreamLimiter(1000, 1000, 10), breaker, max_retries=max_retries,
+                         backoff_base=0.001, backoff_max=0.001)
+
+
+def test_cancelled_trial_frees_the_slot():
+    breaker = opened()
+    expire(breaker)
+    guard = guard_for(breaker)
+
+    async def hang():
+        await asyncio.sleep(10)
+        return {}
+
+    async def ok():
+        return {"value": 1}
+
+    async def main():
+        trial = asyncio.ensure_future(guard.run(hang))
+        await asyncio.sleep(0.01)
+        blocked = await guard.run(ok)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return blocked, await guard.run(ok)
+
+    blocked, result = asyncio.run(main())
+    assert blocked.get("circuit_open")
+    # 취소된 시험 요청은 실패로 세지 않고, 다음 요청이 시험 요청이 되어 회로를 닫습니다.
+    assert result == {"value": 1}
+    assert breaker.state == "closed"
+
+
+def test_cancelled_request_is_not_a_failure():
+    breaker = CircuitBreaker(1, 30.0)
+    guard = guard_for(breaker)
+
+    async def hang():
+        await asyncio.sleep(10)
+        return {}
+
+    async def main():
+        task = asyncio.ensure_future(guard.run(hang))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_guard_retries_and_records_outcome():
+    breaker = CircuitBreaker(1, 30.0)
+    guard = guard_for(breaker, max_retries=2)
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        return {"error": "503", "retryable": True}
+
+    async def no_data():
+        return {"error": "NO_DATA", "result_code": "03"}
+
+    # 재시도 대상이 아닌 오류(NO_DATA 등)는 업스트림이 정상 동작한 것으로 봅니다.
+    assert asyncio.run(guard.run(no_data))["result_code"] == "03"
+    assert breaker.state == "closed"
+
+    assert asyncio.run(guard.run(flaky))["retryable"]
+    assert calls == 3 and guard.retries == 2
+    assert breaker.state == "open"
+    assert asyncio.run(guard.run(no_data)).get("circuit_open")
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationCache:
+    """
+    격자 좌표별 실황 데이터를 보관하는 프로세스 내 LRU 캐시입니다.
+    키는 (nx, ny, base_date, base_time) 형태이며, 값은 오류 딕셔너리({"error": ...})가 아닌 임의의 객체입니다.
+
+    - 항목마다 만료 시각(epoch 초)을 가지며, 만료된 항목은 get()에서 반환하지 않습니다.
+      단, 업스트림 장애 시 대체 응답으로 쓸 수 있도록 격자별 최신 항목은 LRU로 밀려날 때까지 남겨 둡니다.
+    - maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    - 같은 키에 대한 동시 요청은 하나의 업스트림 요청을 공유합니다(single-flight).
+    - store를 지정하면 메모리에 없는 항목을 업스트림 요청 전에 영속 저장소에서 먼저 찾습니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, store: "SQLiteObservationStore | None" = None):
+        self.maxsize = maxsize
+        self.store = store
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._latest: dict[tuple, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self.store_errors = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_latest(self, nx: int, ny: int, max_stale: float):
+        """만료 여부와 관계없이 격자의 가장 최근 항목을 반환합니다. (만료 후 max_stale초 이내)"""
+        key = self._latest.get((nx, ny))
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None or entry[0] + max_stale <= time.time():
+            return None
+        return entry[1]
+
+    def put(self, key: tuple, value, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        latest = self._latest.get(key[:2])
+        if latest is None or latest not in self._entries or latest[2:] <= key[2:]:
+            self._latest[key[:2]] = key
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._latest.get(evicted[:2]) == evicted:
+                del self._latest[evicted[:2]]
+            self.evictions += 1
+
+    async def get_or_fetch(self, key: tuple, fetch: Callable[[], Awaitable[object]], expires_at: float):
+        """캐시에 있으면 바로 반환하고, 없으면 fetch()를 한 번만 실행해 결과를 공유합니다."""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch, expires_at))
+            self._inflight[key] = task
+        # 한 호출자가 취소되더라도 공유 중인 요청은 계속 진행되도록 shield로 감쌉니다.
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key, fetch, expires_at):
+        try:
+            if self.store is not None:
+                stored = await self._store_call(self.store.get, key)
+                if stored is not None:
+                    self.store_hits += 1
+                    self.put(key, stored, expires_at)
+                    return stored
+
+            value = await fetch()
+            # 오류 응답은 캐시하지 않고 다음 요청에서 다시 시도합니다.
+            if not (isinstance(value, dict) and "error" in value):
+                self.put(key, value, expires_at)
+                if self.store is not None:
+                    await self._store_call(self.store.put, key, value, expires_at)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _store_call(self, method, *args):
+        """
+        영속 저장소는 최적화일 뿐이므로, 잠김(database is locked) 등 SQLite 오류가 나면
+        기록만 하고 None을 반환해 메모리 캐시와 업스트림 결과로 계속 진행합니다.
+        """
+        try:
+            return await asyncio.to_thread(method, *args)
+        except sqlite3.Error:
+            self.store_errors += 1
+            logger.warning("영속 캐시 %s 실패 (%s)", method.__name__, self.store.path, exc_info=True)
+            return None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "store_hits": self.store_hits,
+            "store_errors": self.store_errors,
+            "store": self.store.path if self.store is not None else None,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SQLiteObservationStore:
+    """
+    여러 서버 프로세스가 함께 쓰는 SQLite 기반 영속 캐시입니다.
+
+    WAL 모드를 사용하므로 읽기와 쓰기가 서로를 막지 않으며, 재시작한 서버도
+    만료되지 않은 항목은 업스트림 요청 없이 바로 사용할 수 있습니다.
+    값은 encode/decode(기본 JSON)로 문자열과 변환하여 저장합니다.
+    """
+
+    # put 호출 몇 번마다 만료 항목을 정리할지
+    PURGE_EVERY = 256
+
+    def __init__(self, path: str, busy_timeout: float = 5.0,
+                 encode: Callable[[object], str] | None = None, decode: Callable[[str], object] | None = None):
+        self.path = path
+        self._encode = encode or (lambda value: json.dumps(value, ensure_ascii=False))
+        self._decode = decode or json.loads
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS observations ("
+                           "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS observations_expires_at ON observations (expires_at)")
+
+    @staticmethod
+    def _key(key) -> str:
+        return ":".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM observations WHERE key = ? AND expires_at > ?",
+                                     (self._key(key), time.time())).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def put(self, key, value, expires_at: float):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO observations (key, value, expires_at) VALUES (?, ?, ?)",
+                               (self._key(key), self._encode(value), expires_at))
+            self._puts += 1
+            if self._puts % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM observations WHERE expires_at <= ?", (time.time(),))
+
+    def purge_expired(self) -> int:
+        """만료 항목을 지우고 지운 수를 반환합니다. 다른 프로세스가 쓰는 중이라 실패하면 다음 기회로 미룹니다."""
+        try:
+            with self._lock:
+                return self._conn.execute("DELETE FROM observations WHERE expires_at <= ?",
+                                          (time.time(),)).rowcount
+        except sqlite3.OperationalError:
+            logger.warning("영속 캐시 만료 항목 정리 실패 (%s)", self.path, exc_info=True)
+            return 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
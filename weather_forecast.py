@@ -0,0 +1,125 @@
+from __future__ import annotations
+import math
+from datetime import datetime, timedelta
+from weather_lazy import LazyModule
+
+np = LazyModule('numpy')
+
+ULTRA_URL = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst'
+VILLAGE_URL = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst'
+
+# 초단기예보: 매시 30분 발표, 45분 이후 제공 / 단기예보: 02시부터 3시간 간격 발표, 10분 이후 제공
+ULTRA_PUBLISH_MINUTE = 45
+VILLAGE_BASE_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+VILLAGE_PUBLISH_MINUTE = 10
+
+SKY_MAP = {'1': '맑음', '3': '구름많음', '4': '흐림'}
+PTY_MAP = {'0': '없음', '1': '비', '2': '비/눈', '3': '눈', '4': '소나기',
+           '5': '빗방울', '6': '빗방울/눈날림', '7': '눈날림'}
+
+
+def ultra_base_datetime(now: datetime | None = None) -> tuple[str, str]:
+    """가장 최근에 제공된 초단기예보의 발표일자와 발표시각(HH30)"""
+    now = now or datetime.now()
+    if now.minute < ULTRA_PUBLISH_MINUTE:
+        now -= timedelta(hours=1)
+    return now.strftime("%Y%m%d"), now.strftime("%H30")
+
+
+def village_base_datetime(now: datetime | None = None) -> tuple[str, str]:
+    """가장 최근에 제공된 단기예보의 발표일자와 발표시각(0200, 0500, ..., 2300)"""
+    now = now or datetime.now()
+    available = now - timedelta(minutes=VILLAGE_PUBLISH_MINUTE)
+    hours = [h for h in VILLAGE_BASE_HOURS if h <= available.hour]
+    if not hours:
+        # 02시 발표 전에는 전날 23시 발표분을 사용합니다.
+        available -= timedelta(days=1)
+        hours = [VILLAGE_BASE_HOURS[-1]]
+    return available.strftime("%Y%m%d"), f"{hours[-1]:02d}00"
+
+
+def forecast_expiry(kind: str, base_date: str, base_time: str) -> float:
+    """해당 발표분이 다음 발표로 대체되는 시각(epoch 초)"""
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    if kind == 'ultra':
+        return (base + timedelta(hours=1, minutes=ULTRA_PUBLISH_MINUTE - 30)).timestamp()
+    return (base + timedelta(hours=3, minutes=VILLAGE_PUBLISH_MINUTE)).timestamp()
+
+
+class ForecastTable:
+    """
+    한 격자의 예보 자료를 열(category) 단위로 보관하는 표입니다.
+
+    times에는 예보 시각('YYYYMMDDHHMM')이 정렬되어 있고, 숫자형 category는
+    times와 같은 길이의 float64 배열(값이 없으면 NaN)로, 강수량(PCP)·적설(SNO)처럼
+    '강수없음' 같은 문자열이 섞인 category는 문자열 목록(없으면 None)으로 저장합니다.
+    """
+
+    __slots__ = ('base_date', 'base_time', 'times', 'columns', 'text')
+
+    def __init__(self, base_date: str, base_time: str, times: list[str],
+                 columns: dict[str, np.ndarray], text: dict[str, list]):
+        self.base_date = base_date
+        self.base_time = base_time
+        self.times = times
+        self.columns = columns
+        self.text = text
+
+    @classmethod
+    def from_rows(cls, base_date: str, base_time: str, rows) -> "ForecastTable":
+        """(fcstDate, fcstTime, category, fcstValue) 행 목록으로 표를 만듭니다."""
+        times = sorted({date + time for date, time, _, _ in rows})
+        index = {t: i for i, t in enumerate(times)}
+        raw: dict[str, list] = {}
+        for date, time, category, value in rows:
+            raw.setdefault(category, [None] * len(times))[index[date + time]] = value
+
+        columns, text = {}, {}
+        for category, values in raw.items():
+            try:
+                columns[category] = np.array([math.nan if v is None else float(v) for v in values])
+            except (TypeError, ValueError):
+                text[category] = values
+        return cls(base_date, base_time, times, columns, text)
+
+    def __len__(self):
+        return len(self.times)
+
+    def value(self, category: str, i: int):
+        """i번째 예보 시각의 값 (숫자형은 float, 문자열형은 str, 없으면 None)"""
+        if category in self.columns:
+            v = self.columns[category][i]
+            return None if math.isnan(v) else float(v)
+        if category in self.text:
+            return self.text[category][i]
+        return None
+
+    def date_mask(self, date: str) -> np.ndarray:
+        return np.array([t.startswith(date) for t in self.times], dtype=bool)
+
+    def daily_summary(self, date: str) -> dict | None:
+        """특정 날짜(YYYYMMDD)의 최저/최고 기온, 최대 강수확률, 강수 시간대 등을 계산합니다."""
+        mask = self.date_mask(date)
+        if not mask.any():
+            return None
+        summary = {'date': date, 'hours': int(mask.sum())}
+
+        def masked(column):
+            # 그날 값이 하나도 없는 열은 요약에서 뺍니다. (전부 NaN이면 nanmax가 경고와 함께 nan을 반환)
+            if column is None or np.isnan(column[mask]).all():
+                return None
+            return column[mask]
+
+        temperature = masked(self.columns.get('TMP', self.columns.get('T1H')))
+        if temperature is not None:
+            summary['min_temp'] = float(np.nanmin(temperature))
+            summary['max_temp'] = float(np.nanmax(temperature))
+        # 단기예보의 일 최저(TMN)/최고(TMX) 기온이 있으면 그것을 우선하고, 강수확률과 풍속은 최댓값을 씁니다.
+        for category, key in (('TMN', 'min_temp'), ('TMX', 'max_temp'), ('POP', 'max_pop'), ('WSD', 'max_wind')):
+            column = masked(self.columns.get(category))
+            if column is not None:
+                summary[key] = float(np.nanmax(column))
+        if 'PTY' in self.columns:
+            wet = mask & (np.nan_to_num(self.columns['PTY']) > 0)
+            summary['precip_times'] = [self.times[i][8:] for i in np.flatnonzero(wet)]
+        return summary
\ No newline at end of file
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import math
+from weather_lazy import LazyModule
+
+# numpy는 배열 단위 변환이 처음 필요할 때 가져옵니다. (단일 좌표 변환은 math만 사용)
+np = LazyModule('numpy')
+
+
+class LCCProjection:
+    """
+    기상청 동네예보 격자(LCC DFS) 변환기입니다.
+    (LCC DFS GRID C Program C 소스 기반)
+
+    투영 상수(sn, sf, ro)는 생성 시 한 번만 계산하고,
+    단일 좌표 변환(to_grid)과 NumPy 배열 단위 변환(forward/inverse)을 제공합니다.
+    """
+
+    def __init__(self, re=6371.00877, grid=5.0, slat1=30.0, slat2=60.0,
+                 olon=126.0, olat=38.0, xo=43, yo=136):
+        self.degrad = math.pi / 180.0
+        self.raddeg = 180.0 / math.pi
+        self.grid_km = grid
+        self.re = re / grid
+        self.xo = xo
+        self.yo = yo
+
+        slat1 = slat1 * self.degrad
+        slat2 = slat2 * self.degrad
+        self.olon = olon * self.degrad
+        olat = olat * self.degrad
+
+        sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+        self.sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+        sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+        self.sf = (sf ** self.sn) * math.cos(slat1) / self.sn
+        ro = math.tan(math.pi * 0.25 + olat * 0.5)
+        self.ro = re / grid * self.sf / (ro ** self.sn)
+
+    def to_grid(self, lat: float, lon: float) -> tuple[int, int]:
+        """위도, 경도 한 쌍을 격자 (nx, ny)로 변환합니다."""
+        x, y = self.to_xy(lat, lon)
+        return int(x + 0.5), int(y + 0.5)
+
+    def to_xy(self, lat: float, lon: float) -> tuple[float, float]:
+        """위도, 경도 한 쌍을 반올림 전의 연속 격자 좌표(격자 간격 단위)로 변환합니다."""
+        ra = math.tan(math.pi * 0.25 + lat * self.degrad * 0.5)
+        ra = self.re * self.sf / (ra ** self.sn)
+        theta = lon * self.degrad - self.olon
+        if theta > math.pi: theta -= 2 * math.pi
+        if theta < -math.pi: theta += 2 * math.pi
+        theta *= self.sn
+        x = ra * math.sin(theta) + self.xo
+        y = self.ro - ra * math.cos(theta) + self.yo
+        return x, y
+
+    def forward(self, lat, lon) -> tuple[np.ndarray, np.ndarray]:
+        """위도, 경도 배열을 격자 nx, ny 정수 배열로 변환합니다."""
+        x, y = self.forward_xy(lat, lon)
+        # int()와 동일하게 0 방향으로 버림합니다.
+        return (x + 0.5).astype(np.int64), (y + 0.5).astype(np.int64)
+
+    def forward_xy(self, lat, lon) -> tuple[np.ndarray, np.ndarray]:
+        """위도, 경도 배열을 반올림 전의 연속 격자 좌표 배열로 변환합니다."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        ra = np.tan(math.pi * 0.25 + lat * self.degrad * 0.5)
+        ra = self.re * self.sf / (ra ** self.sn)
+        theta = lon * self.degrad - self.olon
+        theta = np.where(theta > math.pi, theta - 2 * math.pi, theta)
+        theta = np.where(theta < -math.pi, theta + 2 * math.pi, theta)
+        theta *= self.sn
+        x = ra * np.sin(theta) + self.xo
+        y = self.ro - ra * np.cos(theta) + self.yo
+        return x, y
+
+    def inverse(self, nx, ny) -> tuple[np.ndarray, np.ndarray]:
+        """격자 nx, ny 배열을 격자 중심의 위도, 경도 배열로 변환합니다."""
+        xn = np.asarray(nx, dtype=np.float64) - self.xo
+        yn = self.ro - np.asarray(ny, dtype=np.float64) + self.yo
+        ra = np.sqrt(xn * xn + yn * yn)
+        if self.sn < 0.0: ra = -ra
+        alat = (self.re * self.sf / ra) ** (1.0 / self.sn)
+        alat = 2.0 * np.arctan(alat) - math.pi * 0.5
+        theta = np.where(xn == 0.0, 0.0, np.arctan2(xn, yn))
+        alon = theta / self.sn + self.olon
+        return alat * self.raddeg, alon * self.raddeg
+
+
+# 기상청 동네예보 격자 (5km, 149 x 253)
+KMA_GRID = LCCProjection()
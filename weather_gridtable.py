@@ -0,0 +1,143 @@
+from __future__ import annotations
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from weather_grid import KMA_GRID, LCCProjection
+from weather_lazy import LazyModule
+from weather_region import GRID_NX, GRID_NY
+
+np = LazyModule('numpy')
+logger = logging.getLogger(__name__)
+
+GRID_TABLE_FILE = Path(os.environ.get('KOREA_WEATHER_GRID_TABLE',
+                                      Path(__file__).parent / 'data' / 'grid_table.bin'))
+
+# 파일 머리: 식별자, 첫 칸의 위도/경도, 해상도(도), 행(위도) 수, 열(경도) 수
+MAGIC = b'KMAGRID1'
+HEADER = struct.Struct('<8sdddII')
+# 칸 안의 연속 격자 좌표가 격자 경계에서 이 거리(격자 간격 단위, 약 5m) 안에 들면 정확한 계산으로 넘깁니다.
+BOUNDARY_MARGIN = 1e-3
+
+
+class GridLookupTable:
+    """
+    위도/경도를 resolution도 단위 칸으로 나눠 칸마다 격자 (nx, ny)를 미리 저장한 표입니다. (파일을 메모리 매핑)
+
+    칸 하나가 통째로 한 격자 안에 들어가는 경우에만 값을 저장하고, 격자 경계에 걸친 칸과 범위 밖은 0으로 둡니다.
+    0인 칸은 LCCProjection으로 직접 계산하므로 결과는 항상 직접 계산(convert_to_grid)과 같습니다.
+    한 칸은 2바이트(nx, ny)이며, 운영체제가 실제로 읽은 페이지만 메모리에 올립니다.
+    """
+
+    def __init__(self, path: str | os.PathLike, projection: LCCProjection = KMA_GRID):
+        self.path = Path(path)
+        self.projection = projection
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.lat0, self.lon0, self.resolution, self.rows, self.cols = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != HEADER.size + self.rows * self.cols * 2:
+            self._map.close()
+            raise ValueError(f"격자 조회 표 형식이 올바르지 않습니다: {self.path}")
+        self._scale = 1.0 / self.resolution
+        self._cells = None
+        self.fallbacks = 0
+
+    def to_grid(self, lat: float, lon: float) -> tuple[int, int]:
+        """위도, 경도 한 쌍을 격자 (nx, ny)로 변환합니다. (KMA_GRID.to_grid와 같은 결과)"""
+        i = (lat - self.lat0) * self._scale
+        j = (lon - self.lon0) * self._scale
+        if 0 <= i < self.rows and 0 <= j < self.cols:
+            offset = HEADER.size + (int(i) * self.cols + int(j)) * 2
+            nx = self._map[offset]
+            if nx:
+                return nx, self._map[offset + 1]
+        self.fallbacks += 1
+        return self.projection.to_grid(lat, lon)
+
+    def forward(self, lat, lon) -> tuple[np.ndarray, np.ndarray]:
+        """위도, 경도 배열을 격자 nx, ny 정수 배열로 변환합니다. (LCCProjection.forward와 같은 결과)"""
+        if self._cells is None:
+            self._cells = np.frombuffer(self._map, dtype=np.uint8, offset=HEADER.size).reshape(-1, 2)
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        i = np.floor((lat - self.lat0) * self._scale)
+        j = np.floor((lon - self.lon0) * self._scale)
+        inside = (i >= 0) & (i < self.rows) & (j >= 0) & (j < self.cols)
+        cells = self._cells[np.where(inside, i * self.cols + j, 0).astype(np.int64)]
+        nx, ny = cells[..., 0].astype(np.int64), cells[..., 1].astype(np.int64)
+        exact = ~inside | (nx == 0)
+        if exact.any():
+            nx[exact], ny[exact] = self.projection.forward(lat[exact], lon[exact])
+            self.fallbacks += int(exact.sum())
+        return nx, ny
+
+    def close(self):
+        self._cells = None
+        self._map.close()
+
+    def stats(self) -> dict:
+        return {"path": str(self.path), "resolution": self.resolution, "rows": self.rows, "cols": self.cols,
+                "bytes": len(self._map), "fallbacks": self.fallbacks}
+
+
+def load_grid_table(path: str | os.PathLike = GRID_TABLE_FILE) -> GridLookupTable | None:
+    """표 파일이 있으면 열고, 없거나 읽을 수 없으면 None을 반환합니다. (직접 계산을 사용)"""
+    if not Path(path).is_file():
+        return None
+    try:
+        return GridLookupTable(path)
+    except (OSError, ValueError, struct.error):
+        logger.warning("격자 조회 표를 읽지 못해 직접 계산합니다: %s", path, exc_info=True)
+        return None
+
+
+def build_grid_table(path: str | os.PathLike = GRID_TABLE_FILE, resolution: float = 0.001,
+                     projection: LCCProjection = KMA_GRID, block_rows: int = 256) -> dict:
+    """
+    격자 범위(1~GRID_NX, 1~GRID_NY)를 덮는 위도/경도 조회 표를 만들어 path에 저장합니다.
+    칸의 네 꼭짓점을 연속 격자 좌표로 바꿔, 경계 여유(BOUNDARY_MARGIN)를 두고도 모두 같은 격자에 들면 그 격자를 저장합니다.
+    메모리를 아끼기 위해 block_rows행씩 나눠 계산합니다.
+    """
+    # 격자 바깥 테두리를 위도/경도로 바꿔 표가 덮을 범위를 정합니다.
+    t = np.linspace(0.5, GRID_NX + 0.5, 4 * GRID_NX)
+    u = np.linspace(0.5, GRID_NY + 0.5, 4 * GRID_NY)
+    edge_x = np.concatenate([t, t, np.full_like(u, 0.5), np.full_like(u, GRID_NX + 0.5)])
+    edge_y = np.concatenate([np.full_like(t, 0.5), np.full_like(t, GRID_NY + 0.5), u, u])
+    edge_lat, edge_lon = projection.inverse(edge_x, edge_y)
+    lat0 = math.floor(edge_lat.min() / resolution - 1) * resolution
+    lon0 = math.floor(edge_lon.min() / resolution - 1) * resolution
+    rows = math.ceil((edge_lat.max() - lat0) / resolution) + 1
+    cols = math.ceil((edge_lon.max() - lon0) / resolution) + 1
+
+    lon_edges = lon0 + np.arange(cols + 1) * resolution
+    uniform_cells = 0
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, lat0, lon0, resolution, rows, cols))
+        for start in range(0, rows, block_rows):
+            stop = min(rows, start + block_rows)
+            lat_edges = lat0 + np.arange(start, stop + 1) * resolution
+            x, y = projection.forward_xy(*np.meshgrid(lat_edges, lon_edges, indexing='ij'))
+            cells = np.zeros((stop - start, cols, 2), dtype=np.uint8)
+            for values, limit, out in ((x, GRID_NX, cells[..., 0]), (y, GRID_NY, cells[..., 1])):
+                corners = (values[:-1, :-1], values[:-1, 1:], values[1:, :-1], values[1:, 1:])
+                low = np.floor(np.minimum.reduce(corners) + 0.5 - BOUNDARY_MARGIN)
+                high = np.floor(np.maximum.reduce(corners) + 0.5 + BOUNDARY_MARGIN)
+                out[...] = np.where((low == high) & (low >= 1) & (low <= limit), low, 0)
+            # 한쪽 축이라도 경계에 걸치면 칸 전체를 직접 계산하도록 0으로 둡니다.
+            cells[(cells[..., 0] == 0) | (cells[..., 1] == 0)] = 0
+            uniform_cells += int((cells[..., 0] > 0).sum())
+            f.write(cells.tobytes())
+    return {"path": str(path), "resolution": resolution, "rows": rows, "cols": cols,
+            "bytes": HEADER.size + rows * cols * 2, "coverage": uniform_cells / (rows * cols)}
+
+
+if __name__ == "__main__":
+    # 사용법: python weather_gridtable.py [해상도(도), 기본 0.001] [출력 파일]
+    info = build_grid_table(sys.argv[2] if len(sys.argv) > 2 else GRID_TABLE_FILE,
+                            float(sys.argv[1]) if len(sys.argv) > 1 else 0.001)
+    print(f"{info['path']}: {info['rows']} x {info['cols']}칸, {info['bytes'] / 1e6:.1f}MB, "
+          f"표로 바로 찾는 칸 {info['coverage'] * 100:.1f}%")
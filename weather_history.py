@@ -0,0 +1,88 @@
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import datetime
+from weather_lazy import LazyModule
+from weather_observation import CATEGORY_FIELDS, Observation
+
+np = LazyModule('numpy')
+
+FIELDS = tuple(CATEGORY_FIELDS.values())
+
+
+def hour_index(base_date: str, base_time: str) -> int:
+    """발표일자/시각을 1970년부터의 시간 수(정수)로 바꿉니다. 링 버퍼 위치 계산에 씁니다."""
+    return int(datetime.strptime(base_date + base_time, "%Y%m%d%H%M").timestamp() // 3600)
+
+
+class ObservationHistory:
+    """
+    격자별 최근 hours시간의 실황을 보관하는 링 버퍼입니다.
+
+    모든 격자가 하나의 float32 배열(max_cells x hours x category)을 나눠 쓰므로 메모리 사용량은
+    max_bytes 이하로 고정되며, 격자 수가 가득 차면 가장 오래 사용되지 않은 격자부터 비웁니다.
+    시각 h의 자료는 h % hours 칸에 저장하고, 그 칸의 시각을 함께 기록해 오래된 값과 구분합니다.
+    배열은 첫 기록 때 할당합니다.
+    """
+
+    def __init__(self, hours: int = 24, max_bytes: int = 16 * 1024 * 1024):
+        self.hours = hours
+        per_cell = hours * (len(FIELDS) * 4 + 4)
+        self.max_cells = max(1, max_bytes // per_cell)
+        self.values = self.stamps = None
+        self._slots: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._free = list(range(self.max_cells - 1, -1, -1))
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _slot(self, nx: int, ny: int, create: bool) -> int | None:
+        slot = self._slots.get((nx, ny))
+        if slot is not None:
+            self._slots.move_to_end((nx, ny))
+            return slot
+        if not create:
+            return None
+        if self.values is None:
+            # zeros는 실제로 쓰인 페이지만 메모리를 차지합니다. 유효 여부는 stamps로 판단합니다.
+            self.values = np.zeros((self.max_cells, self.hours, len(FIELDS)), dtype=np.float32)
+            self.stamps = np.full((self.max_cells, self.hours), -1, dtype=np.int32)
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self.evictions += 1
+        self.stamps[slot] = -1
+        self._slots[(nx, ny)] = slot
+        return slot
+
+    def record(self, observation: Observation):
+        hour = hour_index(observation.base_date, observation.base_time)
+        slot = self._slot(observation.nx, observation.ny, create=True)
+        # 늦게 도착한 hours시간 이전 자료가 같은 칸의 더 최근 값을 덮어쓰지 않게 합니다.
+        if self.stamps[slot, hour % self.hours] > hour:
+            return
+        self.stamps[slot, hour % self.hours] = hour
+        self.values[slot, hour % self.hours] = [np.nan if (v := getattr(observation, name)) is None else v
+                                                for name in FIELDS]
+
+    def missing(self, nx: int, ny: int, hours: list[int]) -> list[int]:
+        """hours 중 보관되어 있지 않은 시각 목록"""
+        slot = self._slot(nx, ny, create=False)
+        if slot is None:
+            return list(hours)
+        return [h for h in hours if self.stamps[slot, h % self.hours] != h]
+
+    def series(self, nx: int, ny: int, hours: list[int]) -> np.ndarray:
+        """hours 순서대로 category 값 배열(len(hours) x category)을 반환합니다. 없는 시각은 NaN입니다."""
+        out = np.full((len(hours), len(FIELDS)), np.nan, dtype=np.float32)
+        slot = self._slot(nx, ny, create=False)
+        if slot is not None:
+            for i, h in enumerate(hours):
+                if self.stamps[slot, h % self.hours] == h:
+                    out[i] = self.values[slot, h % self.hours]
+        return out
+
+    def stats(self) -> dict:
+        return {"cells": len(self._slots), "max_cells": self.max_cells, "hours": self.hours,
+                "bytes": self.max_cells * self.hours * (len(FIELDS) + 1) * 4, "evictions": self.evictions}
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections.abc import Callable
+from weather_lazy import LazyModule
+from weather_observation import Observation
+
+np = LazyModule('numpy')
+
+# 역거리 가중으로 보간하는 연속 값
+CONTINUOUS_FIELDS = ('t1h', 'reh', 'uuu', 'vvv')
+# 강수형태, 강수량처럼 불연속인 값은 평균하지 않고 가장 가까운 이웃 격자의 값을 씁니다.
+NEAREST_FIELDS = ('pty', 'rn1')
+
+# 대상 격자를 둘러싼 8개 이웃 격자의 (dx, dy)
+NEIGHBOR_OFFSETS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy)
+
+
+def idw(x: np.ndarray, y: np.ndarray, cell_x: np.ndarray, cell_y: np.ndarray, values: np.ndarray,
+        power: float = 2.0) -> np.ndarray:
+    """
+    연속 격자 좌표 x, y(N)에서 이웃 격자 중심 cell_x, cell_y(N, K)의 값 values(N, K, F)를
+    역거리 가중 평균한 (N, F) 배열을 반환합니다. NaN 값은 가중치에서 빠지고, 쓸 값이 없으면 NaN입니다.
+    """
+    d2 = (cell_x - x[:, None]) ** 2 + (cell_y - y[:, None]) ** 2
+    weights = 1.0 / np.maximum(d2, 1e-12) ** (power / 2)
+    present = ~np.isnan(values)
+    weights = np.where(present, weights[:, :, None], 0.0)
+    total = weights.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (weights * np.where(present, values, 0.0)).sum(axis=1) / total
+
+
+def interpolate_observations(points: list[tuple[float, float]], lookup: Callable[[int, int], Observation | None],
+                             base_date: str, base_time: str, min_neighbors: int = 4) -> list[Observation | None]:
+    """
+    연속 격자 좌표 (x, y) 목록의 실황을 이웃 격자 값으로 한 번에 보간합니다.
+    lookup(nx, ny)는 해당 발표시각의 자료가 있으면 Observation, 없으면 None을 반환해야 합니다.
+    위치가 속한 격자 자체의 자료가 있거나, 자료가 있는 이웃이 min_neighbors개 미만이면 그 위치는 None입니다.
+    기온, 습도, 바람성분은 역거리 가중 평균, 풍향/풍속은 보간한 바람성분에서 다시 계산합니다.
+    """
+    if not points:
+        return []
+    xy = np.asarray(points, dtype=np.float64)
+    x, y = xy[:, 0], xy[:, 1]
+    # to_grid와 같은 반올림으로 위치가 속한 격자를 구합니다.
+    own_x, own_y = (x + 0.5).astype(np.int64), (y + 0.5).astype(np.int64)
+    offsets = np.array(NEIGHBOR_OFFSETS, dtype=np.int64)
+    cell_x = own_x[:, None] + offsets[:, 0]
+    cell_y = own_y[:, None] + offsets[:, 1]
+
+    names = CONTINUOUS_FIELDS + NEAREST_FIELDS
+    values = np.full(cell_x.shape + (len(names),), np.nan)
+    skip = np.zeros(len(points), dtype=bool)
+    for i, (cx, cy) in enumerate(zip(own_x.tolist(), own_y.tolist())):
+        if lookup(cx, cy) is not None:
+            skip[i] = True
+            continue
+        for k, (nx, ny) in enumerate(zip(cell_x[i].tolist(), cell_y[i].tolist())):
+            observation = lookup(nx, ny)
+            if observation is not None:
+                values[i, k] = [np.nan if v is None else v for v in (getattr(observation, n) for n in names)]
+
+    continuous = len(CONTINUOUS_FIELDS)
+    neighbors = (~np.isnan(values[:, :, :continuous])).any(axis=2).sum(axis=1)
+    usable = ~skip & (neighbors >= min_neighbors)
+    estimate = idw(x, y, cell_x.astype(np.float64), cell_y.astype(np.float64), values[:, :, :continuous])
+
+    # 불연속 값은 자료가 있는 이웃 중 가장 가까운 격자에서 가져옵니다.
+    d2 = (cell_x - x[:, None]) ** 2 + (cell_y - y[:, None]) ** 2
+    nearest = values[:, :, continuous:]
+    order = np.argmin(np.where(np.isnan(nearest), np.inf, d2[:, :, None]), axis=1)
+    nearest = np.take_along_axis(nearest, order[:, None, :], axis=1)[:, 0, :]
+
+    t1h, reh, uuu, vvv = estimate.T
+    wsd = np.hypot(uuu, vvv)
+    # 풍향은 바람이 불어오는 방향입니다. (동쪽 + 동서성분, 북쪽 + 남북성분 기준)
+    vec = np.mod(270.0 - np.degrees(np.arctan2(vvv, uuu)), 360.0)
+
+    def value(array, i, digits=1):
+        return None if np.isnan(array[i]) else round(float(array[i]), digits)
+
+    results = []
+    for i in range(len(points)):
+        if not usable[i]:
+            results.append(None)
+            continue
+        pty = nearest[i, 0]
+        results.append(Observation(base_date, base_time, int(own_x[i]), int(own_y[i]),
+                                   t1h=value(t1h, i), rn1=value(nearest[:, 1], i), uuu=value(uuu, i),
+                                   vvv=value(vvv, i), reh=value(reh, i, 0),
+                                   pty=None if np.isnan(pty) else int(pty),
+                                   vec=value(vec, i, 0), wsd=value(wsd, i), interpolated=True))
+    return results
@@ -0,0 +1,20 @@
+import importlib
+
+
+class LazyModule:
+    """
+    처음 속성에 접근할 때 실제 모듈을 가져오는 대리 객체입니다.
+    stdio 전송은 클라이언트마다 새 프로세스를 띄우므로, 첫 응답에 필요 없는 무거운 모듈(numpy 등)은
+    실제로 쓰일 때까지 가져오지 않습니다. 한 번 가져온 속성은 인스턴스에 저장해 이후에는 비용이 없습니다.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        return f"<LazyModule {self._name}>"
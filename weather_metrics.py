@@ -0,0 +1,170 @@
+import functools
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# 지연 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Prometheus 출력 시 지표별 라벨 이름 (지정하지 않으면 'kind')
+LABEL_NAMES = {'tool_requests': 'tool', 'tool_inflight': 'tool', 'tool_latency': 'tool', 'stage': 'stage'}
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _NullTimer:
+    """계측이 꺼져 있을 때 쓰는 아무 일도 하지 않는 타이머"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "label", "start")
+
+    def __init__(self, metrics, name, label):
+        self.metrics, self.name, self.label = metrics, name, label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.label)
+        return False
+
+
+class _Inflight:
+    __slots__ = ("metrics", "name", "label")
+
+    def __init__(self, metrics, name, label):
+        self.metrics, self.name, self.label = metrics, name, label
+
+    def __enter__(self):
+        self.metrics.gauges[(self.name, self.label)] += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.gauges[(self.name, self.label)] -= 1
+        return False
+
+
+class Metrics:
+    """
+    프로세스 단위의 가벼운 카운터/게이지/히스토그램 모음입니다.
+    enabled가 False이면 모든 기록 함수가 바로 반환되어 거의 비용이 들지 않습니다.
+    각 지표는 (이름, 라벨) 쌍으로 구분합니다. (예: ('tool_requests', 'get_current_weather'))
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.counters: defaultdict[tuple, int] = defaultdict(int)
+        self.gauges: defaultdict[tuple, int] = defaultdict(int)
+        self.histograms: defaultdict[tuple, Histogram] = defaultdict(Histogram)
+
+    def inc(self, name: str, label: str = "", amount: int = 1):
+        if self.enabled:
+            self.counters[(name, label)] += amount
+
+    def observe(self, name: str, seconds: float, label: str = ""):
+        if self.enabled:
+            self.histograms[(name, label)].observe(seconds)
+
+    def timer(self, name: str, label: str = ""):
+        """with 블록의 실행 시간을 히스토그램에 기록합니다."""
+        return _Timer(self, name, label) if self.enabled else _NULL_TIMER
+
+    def inflight(self, name: str, label: str = ""):
+        """with 블록 안에 있는 동안 게이지를 1 올립니다."""
+        return _Inflight(self, name, label) if self.enabled else _NULL_TIMER
+
+    def reset(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        """JSON으로 내보내기 좋은 형태로 현재 값을 정리합니다."""
+        def grouped(items, convert):
+            out = defaultdict(dict)
+            for (name, label), value in items:
+                out[name][label or "total"] = convert(value)
+            return dict(out)
+
+        def summarize(h: Histogram):
+            return {"count": h.count, "sum_ms": round(h.sum * 1000, 3),
+                    "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else 0.0,
+                    "buckets": {f"le_{b}": c for b, c in zip(LATENCY_BUCKETS + ("inf",), _cumulative(h.counts))}}
+
+        return {"enabled": self.enabled,
+                "counters": grouped(self.counters.items(), int),
+                "gauges": grouped(self.gauges.items(), int),
+                "histograms": grouped(self.histograms.items(), summarize)}
+
+    def prometheus(self, prefix: str = "mkweather") -> str:
+        """Prometheus 텍스트 노출 형식으로 변환합니다."""
+        lines = []
+        for kind, items in (("counter", self.counters), ("gauge", self.gauges)):
+            for name in sorted({n for n, _ in items}):
+                metric = f"{prefix}_{name}" + ("_total" if kind == "counter" else "")
+                lines.append(f"# TYPE {metric} {kind}")
+                for (n, label), value in sorted(items.items()):
+                    if n == name:
+                        lines.append(f"{metric}{_labels(name, label)} {value}")
+        for name in sorted({n for n, _ in self.histograms}):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for (n, label), h in sorted(self.histograms.items()):
+                if n != name: continue
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), _cumulative(h.counts)):
+                    lines.append(f"{metric}_bucket{_labels(name, label, le=bound)} {count}")
+                lines.append(f"{metric}_sum{_labels(name, label)} {h.sum}")
+                lines.append(f"{metric}_count{_labels(name, label)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _cumulative(counts):
+    total = 0
+    for count in counts:
+        total += count
+        yield total
+
+
+def _labels(name: str, label: str, **extra) -> str:
+    pairs = ([f'{LABEL_NAMES.get(name, "kind")}="{label}"'] if label else []) + [f'{k}="{v}"' for k, v in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+METRICS = Metrics(enabled=os.environ.get('KOREA_WEATHER_METRICS', '1') not in ('0', 'false', 'False'))
+
+
+def instrument_tool(fn):
+    """도구 함수의 호출 수, 처리 중인 요청 수, 응답 시간을 기록하는 데코레이터"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not METRICS.enabled:
+            return await fn(*args, **kwargs)
+        METRICS.inc('tool_requests', name)
+        with METRICS.inflight('tool_inflight', name), METRICS.timer('tool_latency', name):
+            return await fn(*args, **kwargs)
+    return wrapper
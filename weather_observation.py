@@ -0,0 +1,62 @@
+import json
+import math
+from dataclasses import asdict, dataclass, replace
+
+# 실황 category와 Observation 필드 이름
+CATEGORY_FIELDS = {'T1H': 't1h', 'RN1': 'rn1', 'UUU': 'uuu', 'VVV': 'vvv',
+                   'REH': 'reh', 'PTY': 'pty', 'VEC': 'vec', 'WSD': 'wsd'}
+
+
+def _to_float(value) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # 기상청은 결측값을 +900 이상 또는 -900 이하로 표시합니다.
+    return None if math.isnan(number) or abs(number) >= 900 else number
+
+
+@dataclass(slots=True, frozen=True)
+class Observation:
+    """
+    한 격자의 초단기 실황 한 건입니다.
+    값은 기상청 원본 단위의 숫자로 보관하며(없으면 None), 한국어 문장은 도구 응답을 만들 때만 생성합니다.
+    stale은 최신 자료 대신 이전 발표 자료를 제공할 때 True입니다.
+    interpolated는 격자 자체를 조회하지 않고 이웃 격자 값으로 보간한 추정값일 때 True입니다.
+    """
+    base_date: str
+    base_time: str
+    nx: int
+    ny: int
+    t1h: float | None = None   # 기온(℃)
+    rn1: float | None = None   # 1시간 강수량(mm)
+    uuu: float | None = None   # 동서바람성분(m/s, 동쪽 +)
+    vvv: float | None = None   # 남북바람성분(m/s, 북쪽 +)
+    reh: float | None = None   # 습도(%)
+    pty: int | None = None     # 강수형태 코드
+    vec: float | None = None   # 풍향(deg)
+    wsd: float | None = None   # 풍속(m/s)
+    stale: bool = False
+    interpolated: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: dict, nx: int, ny: int) -> "Observation":
+        """파싱된 응답({'baseDate', 'baseTime', 'values'})으로 실황을 만듭니다."""
+        values = payload['values']
+        fields = {name: _to_float(values.get(category)) for category, name in CATEGORY_FIELDS.items()}
+        if fields['pty'] is not None:
+            fields['pty'] = int(fields['pty'])
+        return cls(payload['baseDate'], payload['baseTime'], nx, ny, **fields)
+
+    def as_stale(self) -> "Observation":
+        return replace(self, stale=True)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> "Observation":
+        return cls(**json.loads(text))
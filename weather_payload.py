@@ -0,0 +1,181 @@
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from xml.etree.ElementTree import ParseError, iterparse
+
+MALFORMED_ERROR = "API 응답 데이터 형식이 올바르지 않습니다."
+
+# 잠시 후 다시 요청하면 성공할 수 있는 결과 코드
+# (01 APPLICATION_ERROR, 02 DB_ERROR, 04 HTTP_ERROR, 05 SERVICETIME_OUT)
+RETRYABLE_RESULT_CODES = {'01', '02', '04', '05'}
+
+
+def _result_error(code, message) -> dict:
+    return {"error": f"API 결과 오류: {message or '알 수 없음'} (코드 {code})", "result_code": code,
+            "retryable": code in RETRYABLE_RESULT_CODES}
+
+
+def parse_json_observation(content: bytes) -> dict:
+    """
+    초단기 실황 JSON 응답에서 발표일자/시각과 category별 obsrValue만 추출합니다.
+    반환 형식: {'baseDate': '20250805', 'baseTime': '2000', 'values': {'T1H': '26.2', ...}}
+    """
+    try:
+        response = json.loads(content)['response']
+        header = response['header']
+        if header.get('resultCode') != '00':
+            return _result_error(header.get('resultCode'), header.get('resultMsg'))
+        items = response['body']['items']['item']
+        values = {item['category']: item['obsrValue'] for item in items}
+        return {'baseDate': items[0]['baseDate'], 'baseTime': items[0]['baseTime'], 'values': values}
+    except (ValueError, KeyError, TypeError, IndexError):
+        return {"error": MALFORMED_ERROR}
+
+
+def parse_xml_observation(content: bytes) -> dict:
+    """
+    초단기 실황 XML 응답을 iterparse로 한 번 훑으며 필요한 값만 추출합니다.
+    반환 형식은 parse_json_observation과 같습니다.
+    """
+    base_date = base_time = category = None
+    result_code = result_msg = None
+    values = {}
+    try:
+        for _, elem in iterparse(BytesIO(content)):
+            tag = elem.tag
+            if tag == 'item':
+                # 처리가 끝난 item은 바로 비워 메모리 사용을 줄입니다.
+                elem.clear()
+            elif tag == 'category':
+                category = elem.text
+            elif tag == 'obsrValue':
+                values[category] = elem.text
+            elif tag == 'baseDate':
+                base_date = elem.text
+            elif tag == 'baseTime':
+                base_time = elem.text
+            elif tag in ('resultCode', 'returnReasonCode'):
+                result_code = elem.text
+            elif tag in ('resultMsg', 'returnAuthMsg'):
+                result_msg = elem.text
+    except ParseError:
+        return {"error": MALFORMED_ERROR}
+
+    if result_code not in (None, '00'):
+        return _result_error(result_code, result_msg)
+    if not values or base_date is None:
+        return {"error": MALFORMED_ERROR}
+    return {'baseDate': base_date, 'baseTime': base_time, 'values': values}
+
+
+def parse_observation_payload(content: bytes) -> dict:
+    """
+    응답 본문의 형식을 판별하여 알맞은 파서로 처리합니다.
+    JSON을 요청해도 인증 오류 등은 XML로 응답되므로 요청 형식 대신 본문을 기준으로 판단합니다.
+    """
+    if content.lstrip()[:1] == b'<':
+        return parse_xml_observation(content)
+    return parse_json_observation(content)
+
+
+def parse_json_forecast(content: bytes) -> dict:
+    """
+    예보(초단기예보/단기예보) JSON 응답 한 페이지에서 전체 건수와 예보 행만 추출합니다.
+    반환 형식: {'totalCount': 809, 'rows': [(fcstDate, fcstTime, category, fcstValue), ...]}
+    """
+    try:
+        response = json.loads(content)['response']
+        header = response['header']
+        if header.get('resultCode') != '00':
+            return _result_error(header.get('resultCode'), header.get('resultMsg'))
+        body = response['body']
+        rows = [(item['fcstDate'], item['fcstTime'], item['category'], item['fcstValue'])
+                for item in body['items']['item']]
+        return {'totalCount': int(body['totalCount']), 'rows': rows}
+    except (ValueError, KeyError, TypeError):
+        return {"error": MALFORMED_ERROR}
+
+
+def parse_xml_forecast(content: bytes) -> dict:
+    """예보 XML 응답을 iterparse로 처리합니다. 반환 형식은 parse_json_forecast와 같습니다."""
+    rows, item = [], {}
+    total_count = result_code = result_msg = None
+    try:
+        for _, elem in iterparse(BytesIO(content)):
+            tag = elem.tag
+            if tag == 'item':
+                rows.append((item.get('fcstDate'), item.get('fcstTime'), item.get('category'), item.get('fcstValue')))
+                item = {}
+                elem.clear()
+            elif tag in ('fcstDate', 'fcstTime', 'category', 'fcstValue'):
+                item[tag] = elem.text
+            elif tag == 'totalCount':
+                total_count = elem.text
+            elif tag in ('resultCode', 'returnReasonCode'):
+                result_code = elem.text
+            elif tag in ('resultMsg', 'returnAuthMsg'):
+                result_msg = elem.text
+    except ParseError:
+        return {"error": MALFORMED_ERROR}
+
+    if result_code not in (None, '00'):
+        return _result_error(result_code, result_msg)
+    try:
+        return {'totalCount': int(total_count), 'rows': rows}
+    except (TypeError, ValueError):
+        return {"error": MALFORMED_ERROR}
+
+
+def parse_forecast_payload(content: bytes) -> dict:
+    """응답 본문 형식에 맞춰 예보 파서를 선택합니다."""
+    if content.lstrip()[:1] == b'<':
+        return parse_xml_forecast(content)
+    return parse_json_forecast(content)
+
+
+class PayloadParser:
+    """
+    응답 본문 파싱을 어디서 실행할지 정합니다.
+
+    threshold바이트 미만의 작은 응답(초단기 실황 등)은 이벤트 루프에서 바로 처리하고,
+    큰 응답(예보 페이지 등)은 mode에 따라 스레드 풀('thread') 또는 프로세스 풀('process')에서 처리해
+    다른 요청이 파싱이 끝나기를 기다리지 않게 합니다. mode가 'inline'이면 항상 바로 처리합니다.
+    풀은 처음 필요할 때 만들며, shutdown() 후 다시 쓰면 새로 만듭니다.
+    """
+
+    def __init__(self, mode: str = 'thread', threshold: int = 32768, workers: int | None = None):
+        if mode not in ('inline', 'thread', 'process'):
+            raise ValueError(f"알 수 없는 파싱 실행 방식입니다: {mode}")
+        self.mode = mode
+        self.threshold = threshold
+        self.workers = workers
+        self._executor: Executor | None = None
+        self.inline = 0
+        self.offloaded = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                # 이벤트 루프 스레드가 있는 프로세스를 fork하지 않도록 spawn으로 작업 프로세스를 띄웁니다.
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='payload-parse')
+        return self._executor
+
+    async def run(self, parse, content: bytes) -> dict:
+        """parse(content)를 실행합니다. parse는 프로세스 풀에서도 쓸 수 있도록 모듈 수준 함수여야 합니다."""
+        if self.mode == 'inline' or len(content) < self.threshold:
+            self.inline += 1
+            return parse(content)
+        self.offloaded += 1
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), parse, content)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "threshold": self.threshold, "inline": self.inline, "offloaded": self.offloaded}
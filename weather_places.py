@@ -0,0 +1,281 @@
+import csv
+import math
+import os
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+PLACES_FILE = Path(os.environ.get('KOREA_WEATHER_PLACES_FILE',
+                                  Path(__file__).parent / 'data' / 'places.tsv'))
+
+# 한글 음절 분해용 자모 표 (호환용 자모)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ",
+            "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ",
+            "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모열로 풀어 씁니다. (예: '서울' -> 'ㅅㅓㅇㅜㄹ')"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            code -= HANGUL_BASE
+            out.append(CHOSUNG[code // 588] + JUNGSUNG[(code % 588) // 28] + JONGSUNG[code % 28])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절의 초성만 추출합니다. (예: '서울' -> 'ㅅㅇ')"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(text: str) -> bool:
+    return bool(text) and all(ch in CHOSUNG for ch in text)
+
+
+@dataclass(slots=True, frozen=True)
+class Place:
+    name: str
+    lat: float
+    lon: float
+    nx: int
+    ny: int
+
+
+class _SortedKeys:
+    """정렬된 문자열 키 목록에서 접두어로 항목 번호를 찾습니다."""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = [idx for _, idx in pairs]
+
+    def prefix(self, prefix: str):
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            yield self.ids[i]
+            i += 1
+
+
+class PlaceIndex:
+    """
+    지역명 -> 좌표 색인입니다.
+
+    각 지역은 전체 이름('대전광역시 중구 태평1동')과 마지막 단위 이름('태평1동'),
+    공백을 뺀 이름으로 색인되며 정확히 일치, 접두어, 초성/자모 검색을 지원합니다.
+    """
+
+    def __init__(self, places: list[Place]):
+        self.places = places
+        self.exact: dict[str, list[int]] = {}
+        for idx, place in enumerate(places):
+            for key in self._keys(place.name):
+                ids = self.exact.setdefault(key, [])
+                if idx not in ids: ids.append(idx)
+        self._prefix = _SortedKeys((key, idx) for key, ids in self.exact.items() for idx in ids)
+        self._jamo = _SortedKeys((to_jamo(key), idx) for key, ids in self.exact.items() for idx in ids)
+        self._chosung = _SortedKeys((to_chosung(key), idx) for key, ids in self.exact.items() for idx in ids)
+
+    @staticmethod
+    def _keys(name: str):
+        parts = name.split()
+        return {name, "".join(parts), parts[-1]} if parts else {name}
+
+    def __len__(self):
+        return len(self.places)
+
+    @cached_property
+    def spatial(self) -> "PlaceGridIndex":
+        """좌표 기준 가까운 지역 검색용 공간 색인 (처음 쓸 때 만듭니다)"""
+        return PlaceGridIndex(self.places)
+
+    @classmethod
+    def load(cls, path=PLACES_FILE) -> "PlaceIndex":
+        """이름, 위도, 경도, nx, ny 열로 된 TSV 파일을 읽어 색인을 만듭니다."""
+        places = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'): continue
+                name, lat, lon, nx, ny = line.rstrip('\n').split('\t')
+                places.append(Place(name, float(lat), float(lon), int(nx), int(ny)))
+        return cls(places)
+
+    def get(self, name: str) -> list[Place]:
+        """정확히 일치하는 지역 목록 (동명 지역이 있으면 여러 개)"""
+        return [self.places[idx] for idx in self.exact.get(name.strip(), ())]
+
+    def lookup(self, query: str, limit: int = 10) -> list[Place]:
+        """정확히 일치 -> 접두어 -> 초성/자모 순으로 찾아 최대 limit개를 반환합니다."""
+        query = query.strip()
+        if not query:
+            return []
+        found = self.get(query)
+        if found:
+            return found[:limit]
+
+        compact = "".join(query.split())
+        if is_chosung_query(compact):
+            candidates = self._chosung.prefix(compact)
+        else:
+            candidates = self._prefix.prefix(compact)
+            first = next(candidates, None)
+            if first is None:
+                # 입력 중인 마지막 글자(예: '대저')도 자모 단위로 맞춰 봅니다.
+                candidates = self._jamo.prefix(to_jamo(compact))
+            else:
+                candidates = _chain_first(first, candidates)
+
+        results, seen = [], set()
+        for idx in candidates:
+            if idx in seen: continue
+            seen.add(idx)
+            results.append(self.places[idx])
+            if len(results) >= limit: break
+        return results
+
+
+class PlaceGridIndex:
+    """
+    지역 좌표를 격자 평면에서 bucket x bucket 격자 크기의 칸으로 나눠 둔 공간 색인입니다.
+    질의 지점이 속한 칸부터 바깥 고리 순서로 살펴보며, 남은 고리가 현재 k번째 거리보다
+    멀어지면 멈추므로 지역 수가 많아도 가까운 몇 칸만 확인합니다.
+    거리는 격자 평면(LCC 투영)에서의 직선 거리(km)입니다.
+    """
+
+    def __init__(self, places: list[Place], bucket: int = 4):
+        from weather_grid import KMA_GRID
+
+        self.places = places
+        self.bucket = bucket
+        self.grid = KMA_GRID
+        self.xy = [KMA_GRID.to_xy(p.lat, p.lon) for p in places]
+        self.buckets: dict[tuple[int, int], list[int]] = {}
+        for idx, (x, y) in enumerate(self.xy):
+            self.buckets.setdefault((int(x // bucket), int(y // bucket)), []).append(idx)
+        keys = list(self.buckets) or [(0, 0)]
+        # 이보다 큰 고리에는 지역이 없으므로 탐색 상한으로 씁니다.
+        self._extent = (min(k[0] for k in keys), max(k[0] for k in keys),
+                        min(k[1] for k in keys), max(k[1] for k in keys))
+
+    def nearest(self, lat: float, lon: float, k: int = 1, max_km: float | None = None) -> list[tuple[Place, float]]:
+        """가까운 지역 최대 k개를 (지역, 거리 km) 목록으로 반환합니다. max_km보다 먼 지역은 뺍니다."""
+        if not self.places or k <= 0:
+            return []
+        x, y = self.grid.to_xy(lat, lon)
+        bx, by = int(x // self.bucket), int(y // self.bucket)
+        min_x, max_x, min_y, max_y = self._extent
+        max_ring = max(abs(bx - min_x), abs(bx - max_x), abs(by - min_y), abs(by - max_y))
+        if max_km is not None:
+            # 고리 r의 지역은 적어도 (r - 1) * bucket 격자만큼 떨어져 있으므로 그보다 먼 고리는 보지 않습니다.
+            max_ring = min(max_ring, int(max_km / (self.bucket * self.grid.grid_km)) + 1)
+
+        found: list[tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(bx, by, ring):
+                for idx in self.buckets.get(cell, ()):
+                    px, py = self.xy[idx]
+                    found.append(((px - x) ** 2 + (py - y) ** 2, idx))
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                # 다음 고리의 지역은 적어도 ring * bucket 격자만큼 떨어져 있습니다.
+                if found[-1][0] <= (ring * self.bucket) ** 2:
+                    break
+        found.sort()
+        results = [(self.places[idx], round(math.sqrt(d2) * self.grid.grid_km, 2)) for d2, idx in found[:k]]
+        return results if max_km is None else [(p, d) for p, d in results if d <= max_km]
+
+    def nearest_many(self, points, k: int = 1, max_km: float | None = None) -> list[list[tuple[Place, float]]]:
+        """(위도, 경도) 목록 각각의 가까운 지역 목록"""
+        return [self.nearest(lat, lon, k, max_km) for lat, lon in points]
+
+    @staticmethod
+    def _ring(bx: int, by: int, ring: int):
+        if ring == 0:
+            yield bx, by
+            return
+        for dx in range(-ring, ring + 1):
+            yield bx + dx, by - ring
+            yield bx + dx, by + ring
+        for dy in range(-ring + 1, ring):
+            yield bx - ring, by + dy
+            yield bx + ring, by + dy
+
+
+def _chain_first(first, rest):
+    yield first
+    yield from rest
+
+
+# 시도 약칭 -> 기상청 자료의 1단계 이름 후보 (옛 이름 포함)
+# 생성한 파일에도 약칭 행을 함께 넣어 '서울'처럼 예전부터 쓰던 이름이 한 곳으로 정확히 찾아지게 합니다.
+SHORT_NAMES = {
+    '서울': ('서울특별시',), '부산': ('부산광역시',), '대구': ('대구광역시',), '인천': ('인천광역시',),
+    '광주': ('광주광역시',), '대전': ('대전광역시',), '울산': ('울산광역시',), '세종': ('세종특별자치시',),
+    '경기': ('경기도',), '강원': ('강원특별자치도', '강원도'), '충북': ('충청북도',), '충남': ('충청남도',),
+    '전북': ('전북특별자치도', '전라북도'), '전남': ('전라남도',), '경북': ('경상북도',), '경남': ('경상남도',),
+    '제주': ('제주특별자치도',),
+}
+
+
+def build_places_file(source_csv, out_path=PLACES_FILE):
+    """
+    기상청 '동네예보 격자 위경도' 자료(엑셀을 CSV로 저장한 파일)로 지역 색인 파일을 만듭니다.
+    1단계/2단계/3단계 이름을 공백으로 이어 전체 이름으로 쓰고,
+    nx, ny는 서버와 같은 투영(KMA_GRID)으로 미리 계산해 함께 저장합니다.
+    시도 약칭(SHORT_NAMES)은 해당 1단계 지역의 좌표로 따로 한 줄씩 덧붙입니다.
+    """
+    from weather_grid import KMA_GRID
+
+    rows = []
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            with open(source_csv, encoding=encoding, newline='') as f:
+                rows = list(csv.DictReader(f))
+            break
+        except UnicodeDecodeError:
+            continue
+
+    seen: dict[str, str] = {}
+    lines = ["# 이름\t위도\t경도\tnx\tny"]
+    for row in rows:
+        name = " ".join(row[col].strip() for col in ('1단계', '2단계', '3단계') if row.get(col, '').strip())
+        if not name or name in seen: continue
+        lat, lon = float(row['위도(초/100)']), float(row['경도(초/100)'])
+        nx, ny = KMA_GRID.to_grid(lat, lon)
+        seen[name] = f"{lat}\t{lon}\t{nx}\t{ny}"
+        lines.append(f"{name}\t{seen[name]}")
+
+    for short, full_names in SHORT_NAMES.items():
+        full = next((n for n in full_names if n in seen), None)
+        if full is not None and short not in seen:
+            lines.append(f"{short}\t{seen[full]}")
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return len(lines) - 1
+
+
+# 서버 시작 시 한 번만 읽어 둡니다.
+PLACES = PlaceIndex.load()
+
+
+if __name__ == "__main__":
+    # 사용법: python weather_places.py <격자_위경도.csv> [출력 파일]
+    count = build_places_file(*sys.argv[1:3])
+    print(f"{count}개 지역을 저장했습니다.")
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import random
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """
+    자주 요청되는 격자를 매시 새 실황이 발표된 직후 미리 조회해 두는 백그라운드 작업입니다.
+
+    - record()로 격자별 요청 빈도를 집계하고, 주기마다 절반으로 줄여 최근 인기도를 반영합니다.
+    - 주기마다 상위 top_k개(단, budget_per_cycle 이하)만 refresh()로 다시 조회합니다.
+    - 요청이 한꺼번에 몰리지 않도록 각 격자마다 0~max_jitter초 지연을 두고, 동시 요청 수를 제한합니다.
+    - 최신 자료 대신 이전 자료(stale)를 받은 격자는 갱신된 것으로 세지 않습니다.
+    """
+
+    def __init__(self, refresh: Callable[[int, int], Awaitable[object]],
+                 seconds_until_next_run: Callable[[], float],
+                 top_k: int = 50, concurrency: int = 4, max_jitter: float = 30.0,
+                 budget_per_cycle: int = 200):
+        self.refresh = refresh
+        self.seconds_until_next_run = seconds_until_next_run
+        self.top_k = top_k
+        self.concurrency = concurrency
+        self.max_jitter = max_jitter
+        self.budget_per_cycle = budget_per_cycle
+        self.counts: Counter[tuple[int, int]] = Counter()
+        self._task: asyncio.Task | None = None
+        self.cycles = 0
+        self.refreshed = 0
+        self.stale = 0
+        self.failed = 0
+
+    def record(self, nx: int, ny: int):
+        self.counts[(nx, ny)] += 1
+
+    def hot_cells(self) -> list[tuple[int, int]]:
+        limit = min(self.top_k, self.budget_per_cycle)
+        return [cell for cell, _ in self.counts.most_common(limit)]
+
+    async def run_once(self):
+        """인기 격자를 한 번 갱신하고 집계값을 감쇠시킵니다."""
+        cells = self.hot_cells()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_cell(nx, ny):
+            await asyncio.sleep(random.uniform(0, self.max_jitter))
+            async with semaphore:
+                try:
+                    result = await self.refresh(nx, ny)
+                except Exception:
+                    logger.exception("격자 (%s, %s) 미리 조회 실패", nx, ny)
+                    result = {"error": "exception"}
+            if isinstance(result, dict) and "error" in result:
+                self.failed += 1
+            elif getattr(result, 'stale', False):
+                self.stale += 1
+            else:
+                self.refreshed += 1
+
+        await asyncio.gather(*(refresh_cell(nx, ny) for nx, ny in cells))
+        self.counts = Counter({cell: count / 2 for cell, count in self.counts.items() if count >= 1})
+        self.cycles += 1
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(max(0.0, self.seconds_until_next_run()))
+            await self.run_once()
+
+    def start(self):
+        if self._task is None and self.top_k > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "tracked_cells": len(self.counts),
+            "top_k": self.top_k,
+            "budget_per_cycle": self.budget_per_cycle,
+            "cycles": self.cycles,
+            "refreshed": self.refreshed,
+            "stale": self.stale,
+            "failed": self.failed,
+        }
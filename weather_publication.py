@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+# 해당 발표시각 자료가 아직 없을 때 기상청이 돌려주는 결과 코드 (NODATA_ERROR)
+NO_DATA_CODE = '03'
+
+
+class PublicationTracker:
+    """
+    초단기 실황이 매시 정각 후 실제로 몇 초 뒤에 제공되는지 관측해 최신 발표시각을 고릅니다.
+
+    - 정각 H 자료를 요청해 NO_DATA를 받으면 그 시점에는 아직 없었다는 하한을,
+      정상 자료를 받으면 그 시점에는 있었다는 상한을 얻습니다.
+      하한과 상한이 모두 있는 시각만 (하한 + 상한) / 2를 표본으로 삼아 지수 이동 평균으로 지연(latency)을 추정하고,
+      상한만 있으면 추정을 상한 이하로 낮추기만 합니다.
+    - 예상 시각이 지났는데 NO_DATA가 오면 추정을 그 시점 뒤로 바로 미룹니다.
+    - 어느 격자에서든 H 자료를 한 번 받으면 H는 발표된 것으로 확정합니다.
+    """
+
+    def __init__(self, initial_latency: float = 2400.0, min_latency: float = 300.0,
+                 max_latency: float = 3540.0, alpha: float = 0.3, late_margin: float = 60.0,
+                 probe_window: float = 600.0, probe_interval: float = 30.0):
+        self.latency = initial_latency
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.alpha = alpha
+        self.late_margin = late_margin
+        self.probe_window = probe_window
+        self.probe_interval = probe_interval
+        self._lower: dict[datetime, float] = {}
+        self._confirmed: dict[datetime, float] = {}
+        self._last_probe: datetime | None = None
+        self.samples = 0
+        self.no_data = 0
+
+    @staticmethod
+    def newest_hour(now: datetime) -> datetime:
+        return now.replace(minute=0, second=0, microsecond=0)
+
+    def is_published(self, hour: datetime) -> bool:
+        return hour in self._confirmed
+
+    def base_hour(self, now: datetime | None = None) -> datetime:
+        """지금 요청할 발표시각: 확정되었거나 예상 지연이 지났으면 이번 정각, 아니면 이전 정각"""
+        now = now or datetime.now()
+        hour = self.newest_hour(now)
+        if hour in self._confirmed or (now - hour).total_seconds() >= self.latency:
+            return hour
+        return hour - timedelta(hours=1)
+
+    def should_probe(self, now: datetime | None = None) -> bool:
+        """
+        예상 시각 직전(probe_window 이내)이고 아직 확정되지 않았으면, probe_interval마다 한 번
+        이번 정각 자료를 미리 시험 요청하도록 알려줍니다. 일찍 발표되는 경우를 배우기 위한 것입니다.
+        """
+        now = now or datetime.now()
+        hour = self.newest_hour(now)
+        offset = (now - hour).total_seconds()
+        if hour in self._confirmed or offset < self.latency - self.probe_window:
+            return False
+        if self._last_probe is not None and (now - self._last_probe).total_seconds() < self.probe_interval:
+            return False
+        self._last_probe = now
+        return True
+
+    def record(self, base_date: str, base_time: str, published: bool, now: datetime | None = None):
+        now = now or datetime.now()
+        hour = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+        offset = (now - hour).total_seconds()
+        # 지난 시각 이력 조회처럼 발표 직후와 관계없는 응답은 추정에 쓰지 않습니다.
+        if not 0 <= offset < 3600 or hour in self._confirmed:
+            return
+        if published:
+            self._confirmed[hour] = offset
+            lower = self._lower.get(hour)
+            if lower is not None:
+                self.latency += self.alpha * ((lower + offset) / 2 - self.latency)
+                self.samples += 1
+            # 하한 없이 받은 자료는 발표가 언제였는지 알려주지 않으므로(한참 전일 수도 있음)
+            # 표본으로 쓰지 않고, 지연이 이 시점보다 길 수 없다는 제약으로만 씁니다.
+            self.latency = min(self.latency, offset)
+        else:
+            self.no_data += 1
+            self._lower[hour] = max(self._lower.get(hour, 0.0), offset)
+            # 방금 받은 NO_DATA도 시험 요청과 같으므로, probe_interval 동안은 다시 시험하지 않습니다.
+            if hour == self.newest_hour(now):
+                self._last_probe = now
+            if offset >= self.latency:
+                self.latency = offset + self.late_margin
+        self.latency = min(self.max_latency, max(self.min_latency, self.latency))
+
+        cutoff = self.newest_hour(now) - timedelta(hours=3)
+        for table in (self._lower, self._confirmed):
+            for old in [h for h in table if h < cutoff]:
+                del table[old]
+
+    def stats(self) -> dict:
+        return {"latency_seconds": round(self.latency, 1), "samples": self.samples, "no_data": self.no_data,
+                "confirmed_hours": sorted(h.strftime("%Y%m%d%H00") for h in self._confirmed)}
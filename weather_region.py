@@ -0,0 +1,101 @@
+from __future__ import annotations
+import io
+from weather_grid import KMA_GRID
+from weather_lazy import LazyModule
+from weather_observation import CATEGORY_FIELDS
+
+np = LazyModule('numpy')
+
+# 기상청 격자 범위
+GRID_NX, GRID_NY = 149, 253
+
+# 지역 이름별 대략적인 경계 상자 (위도 최소, 위도 최대, 경도 최소, 경도 최대)
+REGIONS = {
+    '서울': (37.41, 37.72, 126.76, 127.19),
+    '수도권': (36.89, 38.30, 126.35, 127.85),
+    '인천': (37.35, 37.65, 126.35, 126.80),
+    '부산': (34.98, 35.40, 128.75, 129.31),
+    '대구': (35.60, 36.02, 128.35, 128.78),
+    '광주': (35.05, 35.26, 126.64, 127.02),
+    '대전': (36.18, 36.50, 127.25, 127.56),
+    '울산': (35.32, 35.73, 128.96, 129.47),
+    '세종': (36.40, 36.74, 127.14, 127.40),
+    '제주': (33.10, 33.57, 126.14, 126.98),
+}
+
+
+def cells_in_bbox(lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    경계 상자 안에 중심이 있는 격자들의 (nx, ny) 배열을 반환합니다.
+    상자가 격자 하나보다 작으면 상자 중심이 속한 격자 하나를 반환합니다.
+    """
+    # 위도선은 격자 평면에서 곡선이므로 상자 테두리를 촘촘히 변환해 후보 범위를 잡습니다.
+    t = np.linspace(0.0, 1.0, 64)
+    edge_lat = np.concatenate([np.full_like(t, lat_min), np.full_like(t, lat_max),
+                               lat_min + (lat_max - lat_min) * t, lat_min + (lat_max - lat_min) * t])
+    edge_lon = np.concatenate([lon_min + (lon_max - lon_min) * t, lon_min + (lon_max - lon_min) * t,
+                               np.full_like(t, lon_min), np.full_like(t, lon_max)])
+    edge_nx, edge_ny = KMA_GRID.forward(edge_lat, edge_lon)
+    nx_range = np.arange(max(1, edge_nx.min()), min(GRID_NX, edge_nx.max()) + 1)
+    ny_range = np.arange(max(1, edge_ny.min()), min(GRID_NY, edge_ny.max()) + 1)
+
+    nx, ny = (a.ravel() for a in np.meshgrid(nx_range, ny_range))
+    lat, lon = KMA_GRID.inverse(nx, ny)
+    inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+    if not inside.any():
+        cx, cy = KMA_GRID.to_grid((lat_min + lat_max) / 2, (lon_min + lon_max) / 2)
+        if 1 <= cx <= GRID_NX and 1 <= cy <= GRID_NY:
+            return np.array([cx]), np.array([cy])
+    return nx[inside], ny[inside]
+
+
+class RegionSnapshot:
+    """
+    여러 격자의 실황을 category별 2차원 배열(ny, nx 순서, float32)로 모은 스냅숏입니다.
+    배열은 포함된 격자를 감싸는 직사각형 크기이며, 포함되지 않았거나 조회에 실패한 칸은 NaN입니다.
+    메모리는 (직사각형 격자 수) x (category 수) x 4바이트로 격자 수에 비례합니다.
+    """
+
+    __slots__ = ('nx0', 'ny0', 'fields', 'cells', 'failed', 'stale', 'base_times')
+
+    def __init__(self, nx: np.ndarray, ny: np.ndarray, observations: list):
+        self.nx0, self.ny0 = int(nx.min()), int(ny.min())
+        shape = (int(ny.max()) - self.ny0 + 1, int(nx.max()) - self.nx0 + 1)
+        self.fields = {name: np.full(shape, np.nan, dtype=np.float32) for name in CATEGORY_FIELDS.values()}
+        self.cells = len(observations)
+        self.failed = self.stale = 0
+        self.base_times = set()
+        for x, y, observation in zip(nx.tolist(), ny.tolist(), observations):
+            if isinstance(observation, dict):
+                self.failed += 1
+                continue
+            self.stale += observation.stale
+            self.base_times.add(observation.base_date + observation.base_time)
+            row, col = y - self.ny0, x - self.nx0
+            for name, array in self.fields.items():
+                value = getattr(observation, name)
+                if value is not None:
+                    array[row, col] = value
+
+    def summary(self) -> dict:
+        """기온 최저/최고/평균, 강수 격자 비율 등 요약 값"""
+        t1h, pty = self.fields['t1h'], self.fields['pty']
+        has_t1h = ~np.isnan(t1h)
+        has_pty = ~np.isnan(pty)
+        summary = {'cells': self.cells, 'ok': self.cells - self.failed, 'failed': self.failed,
+                   'stale': self.stale, 'base_times': sorted(self.base_times)}
+        if has_t1h.any():
+            summary.update(min_temp=float(t1h[has_t1h].min()), max_temp=float(t1h[has_t1h].max()),
+                           mean_temp=float(t1h[has_t1h].mean()))
+        if has_pty.any():
+            summary['precip_coverage'] = float((pty[has_pty] > 0).mean())
+        wsd = self.fields['wsd']
+        if not np.isnan(wsd).all():
+            summary['max_wind'] = float(np.nanmax(wsd))
+        return summary
+
+    def to_npz(self) -> bytes:
+        """category별 배열과 격자 원점(nx0, ny0)을 압축 .npz 바이트로 내보냅니다. (numpy.load로 읽을 수 있음)"""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, origin=np.array([self.nx0, self.ny0], dtype=np.int16), **self.fields)
+        return buffer.getvalue()
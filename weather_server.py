@@ -1,82 +1,346 @@
 import os
-import math
+import asyncio
+import base64
 import json
+import math
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
 from datetime import datetime, timedelta
-import xmltodict
 import httpx
 from mcp.server.fastmcp import FastMCP, Context
+from pydantic import AnyUrl
+from weather_cache import ObservationCache, SQLiteObservationStore
+from weather_grid import KMA_GRID
+from weather_gridtable import load_grid_table
+from weather_payload import MALFORMED_ERROR, PayloadParser, parse_forecast_payload, parse_observation_payload
+from weather_forecast import (PTY_MAP, SKY_MAP, ULTRA_URL, VILLAGE_URL, ForecastTable, forecast_expiry,
+                              ultra_base_datetime, village_base_datetime)
+from weather_observation import Observation
+from weather_history import FIELDS as HISTORY_FIELDS, ObservationHistory, hour_index
+from weather_interpolation import interpolate_observations
+from weather_lazy import LazyModule
+from weather_places import PLACES
+from weather_publication import NO_DATA_CODE, PublicationTracker
+from weather_region import GRID_NX, GRID_NY, REGIONS, RegionSnapshot, cells_in_bbox
+from weather_prefetch import PrefetchScheduler
+from weather_subscriptions import ObservationSubscriptions
+from weather_upstream import CircuitBreaker, UpstreamGuard, UpstreamLimiter
+from weather_metrics import METRICS, instrument_tool
 
-mcp = FastMCP("mkweather")
+np = LazyModule('numpy')
 
 API_KEY = os.environ.get('KOREA_WEATHER_API_KEY')
-URL = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
+API_KEY_ERROR = "서버에 API 키가 설정되지 않았습니다. 관리자에게 문의하세요."
+URL = os.environ.get('KOREA_WEATHER_API_URL',
+                     'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst')
+# 업스트림 응답 형식 ('JSON' 또는 'XML')
+DATA_TYPE = os.environ.get('KOREA_WEATHER_DATA_TYPE', 'JSON').upper()
+
+# 업스트림 HTTP 커넥션 풀 설정 (환경 변수로 조정 가능)
+HTTP_MAX_CONNECTIONS = int(os.environ.get('KOREA_WEATHER_HTTP_MAX_CONNECTIONS', '20'))
+HTTP_MAX_KEEPALIVE = int(os.environ.get('KOREA_WEATHER_HTTP_MAX_KEEPALIVE', '10'))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('KOREA_WEATHER_HTTP_KEEPALIVE_EXPIRY', '30'))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('KOREA_WEATHER_HTTP_CONNECT_TIMEOUT', '3'))
+HTTP_READ_TIMEOUT = float(os.environ.get('KOREA_WEATHER_HTTP_READ_TIMEOUT', '10'))
+HTTP_WRITE_TIMEOUT = float(os.environ.get('KOREA_WEATHER_HTTP_WRITE_TIMEOUT', '5'))
+HTTP_POOL_TIMEOUT = float(os.environ.get('KOREA_WEATHER_HTTP_POOL_TIMEOUT', '5'))
+
+# 실황 캐시 최대 항목 수 (격자 좌표 x 발표시각 단위)
+CACHE_MAX_ENTRIES = int(os.environ.get('KOREA_WEATHER_CACHE_MAX_ENTRIES', '2048'))
+# 영속 캐시(SQLite) 파일 경로. 지정하면 재시작/다중 프로세스 간에 실황을 공유합니다.
+CACHE_DB_PATH = os.environ.get('KOREA_WEATHER_CACHE_DB')
+# 예보 조회: 페이지당 행 수, 예보 캐시 최대 항목 수 (격자 x 발표시각 단위, 예보 종류별)
+FORECAST_PAGE_SIZE = int(os.environ.get('KOREA_WEATHER_FORECAST_PAGE_SIZE', '250'))
+FORECAST_CACHE_MAX_ENTRIES = int(os.environ.get('KOREA_WEATHER_FORECAST_CACHE_MAX_ENTRIES', '256'))
+# 배치 조회 시 최대 위치 수와 업스트림 동시 요청 수
+BATCH_MAX_POINTS = int(os.environ.get('KOREA_WEATHER_BATCH_MAX_POINTS', '200'))
+BATCH_CONCURRENCY = int(os.environ.get('KOREA_WEATHER_BATCH_CONCURRENCY', '8'))
+# 응답 파싱 실행 방식(inline, thread, process), 이벤트 루프 밖에서 파싱할 최소 응답 크기(바이트), 풀 크기
+PARSE_EXECUTOR = os.environ.get('KOREA_WEATHER_PARSE_EXECUTOR', 'thread')
+PARSE_OFFLOAD_BYTES = int(os.environ.get('KOREA_WEATHER_PARSE_OFFLOAD_BYTES', '32768'))
+PARSE_WORKERS = int(os.environ.get('KOREA_WEATHER_PARSE_WORKERS', '0')) or None
+# 지역 스냅숏 조회 시 최대 격자 수와 업스트림 동시 요청 수
+REGION_MAX_CELLS = int(os.environ.get('KOREA_WEATHER_REGION_MAX_CELLS', '1000'))
+REGION_CONCURRENCY = int(os.environ.get('KOREA_WEATHER_REGION_CONCURRENCY', '16'))
+# 보간 모드에서 필요한 최소 이웃 격자 수 (8개 중)
+INTERPOLATE_MIN_NEIGHBORS = int(os.environ.get('KOREA_WEATHER_INTERPOLATE_MIN_NEIGHBORS', '4'))
+# 날씨 응답에 '가까운 지역'으로 표시할 최대 거리(km). 이보다 먼 지역은 표시하지 않습니다.
+NEAREST_PLACE_MAX_KM = float(os.environ.get('KOREA_WEATHER_NEAREST_PLACE_MAX_KM', '20'))
+# 업스트림 보호: 초당 요청 수와 순간 최대치, 동시 요청 수, 재시도 횟수와 백오프(초),
+# 서킷 브레이커 연속 실패 기준과 차단 시간(초), 장애 시 대체 응답으로 쓸 캐시의 최대 경과 시간(초)
+# (요청 수/순간 최대치/동시 요청 수와 아래 미리 조회 예보 예산은 서버 전체 기준이며, 작업 프로세스 수로 나눠 씁니다)
+UPSTREAM_RATE = float(os.environ.get('KOREA_WEATHER_UPSTREAM_RATE', '10'))
+UPSTREAM_BURST = int(os.environ.get('KOREA_WEATHER_UPSTREAM_BURST', '20'))
+UPSTREAM_MAX_INFLIGHT = int(os.environ.get('KOREA_WEATHER_UPSTREAM_MAX_INFLIGHT', '10'))
+UPSTREAM_RETRIES = int(os.environ.get('KOREA_WEATHER_UPSTREAM_RETRIES', '2'))
+UPSTREAM_BACKOFF_BASE = float(os.environ.get('KOREA_WEATHER_UPSTREAM_BACKOFF_BASE', '0.2'))
+UPSTREAM_BACKOFF_MAX = float(os.environ.get('KOREA_WEATHER_UPSTREAM_BACKOFF_MAX', '2'))
+BREAKER_THRESHOLD = int(os.environ.get('KOREA_WEATHER_BREAKER_THRESHOLD', '5'))
+BREAKER_COOLDOWN = float(os.environ.get('KOREA_WEATHER_BREAKER_COOLDOWN', '30'))
+STALE_MAX_AGE = float(os.environ.get('KOREA_WEATHER_STALE_MAX_AGE', '10800'))
+# 격자별 실황 이력: 보관 시간 수, 전체 메모리 상한(바이트)
+HISTORY_HOURS = int(os.environ.get('KOREA_WEATHER_HISTORY_HOURS', '24'))
+HISTORY_MAX_BYTES = int(os.environ.get('KOREA_WEATHER_HISTORY_MAX_BYTES', str(16 * 1024 * 1024)))
+# 인기 격자 미리 조회: 주기(1시간)마다 갱신할 격자 수, 동시 요청 수, 분산 지연(초),
+# 주기당 최대 업스트림 요청 수(할당량 예산), 발표 시각 이후 대기 시간(초)
+PREFETCH_TOP_K = int(os.environ.get('KOREA_WEATHER_PREFETCH_TOP_K', '50'))
+PREFETCH_CONCURRENCY = int(os.environ.get('KOREA_WEATHER_PREFETCH_CONCURRENCY', '4'))
+PREFETCH_JITTER = float(os.environ.get('KOREA_WEATHER_PREFETCH_JITTER', '30'))
+PREFETCH_BUDGET = int(os.environ.get('KOREA_WEATHER_PREFETCH_BUDGET', '200'))
+PREFETCH_DELAY = float(os.environ.get('KOREA_WEATHER_PREFETCH_DELAY', '60'))
+# 구독된 격자 실황을 다시 확인하는 간격(초, 0이면 변경 알림을 보내지 않음)
+SUBSCRIPTION_INTERVAL = float(os.environ.get('KOREA_WEATHER_SUBSCRIPTION_INTERVAL', '60'))
+# 초단기 실황은 매시 정각 관측값이 매시 40분 이후에 제공됩니다.
+PUBLISH_MINUTE = 40
+
+
+# 프로세스 안의 모든 세션이 함께 쓰는 응답 파서 (풀은 처음 큰 응답을 파싱할 때 만듭니다)
+PAYLOAD_PARSER = PayloadParser(PARSE_EXECUTOR, PARSE_OFFLOAD_BYTES, PARSE_WORKERS)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """업스트림(apis.data.go.kr) 호출에 공용으로 사용할 커넥션 풀 클라이언트를 생성합니다."""
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                          max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                          keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+    timeout = httpx.Timeout(connect=HTTP_CONNECT_TIMEOUT, read=HTTP_READ_TIMEOUT,
+                            write=HTTP_WRITE_TIMEOUT, pool=HTTP_POOL_TIMEOUT)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+def per_worker(total: int, workers: int) -> int:
+    """서버 전체 기준 한도를 작업 프로세스 하나의 몫으로 나눕니다. (최소 1)"""
+    return max(1, total // workers)
+
+
+def create_upstream_guard(workers: int = 1) -> UpstreamGuard:
+    """
+    업스트림 호출에 적용할 속도 제한/재시도/서킷 브레이커를 생성합니다.
+    제한은 프로세스마다 따로 적용되므로, 작업 프로세스가 workers개이면 각자 전체 한도의 1/workers만 씁니다.
+    """
+    limiter = UpstreamLimiter(UPSTREAM_RATE / workers, per_worker(UPSTREAM_BURST, workers),
+                              per_worker(UPSTREAM_MAX_INFLIGHT, workers))
+    return UpstreamGuard(limiter,
+                         CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN),
+                         max_retries=UPSTREAM_RETRIES, backoff_base=UPSTREAM_BACKOFF_BASE,
+                         backoff_max=UPSTREAM_BACKOFF_MAX)
+
+
+@dataclass
+class AppContext:
+    """서버 수명 동안 유지되는 공유 자원"""
+    cache: ObservationCache
+    guard: UpstreamGuard | None = None
+    prefetcher: PrefetchScheduler | None = None
+    subscriptions: ObservationSubscriptions | None = None
+    # 예보 종류('ultra', 'village')별 ForecastTable 캐시
+    forecast_caches: dict[str, ObservationCache] = field(default_factory=dict)
+    history: ObservationHistory | None = None
+    publication: PublicationTracker = field(default_factory=lambda: PublicationTracker(PUBLISH_MINUTE * 60))
+    # 응답을 기다리지 않는 백그라운드 갱신 작업 (참조를 유지해 도중에 회수되지 않게 합니다)
+    background: set = field(default_factory=set)
+    # 정각별로 진행 중인 최신 자료 시험 요청 (정각마다 한 격자만 확인합니다)
+    probes: dict[datetime, asyncio.Future] = field(default_factory=dict)
+    _client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 클라이언트(TLS 설정 포함)는 첫 업스트림 요청 때 만들어 세션 시작을 늦추지 않습니다.
+        if self._client is None:
+            self._client = create_http_client()
+        return self._client
+
+
+@asynccontextmanager
+async def open_app_context(workers: int = 1) -> AsyncIterator[AppContext]:
+    # 클라이언트는 처음 쓸 때 한 번만 만들고, 종료 시 커넥션을 정리합니다.
+    # workers는 같은 업스트림 한도를 나눠 쓰는 작업 프로세스 수입니다.
+    store = (SQLiteObservationStore(CACHE_DB_PATH, encode=Observation.to_json, decode=Observation.from_json)
+             if CACHE_DB_PATH else None)
+    if store is not None:
+        await asyncio.to_thread(store.purge_expired)
+    app = AppContext(cache=ObservationCache(CACHE_MAX_ENTRIES, store),
+                     guard=create_upstream_guard(workers),
+                     forecast_caches={kind: ObservationCache(FORECAST_CACHE_MAX_ENTRIES)
+                                      for kind in ('ultra', 'village')},
+                     history=ObservationHistory(HISTORY_HOURS, HISTORY_MAX_BYTES))
+    app.prefetcher = PrefetchScheduler(
+        lambda nx, ny: prefetch_observation(app, nx, ny),
+        lambda: seconds_until_next_prefetch(app.publication.latency),
+        top_k=PREFETCH_TOP_K, concurrency=PREFETCH_CONCURRENCY,
+        max_jitter=PREFETCH_JITTER, budget_per_cycle=per_worker(PREFETCH_BUDGET, workers))
+    app.prefetcher.start()
+    app.subscriptions = ObservationSubscriptions(
+        lambda nx, ny: refresh_observation(app, nx, ny),
+        lambda nx, ny: AnyUrl(OBSERVATION_URI.format(nx=nx, ny=ny)),
+        interval=SUBSCRIPTION_INTERVAL, concurrency=PREFETCH_CONCURRENCY)
+    app.subscriptions.start()
+    try:
+        yield app
+    finally:
+        await app.prefetcher.stop()
+        await app.subscriptions.stop()
+        for task in list(app.background):
+            task.cancel()
+        PAYLOAD_PARSER.shutdown()
+        if app._client is not None:
+            await app._client.aclose()
+        if store is not None:
+            store.close()
+
+
+# HTTP 전송 방식에서는 MCP 세션마다 lifespan이 실행되므로,
+# 프로세스 단위로 한 번 만든 자원을 모든 세션이 함께 사용하도록 여기에 보관합니다.
+_process_app: AppContext | None = None
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+    if _process_app is not None:
+        yield _process_app
+        return
+    async with open_app_context() as app:
+        yield app
+
+
+mcp = FastMCP("mkweather", lifespan=app_lifespan)
+
+# 격자별 실황 리소스 (구독 가능)
+OBSERVATION_URI = "mkweather://obs/{nx}/{ny}"
+OBSERVATION_URI_PATTERN = re.compile(r"mkweather://obs/(\d+)/(\d+)")
+
+# location_coords 리소스 본문은 지역 색인으로부터 한 번만 만들어 둡니다.
+LOCATION_COORDS_JSON = json.dumps(
+    {p.name: {"lat": p.lat, "lon": p.lon, "nx": p.nx, "ny": p.ny} for p in PLACES.places},
+    ensure_ascii=False)
+
+def api_key_missing() -> bool:
+    """API 키가 설정되지 않았거나 예시 값('<your_api_key>') 그대로이면 True"""
+    return not API_KEY or API_KEY == '<your_api_key>'
 
 def get_datetime():
-    current_date = datetime.now().date().strftime("%Y%m%d")
     current_time = datetime.now()
-    if current_time.minute < 40: # API 제공 시간에 맞춰 40분으로 조정
+    if current_time.minute < PUBLISH_MINUTE: # API 제공 시간에 맞춰 40분으로 조정
         current_time = current_time - timedelta(hours=1)
-    current_time = current_time.strftime("%H%M")
-    return current_date, current_time
+    # 발표시각은 정시(HH00) 단위이며, 자정 직후에는 날짜도 함께 전날로 넘어갑니다.
+    return current_time.strftime("%Y%m%d"), current_time.strftime("%H00")
+
+def observation_expiry(base_date: str, base_time: str) -> float:
+    """
+    해당 발표시각 데이터의 캐시 만료 시각(epoch 초)을 반환합니다.
+    다음 발표가 늦어지는 동안에도 쓸 수 있도록 그 다음 정시(발표시각 + 2시간)까지 보관하며,
+    어떤 발표시각을 요청할지는 PublicationTracker가 정합니다.
+    """
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    return (base + timedelta(hours=2)).timestamp()
+
+def seconds_until_next_prefetch(latency: float = PUBLISH_MINUTE * 60) -> float:
+    """다음 발표 예상 시각(정시 + latency초)에서 PREFETCH_DELAY초가 지난 시점까지 남은 시간"""
+    now = datetime.now()
+    target = now.replace(minute=0, second=0, microsecond=0) + timedelta(seconds=latency + PREFETCH_DELAY)
+    if target <= now:
+        target += timedelta(hours=1)
+    return (target - now).total_seconds()
+
+# 미리 만든 위경도 -> 격자 조회 표(python weather_gridtable.py)가 있으면 사용합니다. 결과는 직접 계산과 같습니다.
+GRID_TABLE = load_grid_table()
 
 def convert_to_grid(lat, lon):
-    RE = 6371.00877; GRID = 5.0; SLAT1 = 30.0; SLAT2 = 60.0
-    OLON = 126.0; OLAT = 38.0; XO = 43; YO = 136
-    DEGRAD = math.pi / 180.0
-    slat1 = SLAT1 * DEGRAD; slat2 = SLAT2 * DEGRAD
-    olon = OLON * DEGRAD; olat = OLAT * DEGRAD
-    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
-    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sf = (sf ** sn) * math.cos(slat1) / sn
-    ro = math.tan(math.pi * 0.25 + olat * 0.5)
-    ro = RE / GRID * sf / (ro ** sn)
-    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
-    ra = RE / GRID * sf / (ra ** sn)
-    theta = lon * DEGRAD - olon
-    if theta > math.pi: theta -= 2 * math.pi
-    if theta < -math.pi: theta += 2 * math.pi
-    theta *= sn
-    x = ra * math.sin(theta) + XO
-    y = ro - ra * math.cos(theta) + YO
-    return {'x': int(x + 0.5), 'y': int(y + 0.5)}
+    # 투영 상수는 KMA_GRID 생성 시 한 번만 계산됩니다.
+    nx, ny = (GRID_TABLE or KMA_GRID).to_grid(lat, lon)
+    return {'x': nx, 'y': ny}
 
 # --- 개선 사항 2: nx, ny를 직접 인자로 받도록 변경 ---
-async def st_forecast(api_key, url, nx, ny):
+async def st_forecast(client: httpx.AsyncClient, api_key, url, nx, ny, date=None, time=None,
+                      guard: UpstreamGuard | None = None):
     """
     지정된 격자 좌표(nx, ny)의 초단기 실황을 비동기 방식으로 요청하고
     응답을 딕셔너리로 반환합니다.
+    client는 서버 수명 동안 공유되는 커넥션 풀 클라이언트입니다.
+    date, time을 생략하면 현재 기준 최신 발표시각을 사용합니다.
+    guard를 지정하면 속도 제한, 재시도, 서킷 브레이커를 거쳐 요청합니다.
     """
-    date, time = get_datetime()
+    if date is None or time is None:
+        date, time = get_datetime()
     parameters = {
         'serviceKey': api_key,
         'numOfRows': 30,
         'pageNo': 1,
-        'dataType': 'XML',
+        'dataType': DATA_TYPE,
         'base_date': date,
         'base_time': time,
         'nx': nx,
         'ny': ny
     }
+    # 전체 트리를 만들지 않고 필요한 값(발표일자/시각, category, obsrValue)만 추출합니다.
+    return await request_kma(client, url, parameters, parse_observation_payload, guard)
+
+
+async def kma_forecast(client: httpx.AsyncClient, api_key, url, nx, ny, date, time,
+                       guard: UpstreamGuard | None = None):
+    """
+    예보(초단기예보/단기예보)를 요청해 ForecastTable로 반환합니다.
+    첫 페이지에서 전체 건수를 확인한 뒤 나머지 페이지는 동시에 요청합니다.
+    """
+    def parameters(page):
+        return {'serviceKey': api_key, 'numOfRows': FORECAST_PAGE_SIZE, 'pageNo': page,
+                'dataType': DATA_TYPE, 'base_date': date, 'base_time': time, 'nx': nx, 'ny': ny}
+
+    first = await request_kma(client, url, parameters(1), parse_forecast_payload, guard)
+    if "error" in first:
+        return first
+    pages = -(-first['totalCount'] // FORECAST_PAGE_SIZE)
+    rest = await asyncio.gather(*(request_kma(client, url, parameters(page), parse_forecast_payload, guard)
+                                  for page in range(2, pages + 1)))
+    rows = first['rows']
+    for page in rest:
+        if "error" in page:
+            return page
+        rows.extend(page['rows'])
+    return ForecastTable.from_rows(date, time, rows)
+
 
-    # httpx의 비동기 클라이언트를 사용합니다.
-    async with httpx.AsyncClient() as client:
+async def request_kma(client: httpx.AsyncClient, url, parameters, parse, guard: UpstreamGuard | None = None):
+    """기상청 API를 한 번 요청하고 응답 본문을 parse로 처리한 딕셔너리를 반환합니다."""
+    async def attempt():
+        # 공유 클라이언트를 사용하므로 keep-alive 커넥션이 재사용됩니다.
         try:
             # client.get은 await 키워드가 필요한 코루틴(coroutine)입니다.
-            response = await client.get(url, params=parameters, timeout=10)
-            
+            # 타임아웃은 클라이언트 생성 시 단계별(connect/read/write/pool)로 지정되어 있습니다.
+            with METRICS.inflight('upstream_inflight'), METRICS.timer('upstream_latency'):
+                response = await client.get(url, params=parameters)
+
             # 응답 상태 코드가 200(OK)이 아닐 경우 예외를 발생시킵니다.
             response.raise_for_status()
-            
-            # xmltodict는 동기 함수이므로 await 없이 그대로 사용합니다.
-            return xmltodict.parse(response.text)
-        
+
+            # 큰 응답은 파싱 풀에서 처리해 이벤트 루프를 막지 않습니다.
+            with METRICS.timer('stage', 'payload_parse'):
+                result = await PAYLOAD_PARSER.run(parse, response.content)
+            if "error" in result:
+                METRICS.inc('upstream_errors', 'result_code' if "result_code" in result else 'malformed_payload')
+            return result
+
         except httpx.HTTPStatusError as e:
-            # HTTP 상태 코드 오류 (4xx, 5xx 등)
-            return {"error": f"API 서버 오류: 상태 코드 {e.response.status_code}"}
+            # HTTP 상태 코드 오류 (4xx, 5xx 등). 서버 오류와 429는 재시도합니다.
+            METRICS.inc('upstream_errors', 'HTTPStatusError')
+            status = e.response.status_code
+            return {"error": f"API 서버 오류: 상태 코드 {status}",
+                    "retryable": status >= 500 or status == 429}
         except httpx.RequestError as e:
             # 네트워크 연결 오류, 타임아웃 등
-            return {"error": f"API 요청 실패: {e}"}
+            METRICS.inc('upstream_errors', 'RequestError')
+            return {"error": f"API 요청 실패: {e}", "retryable": True}
+
+    METRICS.inc('upstream_requests')
+    if guard is None:
+        return await attempt()
+    result = await guard.run(attempt)
+    if result.get("circuit_open"):
+        METRICS.inc('upstream_errors', 'circuit_open')
+    return result
 
 
 def describe_wind_components(uuu: float, vvv: float) -> dict:
@@ -108,101 +372,359 @@ def format_wind_speed(wsd_value: float) -> str:
     else: description = "나무 전체가 흔들릴 정도의 매우 강한 바람입니다."
     return f"{wsd_value}m/s, {description}"
 
-def parse_ultra_short_term_weather(api_response: dict) -> dict:
-    # --- 개선 사항 4: 가독성을 위한 category_map 키 이름 변경 ---
-    category_map = {'T1H': '기온(℃)', 'RN1': '1시간 강수량', 'UUU': '동서바람성분(m/s)',
-                    'VVV': '남북바람성분(m/s)', 'REH': '습도(%)', 'PTY': '강수형태',
-                    'VEC': '풍향', 'WSD': '풍속'}
-    pty_map = {'0': '없음', '1': '비', '2': '비/눈', '3': '눈', '5': '빗방울', '6': '빗방울/눈날림', '7': '눈날림'}
-
+def parse_ultra_short_term_weather(api_response: dict, nx: int, ny: int) -> Observation | dict:
+    """응답에서 추출한 값을 숫자형 Observation으로 바꿉니다. 한국어 표현은 format_weather_report에서 만듭니다."""
     if "error" in api_response: return api_response
     try:
-        items = api_response['response']['body']['items']['item']
-    except (KeyError, TypeError):
-        return {"error": "API 응답 데이터 형식이 올바르지 않습니다."}
+        return Observation.from_payload(api_response, nx, ny)
+    except (KeyError, TypeError, AttributeError):
+        return {"error": MALFORMED_ERROR}
 
-    weather_data = {'발표일자': items[0]['baseDate'], '발표시각': items[0]['baseTime']}
-    
-    for item in items:
-        category, value = item['category'], item['obsrValue']
-        if category not in category_map: continue
-        
-        key_name = category_map[category]
-        try:
-            if category == 'RN1': weather_data[key_name] = format_rainfall(float(value))
-            elif category == 'PTY' and value in pty_map: weather_data[key_name] = pty_map[value]
-            elif category == 'WSD': weather_data[key_name] = format_wind_speed(float(value))
-            elif category == 'VEC': weather_data[key_name] = format_wind_direction(float(value))
-            else: weather_data[key_name] = float(value)
-        except (ValueError, TypeError):
-            weather_data[key_name] = value
-
-    if '동서바람성분(m/s)' in weather_data and '남북바람성분(m/s)' in weather_data:
-        uuu = weather_data.pop('동서바람성분(m/s)')
-        vvv = weather_data.pop('남북바람성분(m/s)')
-        weather_data.update(describe_wind_components(uuu, vvv))
-    
-    return weather_data
+
+def render_observation(observation: Observation) -> dict:
+    """Observation의 값을 도구 응답에 쓰는 한국어 표현으로 바꿉니다. (값이 없으면 'N/A')"""
+    o = observation
+    wind = describe_wind_components(o.uuu, o.vvv) if o.uuu is not None and o.vvv is not None else {}
+    return {
+        '기온(℃)': o.t1h if o.t1h is not None else 'N/A',
+        '습도(%)': o.reh if o.reh is not None else 'N/A',
+        '강수형태': PTY_MAP.get(str(o.pty), o.pty) if o.pty is not None else 'N/A',
+        '1시간 강수량': format_rainfall(o.rn1) if o.rn1 is not None else 'N/A',
+        '풍향': format_wind_direction(o.vec) if o.vec is not None else 'N/A',
+        '풍속': format_wind_speed(o.wsd) if o.wsd is not None else 'N/A',
+        '동서성분': wind.get('동서성분', 'N/A'),
+        '남북성분': wind.get('남북성분', 'N/A'),
+    }
+
+
+async def get_observation(app: AppContext, nx: int, ny: int) -> Observation | dict:
+    """격자 좌표의 최신 실황을 캐시를 거쳐 조회합니다. 실패하면 오류 딕셔너리를 반환합니다."""
+    if app.prefetcher is not None:
+        app.prefetcher.record(nx, ny)
+    return await refresh_observation(app, nx, ny)
+
+
+async def fetch_observation(app: AppContext, nx: int, ny: int, hour: datetime) -> Observation | dict:
+    """특정 발표시각(정시)의 실황을 캐시를 거쳐 조회하고, 발표 여부를 PublicationTracker에 알립니다."""
+    base_date, base_time = hour.strftime("%Y%m%d"), hour.strftime("%H00")
+
+    async def fetch():
+        response = await st_forecast(app.client, API_KEY, URL, nx, ny, base_date, base_time, app.guard)
+        with METRICS.timer('stage', 'parse'):
+            return parse_ultra_short_term_weather(response, nx, ny)
+
+    result = await app.cache.get_or_fetch((nx, ny, base_date, base_time), fetch,
+                                          observation_expiry(base_date, base_time))
+    if isinstance(result, Observation):
+        app.publication.record(base_date, base_time, published=True)
+        if app.history is not None:
+            app.history.record(result)
+    elif result.get("result_code") == NO_DATA_CODE:
+        app.publication.record(base_date, base_time, published=False)
+    return result
+
+
+def refresh_in_background(app: AppContext, nx: int, ny: int, hour: datetime):
+    """응답을 기다리지 않고 해당 발표시각 실황을 조회해 캐시에 채웁니다. (같은 요청은 캐시에서 하나로 합쳐짐)"""
+    task = asyncio.ensure_future(fetch_observation(app, nx, ny, hour))
+    app.background.add(task)
+    task.add_done_callback(app.background.discard)
+
+
+def probe_newest(app: AppContext, nx: int, ny: int, hour: datetime) -> tuple[asyncio.Future, bool]:
+    """
+    hour 자료가 발표되었는지 이 격자로 확인하는 시험 요청을 띄웁니다. 정각마다 하나만 진행하며,
+    이미 다른 격자의 시험 요청이 진행 중이면 그 요청을 돌려줍니다. (요청, 이번에 새로 띄웠는지)
+    """
+    probe = app.probes.get(hour)
+    if probe is not None:
+        return probe, False
+    probe = asyncio.ensure_future(fetch_observation(app, nx, ny, hour))
+    app.probes[hour] = probe
+    probe.add_done_callback(lambda _: app.probes.pop(hour, None))
+    app.background.add(probe)
+    probe.add_done_callback(app.background.discard)
+    return probe, True
+
+
+def refresh_after_probe(app: AppContext, nx: int, ny: int, hour: datetime):
+    """
+    격자의 hour 자료를 백그라운드에서 채웁니다. 다른 격자의 시험 요청이 진행 중이면
+    그 결과로 발표가 확인된 뒤에만 요청해, 아직 없는 자료를 격자마다 따로 요청하지 않습니다.
+    """
+    probe, started = probe_newest(app, nx, ny, hour)
+    if started:
+        return
+
+    def on_done(done: asyncio.Future):
+        if not done.cancelled() and done.exception() is None and isinstance(done.result(), Observation):
+            refresh_in_background(app, nx, ny, hour)
+
+    probe.add_done_callback(on_done)
+
+
+async def refresh_observation(app: AppContext, nx: int, ny: int) -> Observation | dict:
+    """
+    요청 빈도 집계 없이 최신 실황을 캐시를 거쳐 조회합니다. (구독 갱신용)
+    최신 정각 자료가 발표되었을 시각이지만 아직 확인되지 않았다면, 이전 자료를 바로 돌려주고
+    최신 자료는 백그라운드에서 가져옵니다. 어떤 경우에도 업스트림을 연달아 두 번 기다리지 않습니다.
+    발표 확인은 정각마다 한 격자의 시험 요청으로만 하고, 나머지 격자는 그 결과를 기다리지 않고 따릅니다.
+    """
+    now = datetime.now()
+    newest = app.publication.newest_hour(now)
+    hour = app.publication.base_hour(now)
+
+    if hour == newest and not app.publication.is_published(hour):
+        result = app.cache.get((nx, ny, hour.strftime("%Y%m%d"), hour.strftime("%H00")))
+        if result is not None:
+            return result
+        # 바로 이전 정각 자료가 있을 때만 그것을 먼저 돌려줍니다. 그보다 오래된 자료는 대체 응답으로만 씁니다.
+        before = hour - timedelta(hours=1)
+        previous = app.cache.get((nx, ny, before.strftime("%Y%m%d"), before.strftime("%H00")))
+        if previous is not None:
+            refresh_after_probe(app, nx, ny, hour)
+            return previous.as_stale()
+        probe, started = probe_newest(app, nx, ny, hour)
+        if started:
+            # 이전 자료도 없으면 시험 요청과 함께 이전 발표시각도 요청해, 최신 자료가 없을 때 다시 요청하지 않도록 합니다.
+            result, fallback = await asyncio.gather(asyncio.shield(probe), fetch_observation(app, nx, ny, before))
+            if isinstance(result, dict) and isinstance(fallback, Observation):
+                return fallback.as_stale()
+        else:
+            # 다른 격자가 확인하는 중이면 이전 자료만 요청합니다. 발표가 확인되면 다음 요청부터 최신 자료를 받습니다.
+            result = await fetch_observation(app, nx, ny, before)
+            if isinstance(result, Observation):
+                return result.as_stale()
+    else:
+        if hour < newest and app.publication.should_probe(now):
+            # 예상보다 일찍 발표되었는지 한 격자로 미리 확인합니다.
+            probe_newest(app, nx, ny, newest)
+        result = await fetch_observation(app, nx, ny, hour)
+
+    if isinstance(result, dict):
+        # 업스트림 장애 시에는 같은 격자의 이전 발표 자료가 있으면 표시를 붙여 대신 제공합니다.
+        stale = app.cache.get_latest(nx, ny, STALE_MAX_AGE)
+        if stale is not None:
+            return stale.as_stale()
+    return result
+
+
+async def prefetch_observation(app: AppContext, nx: int, ny: int) -> Observation | dict:
+    """
+    미리 조회 작업용으로 격자의 최신 정각 실황을 받아 둡니다. refresh_observation과 달리 이전 자료를 먼저 돌려주고
+    최신 자료를 백그라운드에서 받지 않고 끝까지 기다리므로, 모든 업스트림 요청이 미리 조회 작업의
+    동시 요청 제한과 주기별 예산 안에서 이뤄집니다.
+    최신 자료를 받지 못하면 이전 정각 자료를 받아 stale 표시와 함께 반환합니다.
+    """
+    now = datetime.now()
+    newest = app.publication.newest_hour(now)
+    if app.publication.is_published(newest):
+        return await fetch_observation(app, nx, ny, newest)
+    # 발표 확인은 한 격자의 시험 요청으로만 하고, 나머지 격자는 그 결과를 기다리거나 따릅니다.
+    probe, started = app.probes.get(newest), False
+    if probe is None and (app.publication.base_hour(now) == newest or app.publication.should_probe(now)):
+        probe, started = probe_newest(app, nx, ny, newest)
+    result = await asyncio.shield(probe) if probe is not None else None
+    if not started and isinstance(result, Observation):
+        result = await fetch_observation(app, nx, ny, newest)
+    if isinstance(result, Observation):
+        return result
+    fallback = await fetch_observation(app, nx, ny, newest - timedelta(hours=1))
+    return fallback.as_stale() if isinstance(fallback, Observation) else fallback
+
+
+def interpolate_cached(app: AppContext, points: list[tuple[float, float]]) -> list[Observation | None]:
+    """
+    격자가 아직 캐시에 없는 위치(lat, lon)들을 최신 발표시각의 캐시된 이웃 격자 값으로 보간합니다.
+    업스트림을 호출하지 않으며, 보간하지 않은 위치는 None입니다. (격자가 캐시에 있거나 이웃이 부족한 경우)
+    """
+    hour = app.publication.base_hour()
+    base_date, base_time = hour.strftime("%Y%m%d"), hour.strftime("%H00")
+
+    def lookup(nx, ny):
+        value = app.cache.get((nx, ny, base_date, base_time))
+        return value if isinstance(value, Observation) else None
+
+    xy = [KMA_GRID.to_xy(lat, lon) for lat, lon in points]
+    results = interpolate_observations(xy, lookup, base_date, base_time, INTERPOLATE_MIN_NEIGHBORS)
+    hits = sum(r is not None for r in results)
+    METRICS.inc('interpolation', 'hit', hits)
+    METRICS.inc('interpolation', 'miss', len(results) - hits)
+    return results
+
+
+async def get_forecast_table(app: AppContext, kind: str, nx: int, ny: int):
+    """격자의 최신 예보를 캐시를 거쳐 조회합니다. kind는 'ultra'(초단기예보) 또는 'village'(단기예보)"""
+    if kind == 'ultra':
+        url, (base_date, base_time) = ULTRA_URL, ultra_base_datetime()
+    else:
+        url, (base_date, base_time) = VILLAGE_URL, village_base_datetime()
+
+    async def fetch():
+        return await kma_forecast(app.client, API_KEY, url, nx, ny, base_date, base_time, app.guard)
+
+    return await app.forecast_caches[kind].get_or_fetch((nx, ny, base_date, base_time), fetch,
+                                                        forecast_expiry(kind, base_date, base_time))
+
+
+async def get_observation_history(app: AppContext, nx: int, ny: int, hours: int) -> tuple[list[datetime], list]:
+    """
+    최근 hours시간의 발표 시각 목록과 시각별 실황 값(category 배열)을 반환합니다.
+    이력에 없는 시각만 동시에 채워 넣으며, 각 시각은 캐시를 거쳐 같은 요청이 하나로 합쳐집니다.
+    """
+    latest = app.publication.base_hour()
+    times = [latest - timedelta(hours=h) for h in range(hours - 1, -1, -1)]
+    indices = [hour_index(t.strftime("%Y%m%d"), t.strftime("%H00")) for t in times]
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def backfill(t: datetime):
+        async with semaphore:
+            # 조회 결과는 fetch_observation에서 이력에 기록됩니다. (지난 시각은 발표 지연 추정에 쓰이지 않음)
+            await fetch_observation(app, nx, ny, t)
+
+    missing = set(app.history.missing(nx, ny, indices))
+    await asyncio.gather(*(backfill(t) for t, h in zip(times, indices) if h in missing))
+    return times, app.history.series(nx, ny, indices)
 
 
 # 리소스: 위도-경도 매핑
 @mcp.resource("mkweather://location_coords")
 def load_location_coords():
-    """지역명과 위도-경도 좌표(lat, lon) 매핑 데이터"""
-    location_coords = {
-        # 광역시
-        "서울": {"lat": 37.5665, "lon": 126.9780},  # 서울특별시청
-        "부산": {"lat": 35.1796, "lon": 129.0756},  # 부산광역시청
-        "대구": {"lat": 35.8714, "lon": 128.6014},  # 대구광역시청
-        "인천": {"lat": 37.4563, "lon": 126.7052},  # 인천광역시청
-        "광주": {"lat": 35.1601, "lon": 126.8515},  # 광주광역시청
-        "대전": {"lat": 36.3504, "lon": 127.3845},  # 대전광역시청
-        "울산": {"lat": 35.5384, "lon": 129.3114},  # 울산광역시청
-        "세종": {"lat": 36.4801, "lon": 127.2890},  # 세종특별자치시청
-        
-        # 도
-        "경기": {"lat": 37.2749, "lon": 127.0095},  # 경기도청
-        "강원": {"lat": 37.8853, "lon": 127.7342},  # 강원도청
-        "충북": {"lat": 36.6358, "lon": 127.4913},  # 충청북도청
-        "충남": {"lat": 36.3235, "lon": 126.6728},  # 충청남도청 (홍성)
-        "전북": {"lat": 35.8203, "lon": 127.1088},  # 전라북도청 (전주)
-        "전남": {"lat": 34.8164, "lon": 126.4629},  # 전라남도청 (무안)
-        "경북": {"lat": 36.0191, "lon": 128.5059},  # 경상북도청 (안동)
-        "경남": {"lat": 35.2383, "lon": 128.6924},  # 경상남도청 (창원)
-        "제주": {"lat": 33.4996, "lon": 126.5312}   # 제주특별자치도청
-    }
-    return json.dumps(location_coords, ensure_ascii=False)
+    """지역명과 위도-경도 좌표(lat, lon), 격자 좌표(nx, ny) 매핑 데이터"""
+    return LOCATION_COORDS_JSON
 
 # 도구: 지역명으로 위도-경도 반환
 @mcp.tool()
-async def get_coords_by_city(ctx: Context, city: str) -> str:
+@instrument_tool
+async def get_coords_by_city(city: str) -> str:
     """
-    주어진 도시 이름의 위도와 경도 좌표를 조회합니다.
+    주어진 도시(지역) 이름의 위도와 경도 좌표를 조회합니다.
+    정확한 이름이 없으면 접두어나 초성(예: 'ㄷㅈ')으로 후보를 찾아 알려줍니다.
     """
-    try:
-        # 1. 리소스를 읽어오면, [ReadResourceContents] 형태의 리스트가 반환됩니다.
-        resource_result_list = await ctx.read_resource("mkweather://location_coords")
-        
-        # 2. 리스트의 첫 번째 항목은 ReadResourceContents 객체입니다.
-        #    이 객체의 .content 속성에 우리가 원하는 JSON "문자열"이 들어있습니다.
-        location_json_string = resource_result_list[0].content
-
-        # 3. 이제 이 JSON 문자열을 파이썬 "딕셔너리"로 변환합니다.
-        all_coords = json.loads(location_json_string)
-
-        # 4. 드디어 딕셔너리가 되었으니, .get()을 안전하게 사용할 수 있습니다.
-        city_coords = all_coords.get(city)
-
-        # 5. 결과 반환
-        if city_coords:
-            return f"{city}의 좌표는 위도 {city_coords['lat']}, 경도 {city_coords['lon']} 입니다."
-        else:
-            return f"오류: '{city}'에 대한 좌표 정보를 찾을 수 없습니다."
+    exact = PLACES.get(city)
+    if len(exact) == 1:
+        place = exact[0]
+        return f"{city}의 좌표는 위도 {place.lat}, 경도 {place.lon} 입니다."
+
+    candidates = exact or PLACES.lookup(city)
+    if not candidates:
+        return f"오류: '{city}'에 대한 좌표 정보를 찾을 수 없습니다."
 
-    except Exception as e:
-        # 모든 예기치 못한 오류를 처리합니다.
-        return f"오류: 리소스 조회 중 문제가 발생했습니다 - {e}"
+    lines = [f"'{city}'에 해당하는 지역 후보입니다." if not exact
+             else f"'{city}'라는 이름의 지역이 여러 곳 있습니다."]
+    lines += [f"- {p.name}: 위도 {p.lat}, 경도 {p.lon} (격자 X={p.nx}, Y={p.ny})" for p in candidates]
+    return "\n".join(lines)
     
+@mcp.tool()
+@instrument_tool
+async def get_nearest_places(lat: float, lon: float, count: int = 3) -> str:
+    """주어진 위도와 경도에서 가장 가까운 지역 이름을 거리순으로 최대 count개(최대 20개) 찾습니다."""
+    nearest = PLACES.spatial.nearest(lat, lon, max(1, min(count, 20)))
+    if not nearest:
+        return "오류: 등록된 지역 정보가 없습니다."
+    lines = [f"# 가까운 지역 (위도: {lat}, 경도: {lon})"]
+    lines += [f"- {p.name}: 약 {d}km (위도 {p.lat}, 경도 {p.lon}, 격자 X={p.nx}, Y={p.ny})" for p, d in nearest]
+    return "\n".join(lines)
+
+# 리소스: 실황 캐시 통계
+@mcp.resource("mkweather://cache_stats")
+def load_cache_stats():
+    """실황 캐시의 적중/미스 횟수와 현재 크기, 인기 격자 미리 조회 현황"""
+    app = mcp.get_context().request_context.lifespan_context
+    stats = app.cache.stats()
+    if app.prefetcher is not None:
+        stats["prefetch"] = app.prefetcher.stats()
+    if app.subscriptions is not None:
+        stats["subscriptions"] = app.subscriptions.stats()
+    if app.history is not None:
+        stats["history"] = app.history.stats()
+    stats["publication"] = app.publication.stats()
+    if GRID_TABLE is not None:
+        stats["grid_table"] = GRID_TABLE.stats()
+    return json.dumps(stats, ensure_ascii=False)
+
+# 리소스: 업스트림 보호 계층 상태
+@mcp.resource("mkweather://upstream_stats")
+def load_upstream_stats():
+    """업스트림 요청 대기열 길이, 동시 요청 수, 재시도 횟수, 서킷 브레이커 상태, 응답 파싱 실행 현황"""
+    app = mcp.get_context().request_context.lifespan_context
+    stats = app.guard.stats() if app.guard is not None else {}
+    stats["parser"] = PAYLOAD_PARSER.stats()
+    return json.dumps(stats, ensure_ascii=False)
+
+# 리소스: 도구/업스트림 계측 지표
+@mcp.resource("mkweather://metrics")
+def load_metrics():
+    """도구별 요청 수, 단계별 처리 시간, 업스트림 지연/오류, 처리 중인 요청 수"""
+    return json.dumps(METRICS.snapshot(), ensure_ascii=False)
+
+@mcp.resource("mkweather://metrics/prometheus", mime_type="text/plain")
+def load_metrics_prometheus():
+    """계측 지표 (Prometheus 텍스트 형식)"""
+    return METRICS.prometheus()
+
+# HTTP 전송 방식으로 실행할 때는 /metrics 경로로도 수집할 수 있습니다.
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request):
+    from starlette.responses import PlainTextResponse
+    return PlainTextResponse(METRICS.prometheus(), media_type="text/plain; version=0.0.4")
+
+# 리소스: 격자별 최신 실황 (구독하면 새 발표 자료가 들어오거나 값이 바뀔 때만 알림)
+@mcp.resource(OBSERVATION_URI, mime_type="application/json")
+async def load_observation(nx: int, ny: int):
+    """격자 (nx, ny)의 최신 초단기 실황 (get_current_weather_data와 같은 숫자 값)"""
+    if api_key_missing():
+        return json.dumps({"error": API_KEY_ERROR}, ensure_ascii=False)
+    if not (1 <= nx <= GRID_NX and 1 <= ny <= GRID_NY):
+        return json.dumps({"error": f"격자 좌표는 nx 1~{GRID_NX}, ny 1~{GRID_NY} 범위여야 합니다."}, ensure_ascii=False)
+    observation = await get_observation(mcp.get_context().request_context.lifespan_context, nx, ny)
+    if isinstance(observation, dict):
+        return json.dumps({"error": observation['error']}, ensure_ascii=False)
+    return json.dumps(observation.to_dict(), ensure_ascii=False)
+
+
+def observation_cell(uri: AnyUrl) -> tuple[int, int]:
+    match = OBSERVATION_URI_PATTERN.fullmatch(str(uri))
+    if match is None:
+        raise ValueError(f"구독할 수 없는 리소스입니다: {uri} (지원: {OBSERVATION_URI})")
+    nx, ny = int(match[1]), int(match[2])
+    if not (1 <= nx <= GRID_NX and 1 <= ny <= GRID_NY):
+        raise ValueError(f"격자 좌표는 nx 1~{GRID_NX}, ny 1~{GRID_NY} 범위여야 합니다.")
+    return nx, ny
+
+
+@mcp._mcp_server.subscribe_resource()
+async def subscribe_observation(uri: AnyUrl):
+    """
+    격자 실황 리소스를 구독합니다. 격자당 한 번의 조회 결과를 모든 구독 세션에 알리므로,
+    구독자가 늘어도 업스트림 요청은 늘지 않습니다. (알림에는 상태를 유지하는 세션이 필요합니다)
+    """
+    nx, ny = observation_cell(uri)
+    if api_key_missing():
+        raise ValueError(API_KEY_ERROR)
+    ctx = mcp.get_context()
+    app = ctx.request_context.lifespan_context
+    current = await refresh_observation(app, nx, ny)
+    app.subscriptions.subscribe(ctx.session, nx, ny, current if isinstance(current, Observation) else None)
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe_observation(uri: AnyUrl):
+    ctx = mcp.get_context()
+    ctx.request_context.lifespan_context.subscriptions.unsubscribe(ctx.session, *observation_cell(uri))
+
+
+def _get_capabilities(notification_options, experimental_capabilities):
+    # 이 버전의 저수준 서버는 구독 처리기가 있어도 resources.subscribe를 항상 False로 알리므로 바로잡습니다.
+    capabilities = type(mcp._mcp_server).get_capabilities(mcp._mcp_server, notification_options,
+                                                          experimental_capabilities)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+
+mcp._mcp_server.get_capabilities = _get_capabilities
+
 # 위도-경도 조회 프롬프트 추가
 @mcp.prompt()
 def coords_query(location: str) -> str:
@@ -213,27 +735,94 @@ def coords_query(location: str) -> str:
     """
 
 @mcp.tool()
-async def get_current_weather(lat: float, lon: float) -> str:
-    """지정된 위도와 경도를 기반으로 현재 날씨 정보를 조회하여 정리된 문자열로 반환합니다."""
-    if not API_KEY or API_KEY == '<your_api_key>':
-        return "오류: 서버에 API 키가 설정되지 않았습니다. 관리자에게 문의하세요."
+@instrument_tool
+async def get_current_weather(ctx: Context, lat: float, lon: float, include_place: bool = False,
+                              interpolate: bool = False) -> str:
+    """
+    지정된 위도와 경도를 기반으로 현재 날씨 정보를 조회하여 정리된 문자열로 반환합니다.
+    include_place가 True이면 NEAREST_PLACE_MAX_KM 안의 가장 가까운 지역 이름도 함께 표시합니다.
+    interpolate가 True이면 격자가 아직 조회되지 않았을 때 캐시된 주변 격자 값으로 보간한 추정값을 반환합니다.
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
 
-    grid = convert_to_grid(lat, lon)
+    with METRICS.timer('stage', 'grid'):
+        grid = convert_to_grid(lat, lon)
     nx, ny = grid['x'], grid['y']
     
-    my_response = await st_forecast(API_KEY, URL, nx, ny) # 'await' 추가!
-    parsed_weather = parse_ultra_short_term_weather(my_response)
+    app = ctx.request_context.lifespan_context
+    parsed_weather = interpolate_cached(app, [(lat, lon)])[0] if interpolate else None
+    if parsed_weather is None:
+        parsed_weather = await get_observation(app, nx, ny)
+    nearest = PLACES.spatial.nearest(lat, lon, max_km=NEAREST_PLACE_MAX_KM) if include_place else None
+    with METRICS.timer('stage', 'render'):
+        return format_weather_report(lat, lon, nx, ny, parsed_weather, nearest)
+
+
+@mcp.tool(structured_output=True)
+@instrument_tool
+async def get_current_weather_data(ctx: Context, lat: float, lon: float, include_place: bool = False,
+                                   interpolate: bool = False) -> dict[str, Any]:
+    """
+    get_current_weather와 같은 실황을 숫자 값 그대로의 구조화된 데이터로 반환합니다.
+    t1h 기온(℃), rn1 1시간 강수량(mm), uuu/vvv 동서/남북 바람성분(m/s), reh 습도(%),
+    pty 강수형태 코드, vec 풍향(deg), wsd 풍속(m/s). 실패하면 {"error": ...}를 반환합니다.
+    include_place가 True이면 nearest_place에 가까운 지역(없으면 null)을 담습니다.
+    interpolate가 True이면 주변 격자 값으로 보간할 수 있으며, 그 경우 interpolated가 true입니다.
+    """
+    if api_key_missing():
+        return {"error": API_KEY_ERROR}
+
+    grid = convert_to_grid(lat, lon)
+    app = ctx.request_context.lifespan_context
+    observation = interpolate_cached(app, [(lat, lon)])[0] if interpolate else None
+    if observation is None:
+        observation = await get_observation(app, grid['x'], grid['y'])
+    if isinstance(observation, dict):
+        return {"error": observation['error']}
+    data = {"lat": lat, "lon": lon, **observation.to_dict()}
+    if include_place:
+        nearest = PLACES.spatial.nearest(lat, lon, max_km=NEAREST_PLACE_MAX_KM)
+        data["nearest_place"] = {"name": nearest[0][0].name, "distance_km": nearest[0][1]} if nearest else None
+    return data
+
+
+def locate_point(point) -> tuple[float, float, int, int] | str:
+    """배치 입력 한 건을 (위도, 경도, nx, ny)로 바꿉니다. 쓸 수 없는 위치면 오류 문구를 반환합니다."""
+    try:
+        lat, lon = float(point['lat']), float(point['lon'])
+    except (KeyError, TypeError, ValueError):
+        return "잘못된 위치 형식입니다"
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        return "위도와 경도는 유한한 숫자여야 합니다"
+    try:
+        grid = convert_to_grid(lat, lon)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        grid = None
+    if grid is None or not (1 <= grid['x'] <= GRID_NX and 1 <= grid['y'] <= GRID_NY):
+        return "기상청 격자 범위를 벗어난 위치입니다"
+    return lat, lon, grid['x'], grid['y']
+
+
+def format_weather_report(lat: float, lon: float, nx: int, ny: int, observation: Observation | dict,
+                          nearest: list | None = None) -> str:
+    """실황 데이터를 도구 응답용 문자열로 정리합니다. nearest는 (지역, 거리 km) 목록입니다."""
+    if isinstance(observation, dict):
+        return f"날씨 정보를 가져오는 데 실패했습니다: {observation['error']}"
+
+    notice = "- 참고: 최신 자료를 가져오지 못해 이전 발표 자료를 표시합니다.\n" if observation.stale else ""
+    if observation.interpolated:
+        notice += ("- 참고: 이 격자는 아직 조회되지 않아 주변 격자 값으로 보간한 추정값입니다. "
+                   "(강수는 가장 가까운 격자 값)\n")
+    date_str = observation.base_date
+    time_str = observation.base_time
+    parsed_weather = render_observation(observation)
+    place = "".join(f"- 가까운 지역: {p.name} (약 {d}km)\n" for p, d in nearest or ())
 
-    if 'error' in parsed_weather:
-        return f"날씨 정보를 가져오는 데 실패했습니다: {parsed_weather['error']}"
-    
-    date_str = parsed_weather.get('발표일자', '00000000')
-    time_str = parsed_weather.get('발표시각', '0000')
-    
     result = f"""# 현재 날씨 정보 (위도: {lat}, 경도: {lon})
 - 기준 시각: {date_str[:4]}년 {date_str[4:6]}월 {date_str[6:]}일 {time_str[:2]}시 {time_str[2:]}분
 - 격자 좌표: X={nx}, Y={ny}
-
+{place}{notice}
 ## 기상 상태
 - 기온: {parsed_weather.get('기온(℃)', 'N/A')}℃
 - 습도: {parsed_weather.get('습도(%)', 'N/A')}%
@@ -249,9 +838,315 @@ async def get_current_weather(lat: float, lon: float) -> str:
     return result
 
 
+@mcp.tool()
+@instrument_tool
+async def get_current_weather_batch(ctx: Context, points: list[dict[str, Any]], include_place: bool = False,
+                                    interpolate: bool = False) -> str:
+    """
+    여러 위치({"lat": 위도, "lon": 경도} 목록)의 현재 날씨를 한 번에 조회합니다.
+    같은 격자에 속한 위치는 한 번만 조회하며, 일부 위치가 실패해도 나머지 결과는 반환합니다.
+    include_place가 True이면 위치마다 NEAREST_PLACE_MAX_KM 안의 가장 가까운 지역 이름도 표시합니다.
+    interpolate가 True이면 캐시된 주변 격자로 보간할 수 있는 위치는 조회 없이 보간한 추정값을 반환합니다.
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
+    if len(points) > BATCH_MAX_POINTS:
+        return f"오류: 한 번에 최대 {BATCH_MAX_POINTS}개 위치까지 조회할 수 있습니다. (요청: {len(points)}개)"
+
+    app = ctx.request_context.lifespan_context
+
+    # 1. 각 위치를 격자로 변환하고, 중복 격자를 하나로 합칩니다. (잘못된 위치는 오류 문구)
+    point_cells = [locate_point(point) for point in points]
+    valid = [c for c in point_cells if not isinstance(c, str)]
+    nearest = (PLACES.spatial.nearest_many([(c[0], c[1]) for c in valid], max_km=NEAREST_PLACE_MAX_KM)
+               if include_place else [None] * len(valid))
+    # 보간 모드에서는 모든 위치를 한 번에 보간해 보고, 보간하지 못한 위치의 격자만 조회합니다.
+    estimates = interpolate_cached(app, [(c[0], c[1]) for c in valid]) if interpolate else [None] * len(valid)
+    unique_cells = list(dict.fromkeys((c[2], c[3]) for c, e in zip(valid, estimates) if e is None))
+
+    # 2. 고유 격자만 동시 요청 수를 제한하여 병렬로 조회합니다.
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_cell(nx, ny):
+        async with semaphore:
+            try:
+                return await get_observation(app, nx, ny)
+            except Exception as e:
+                # 한 격자의 실패가 배치 전체를 실패시키지 않도록 오류 결과로 바꿉니다.
+                return {"error": f"조회 중 문제가 발생했습니다 - {e}"}
+
+    observations = await asyncio.gather(*(fetch_cell(nx, ny) for nx, ny in unique_cells))
+    by_cell = dict(zip(unique_cells, observations))
+
+    # 3. 입력 순서대로 위치별 결과를 정리합니다.
+    reports = []
+    places, guesses = iter(nearest), iter(estimates)
+    for index, (point, cell) in enumerate(zip(points, point_cells), start=1):
+        if isinstance(cell, str):
+            reports.append(f"# [{index}] 오류: {cell} - {point}")
+            continue
+        lat, lon, nx, ny = cell
+        observation = next(guesses) or by_cell[(nx, ny)]
+        report = format_weather_report(lat, lon, nx, ny, observation, next(places))
+        reports.append(f"# [{index}] " + report.lstrip('# '))
+
+    header = f"요청 위치 {len(points)}개, 조회한 격자 {len(unique_cells)}개"
+    header += f", 보간한 위치 {sum(e is not None for e in estimates)}개\n\n" if interpolate else "\n\n"
+    return header + "\n".join(reports)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_weather_history(ctx: Context, lat: float, lon: float, hours: int = 6) -> str:
+    """
+    지정된 위치의 최근 몇 시간(hours, 최대 24) 동안의 시간별 실황(기온, 습도, 강수량, 풍속)을 조회합니다.
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
+    # 기상청 초단기 실황은 최근 24시간까지만 제공됩니다.
+    limit = min(24, HISTORY_HOURS)
+    if not 1 <= hours <= limit:
+        return f"오류: hours는 1에서 {limit} 사이여야 합니다."
+
+    grid = convert_to_grid(lat, lon)
+    nx, ny = grid['x'], grid['y']
+    times, series = await get_observation_history(ctx.request_context.lifespan_context, nx, ny, hours)
+
+    lines = [f"# 최근 {hours}시간 실황 (위도: {lat}, 경도: {lon})", f"- 격자 좌표: X={nx}, Y={ny}", ""]
+    for t, row in zip(times, series):
+        if np.isnan(row).all():
+            lines.append(f"- {t:%m/%d %H}시: 자료 없음")
+            continue
+        values = {name: float(v) for name, v in zip(HISTORY_FIELDS, row) if not np.isnan(v)}
+        parts = [f"기온 {values['t1h']:.1f}℃" if 't1h' in values else None,
+                 f"습도 {values['reh']:.0f}%" if 'reh' in values else None,
+                 f"강수량 {format_rainfall(values['rn1'])}" if 'rn1' in values else None,
+                 f"풍속 {values['wsd']:.1f}m/s" if 'wsd' in values else None]
+        lines.append(f"- {t:%m/%d %H}시: " + ", ".join(p for p in parts if p))
+    return "\n".join(lines)
+
+
+async def fetch_region(app: AppContext, nx, ny) -> RegionSnapshot:
+    """격자 목록의 실황을 동시 요청 수를 제한하여 조회하고 스냅숏으로 모읍니다. (캐시된 격자는 재사용)"""
+    semaphore = asyncio.Semaphore(REGION_CONCURRENCY)
+
+    async def fetch_cell(x, y):
+        async with semaphore:
+            try:
+                return await refresh_observation(app, x, y)
+            except Exception as e:
+                return {"error": f"조회 중 문제가 발생했습니다 - {e}"}
+
+    observations = await asyncio.gather(*(fetch_cell(x, y) for x, y in zip(nx.tolist(), ny.tolist())))
+    return RegionSnapshot(nx, ny, observations)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_region_snapshot(ctx: Context, region: str = "", lat_min: float | None = None,
+                              lat_max: float | None = None, lon_min: float | None = None,
+                              lon_max: float | None = None, include_data: bool = False) -> str:
+    """
+    지역 이름(예: '서울', '제주') 또는 위도/경도 경계 상자 안의 모든 격자 실황을 모아
+    기온 최저/최고/평균, 강수 격자 비율 등을 요약합니다.
+    include_data가 True이면 category별 격자 배열을 압축 .npz(base64)로 함께 반환합니다.
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
+    if region:
+        if region not in REGIONS:
+            return f"오류: 지원하지 않는 지역입니다. 사용 가능한 지역: {', '.join(REGIONS)}"
+        lat_min, lat_max, lon_min, lon_max = REGIONS[region]
+    elif None in (lat_min, lat_max, lon_min, lon_max) or lat_min > lat_max or lon_min > lon_max:
+        return "오류: region 또는 올바른 경계 상자(lat_min, lat_max, lon_min, lon_max)를 지정해야 합니다."
+
+    nx, ny = cells_in_bbox(lat_min, lat_max, lon_min, lon_max)
+    if len(nx) == 0:
+        return "오류: 경계 상자가 기상청 격자 범위를 벗어났습니다."
+    if len(nx) > REGION_MAX_CELLS:
+        return f"오류: 한 번에 최대 {REGION_MAX_CELLS}개 격자까지 조회할 수 있습니다. (요청 범위: {len(nx)}개)"
+
+    snapshot = await fetch_region(ctx.request_context.lifespan_context, nx, ny)
+    summary = snapshot.summary()
+    title = region or f"위도 {lat_min}~{lat_max}, 경도 {lon_min}~{lon_max}"
+    lines = [f"# 지역 실황 요약 ({title})",
+             f"- 격자 수: {summary['cells']}개 (성공 {summary['ok']}, 실패 {summary['failed']}, 이전 자료 {summary['stale']})",
+             f"- 기준 시각: {', '.join(summary['base_times']) or 'N/A'}"]
+    if 'mean_temp' in summary:
+        lines.append(f"- 기온: 최저 {summary['min_temp']:.1f}℃, 최고 {summary['max_temp']:.1f}℃, "
+                     f"평균 {summary['mean_temp']:.1f}℃")
+    if 'precip_coverage' in summary:
+        lines.append(f"- 강수 격자 비율: {summary['precip_coverage'] * 100:.1f}%")
+    if 'max_wind' in summary:
+        lines.append(f"- 최대 풍속: {summary['max_wind']:.1f}m/s")
+    if include_data:
+        lines.append(f"\n## 격자 배열 (npz, 원점 nx={snapshot.nx0}, ny={snapshot.ny0})\n"
+                     + base64.b64encode(snapshot.to_npz()).decode())
+    return "\n".join(lines)
+
+
+def create_http_app():
+    """
+    네트워크 전송 방식(streamable-http 또는 sse)용 ASGI 앱을 만듭니다.
+    uvicorn 작업 프로세스마다 한 번 호출되며(factory), 공유 자원은 앱 수명 동안 유지됩니다.
+    업스트림 한도는 KOREA_WEATHER_WORKERS(작업 프로세스 수)로 나눠 프로세스마다 적용합니다.
+    """
+    transport = os.environ.get('KOREA_WEATHER_TRANSPORT', 'streamable-http')
+    workers = max(1, int(os.environ.get('KOREA_WEATHER_WORKERS', '1')))
+    if transport == 'sse':
+        app = mcp.sse_app()
+    else:
+        # 여러 작업 프로세스가 한 포트를 나눠 받으므로 세션 상태를 프로세스에 두지 않습니다.
+        mcp.settings.stateless_http = os.environ.get('KOREA_WEATHER_STATELESS', '1') != '0'
+        app = mcp.streamable_http_app()
+
+    inner_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app):
+        global _process_app
+        async with open_app_context(workers) as shared:
+            _process_app = shared
+            try:
+                async with inner_lifespan(starlette_app):
+                    yield
+            finally:
+                _process_app = None
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def private_cache_dir() -> str:
+    """
+    사용자 전용 캐시 디렉터리($XDG_CACHE_HOME/mkweather, 없으면 ~/.cache/mkweather)를 권한 0700으로 만들어 반환합니다.
+    이미 있는 디렉터리가 다른 사용자 소유이거나 다른 사용자에게 열려 있으면 사용하지 않고 종료합니다.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'mkweather')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.name == 'posix':
+        st = os.stat(path)
+        if st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise SystemExit(f"오류: 캐시 디렉터리 {path}를 다른 사용자가 읽거나 쓸 수 있습니다. "
+                             "권한을 0700으로 바꾸거나 KOREA_WEATHER_CACHE_DB로 경로를 지정하세요.")
+    return path
+
+
+def run_network_server(transport: str, host: str, port: int, workers: int,
+                       max_concurrency: int | None, graceful_timeout: float):
+    """uvicorn으로 여러 작업 프로세스를 띄워 한 포트에서 요청을 받습니다."""
+    import uvicorn
+
+    if transport == 'sse' and workers > 1:
+        raise SystemExit("오류: sse 전송 방식은 세션이 프로세스에 묶이므로 작업 프로세스를 1개만 사용할 수 있습니다.")
+    os.environ['KOREA_WEATHER_TRANSPORT'] = transport
+    # 작업 프로세스가 업스트림 한도를 나눠 쓰도록 프로세스 수를 넘겨 줍니다.
+    os.environ['KOREA_WEATHER_WORKERS'] = str(workers)
+    if workers > 1:
+        # 작업 프로세스끼리 실황 캐시를 공유하도록 영속 캐시를 기본으로 켭니다.
+        # 다른 사용자가 미리 만들거나 내용을 바꿀 수 없도록 사용자 전용 디렉터리에 둡니다.
+        if 'KOREA_WEATHER_CACHE_DB' not in os.environ:
+            os.environ['KOREA_WEATHER_CACHE_DB'] = os.path.join(private_cache_dir(), 'observations.db')
+
+    uvicorn.run("weather_server:create_http_app", factory=True, host=host, port=port,
+                workers=workers, limit_concurrency=max_concurrency,
+                timeout_graceful_shutdown=graceful_timeout, log_level=mcp.settings.log_level.lower())
+
+
+def format_forecast_row(table: ForecastTable, i: int) -> str:
+    t = table.times[i]
+    temperature = table.value('TMP', i) if 'TMP' in table.columns else table.value('T1H', i)
+    parts = [f"기온 {temperature}℃" if temperature is not None else None,
+             SKY_MAP.get(str(int(v))) if (v := table.value('SKY', i)) is not None else None,
+             f"강수 {PTY_MAP.get(str(int(v)), v)}" if (v := table.value('PTY', i)) else None,
+             f"강수확률 {v:.0f}%" if (v := table.value('POP', i)) is not None else None,
+             f"강수량 {v}" if (v := table.value('PCP', i) or table.value('RN1', i)) not in (None, '강수없음') else None,
+             f"습도 {v:.0f}%" if (v := table.value('REH', i)) is not None else None,
+             f"풍속 {v}m/s" if (v := table.value('WSD', i)) is not None else None]
+    return f"- {t[4:6]}/{t[6:8]} {t[8:10]}시: " + ", ".join(p for p in parts if p)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_forecast(ctx: Context, lat: float, lon: float, kind: str = "village", hours: int = 12) -> str:
+    """
+    지정된 위치의 시간별 예보를 조회합니다.
+    kind: 'village'(단기예보, 약 3일) 또는 'ultra'(초단기예보, 6시간), hours: 표시할 시간 수
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
+    if kind not in ('village', 'ultra'):
+        return "오류: kind는 'village' 또는 'ultra'만 사용할 수 있습니다."
+
+    grid = convert_to_grid(lat, lon)
+    nx, ny = grid['x'], grid['y']
+    table = await get_forecast_table(ctx.request_context.lifespan_context, kind, nx, ny)
+    if isinstance(table, dict):
+        return f"예보 정보를 가져오는 데 실패했습니다: {table['error']}"
+
+    now = datetime.now().strftime("%Y%m%d%H00")
+    start = next((i for i, t in enumerate(table.times) if t >= now), len(table))
+    rows = [format_forecast_row(table, i) for i in range(start, min(start + hours, len(table)))]
+    title = "초단기예보" if kind == 'ultra' else "단기예보"
+    return (f"# {title} (위도: {lat}, 경도: {lon})\n"
+            f"- 발표 시각: {table.base_date} {table.base_time}\n- 격자 좌표: X={nx}, Y={ny}\n\n"
+            + ("\n".join(rows) if rows else "표시할 예보가 없습니다."))
+
+
+@mcp.tool()
+@instrument_tool
+async def get_daily_forecast(ctx: Context, lat: float, lon: float, days_ahead: int = 1) -> str:
+    """
+    지정된 위치의 하루 예보 요약(최저/최고 기온, 최대 강수확률, 강수 시간대)을 조회합니다.
+    days_ahead: 0=오늘, 1=내일, 2=모레
+    """
+    if api_key_missing():
+        return f"오류: {API_KEY_ERROR}"
+
+    grid = convert_to_grid(lat, lon)
+    nx, ny = grid['x'], grid['y']
+    table = await get_forecast_table(ctx.request_context.lifespan_context, 'village', nx, ny)
+    if isinstance(table, dict):
+        return f"예보 정보를 가져오는 데 실패했습니다: {table['error']}"
+
+    date = (datetime.now() + timedelta(days=days_ahead)).strftime("%Y%m%d")
+    summary = table.daily_summary(date)
+    if summary is None:
+        return f"오류: {date[:4]}년 {date[4:6]}월 {date[6:]}일 예보가 아직 없습니다."
+
+    lines = [f"# {date[:4]}년 {date[4:6]}월 {date[6:]}일 예보 요약 (위도: {lat}, 경도: {lon})",
+             f"- 최저 기온: {summary.get('min_temp', 'N/A')}℃",
+             f"- 최고 기온: {summary.get('max_temp', 'N/A')}℃",
+             f"- 최대 강수확률: {summary.get('max_pop', 'N/A')}%",
+             f"- 최대 풍속: {summary.get('max_wind', 'N/A')}m/s"]
+    precip = summary.get('precip_times')
+    lines.append(f"- 강수 예상 시각: {', '.join(t[:2] + '시' for t in precip)}" if precip else "- 강수 예상 없음")
+    return "\n".join(lines)
 
 
 if __name__ == "__main__":
-    print("MCP 날씨 정보 서버 시작... (종료하려면 Ctrl+C)")
-    print("테스트 메시지를 JSON-RPC 형식으로 입력하세요.")
-    mcp.run(transport='stdio')
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="MCP 날씨 정보 서버")
+    parser.add_argument('--transport', default='stdio', choices=['stdio', 'streamable-http', 'sse'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('KOREA_WEATHER_WORKERS', '1')),
+                        help='작업 프로세스 수 (streamable-http 전용)')
+    parser.add_argument('--max-concurrency', type=int,
+                        default=int(os.environ.get('KOREA_WEATHER_MAX_CONCURRENCY', '0')) or None,
+                        help='작업 프로세스당 동시 처리 요청 수 상한 (초과 시 503)')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0,
+                        help='종료 시 처리 중인 요청을 기다리는 최대 시간(초)')
+    args = parser.parse_args()
+
+    if args.transport == 'stdio':
+        # stdio 전송에서는 표준 출력이 JSON-RPC 채널이므로 안내 문구는 표준 오류로 출력합니다.
+        print("MCP 날씨 정보 서버 시작... (종료하려면 Ctrl+C)", file=sys.stderr)
+        print("테스트 메시지를 JSON-RPC 형식으로 입력하세요.", file=sys.stderr)
+        mcp.run(transport='stdio')
+    else:
+        run_network_server(args.transport, args.host, args.port, args.workers,
+                           args.max_concurrency, args.graceful_timeout)
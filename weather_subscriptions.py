@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import weakref
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def observation_signature(observation) -> tuple:
+    """변경 여부를 비교할 값: 발표시각과 관측 값 (이전 자료/보간 표시는 제외)"""
+    values = observation.to_dict()
+    values.pop('stale', None)
+    values.pop('interpolated', None)
+    return tuple(values.items())
+
+
+class ObservationSubscriptions:
+    """
+    격자별 실황 리소스 구독을 관리하고, 자료가 바뀐 격자의 구독자에게만 변경 알림을 보냅니다.
+
+    - 구독자는 MCP 세션 단위로 약한 참조로 보관하므로, 끊어진 세션은 따로 정리하지 않아도 빠집니다.
+    - interval초마다 구독자가 있는 격자를 격자당 한 번만 refresh()로 조회하고(대부분 캐시 적중),
+      그 결과를 해당 격자의 모든 구독자에게 나눠 보냅니다.
+    - 발표시각이 새로워졌거나 같은 발표시각의 값이 달라졌을 때만 알리며, 이전 발표 자료로는 알리지 않습니다.
+    """
+
+    def __init__(self, refresh: Callable[[int, int], Awaitable[object]], uri: Callable[[int, int], str],
+                 interval: float = 60.0, concurrency: int = 4):
+        self.refresh = refresh
+        self.uri = uri
+        self.interval = interval
+        self.concurrency = concurrency
+        self._subscribers: dict[tuple[int, int], weakref.WeakSet] = {}
+        self._last: dict[tuple[int, int], tuple] = {}
+        self._task: asyncio.Task | None = None
+        self.cycles = 0
+        self.notifications = 0
+        self.failed = 0
+
+    def subscribe(self, session, nx: int, ny: int, current=None):
+        """
+        세션을 격자 구독자로 등록합니다. current는 구독 시점의 자료로, 이후 변경을 판단하는 기준이 됩니다.
+        (없으면 처음 받는 자료부터 알립니다)
+        """
+        self._subscribers.setdefault((nx, ny), weakref.WeakSet()).add(session)
+        if (nx, ny) not in self._last:
+            self._last[(nx, ny)] = observation_signature(current) if current is not None else ()
+
+    def unsubscribe(self, session, nx: int, ny: int):
+        sessions = self._subscribers.get((nx, ny))
+        if sessions is not None:
+            sessions.discard(session)
+
+    def cells(self) -> list[tuple[int, int]]:
+        """구독자가 남아 있는 격자 목록 (구독자가 모두 빠진 격자는 정리합니다)"""
+        for cell in [cell for cell, sessions in self._subscribers.items() if not sessions]:
+            del self._subscribers[cell]
+            self._last.pop(cell, None)
+        return list(self._subscribers)
+
+    def remember(self, observation) -> bool:
+        """격자의 마지막 자료를 갱신하고, 구독자에게 알려야 하는 변경이면 True를 반환합니다."""
+        cell = (observation.nx, observation.ny)
+        signature = observation_signature(observation)
+        last = self._last.get(cell, ())
+        # 앞의 두 항목은 발표일자, 발표시각입니다. 더 오래된 발표 자료는 무시합니다.
+        if signature[:2] < last[:2] or signature == last:
+            return False
+        self._last[cell] = signature
+        return True
+
+    async def publish(self, observation) -> int:
+        """자료가 바뀌었으면 그 격자의 구독자들에게 변경 알림을 보내고, 보낸 수를 반환합니다."""
+        if not self.remember(observation):
+            return 0
+        uri = self.uri(observation.nx, observation.ny)
+        sent = 0
+        for session in list(self._subscribers.get((observation.nx, observation.ny), ())):
+            try:
+                await session.send_resource_updated(uri)
+                sent += 1
+            except Exception:
+                # 이미 닫힌 세션이면 구독에서 뺍니다.
+                logger.debug("구독 알림 전송 실패 (%s)", uri, exc_info=True)
+                self.unsubscribe(session, observation.nx, observation.ny)
+        self.notifications += sent
+        return sent
+
+    async def run_once(self):
+        """구독된 격자를 한 번씩 조회하고 바뀐 격자의 구독자에게 알립니다."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_cell(nx, ny):
+            async with semaphore:
+                try:
+                    result = await self.refresh(nx, ny)
+                except Exception:
+                    logger.exception("구독 격자 (%s, %s) 조회 실패", nx, ny)
+                    result = {"error": "exception"}
+            if isinstance(result, dict):
+                self.failed += 1
+            else:
+                await self.publish(result)
+
+        await asyncio.gather(*(refresh_cell(nx, ny) for nx, ny in self.cells()))
+        self.cycles += 1
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        cells = self.cells()
+        return {
+            "enabled": self._task is not None,
+            "cells": len(cells),
+            "subscribers": sum(len(self._subscribers[cell]) for cell in cells),
+            "interval": self.interval,
+            "cycles": self.cycles,
+            "notifications": self.notifications,
+            "failed": self.failed,
+        }
@@ -0,0 +1,158 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+
+CIRCUIT_OPEN_ERROR = "업스트림 장애가 계속되어 요청을 잠시 차단했습니다. 잠시 후 다시 시도하세요."
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷입니다."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Lock은 먼저 기다린 순서대로 풀리므로 대기 요청이 공정하게 처리됩니다.
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class UpstreamLimiter:
+    """토큰 버킷(초당 요청 수)과 동시 요청 수 제한을 함께 적용하는 컨텍스트 관리자입니다."""
+
+    def __init__(self, rate: float, burst: int, max_inflight: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_inflight = max_inflight
+        self._semaphore = asyncio.Semaphore(max_inflight)
+        self.waiting = 0
+        self.inflight = 0
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        self.inflight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.inflight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"waiting": self.waiting, "inflight": self.inflight, "max_inflight": self.max_inflight,
+                "rate": self.bucket.rate, "burst": self.bucket.burst}
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 threshold번 쌓이면 cooldown초 동안 요청을 바로 거절(open)합니다.
+    cooldown이 지나면 한 건만 시험 삼아 보내고(half_open), 성공하면 다시 정상(closed)으로 돌아갑니다.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_inflight = False
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+            self._trial_inflight = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._trial_inflight:
+            self._trial_inflight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, success: bool):
+        if success:
+            self.state = "closed"
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def abandon_trial(self):
+        """half_open 시험 요청이 결과 없이(취소 등) 끝나면 다음 요청이 다시 시험하게 합니다."""
+        if self.state == "half_open":
+            self._trial_inflight = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class UpstreamGuard:
+    """
+    업스트림 호출에 속도 제한, 재시도(지수 백오프 + 지터), 서킷 브레이커를 적용합니다.
+    attempt()는 결과 딕셔너리를 반환하며, 일시적인 오류에는 "retryable": True를 담습니다.
+    """
+
+    def __init__(self, limiter: UpstreamLimiter, breaker: CircuitBreaker,
+                 max_retries: int = 2, backoff_base: float = 0.2, backoff_max: float = 2.0):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max, base * 2^attempt) 사이의 임의 지연
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def run(self, attempt: Callable[[], Awaitable[dict]]) -> dict:
+        if not self.breaker.allow():
+            return {"error": CIRCUIT_OPEN_ERROR, "circuit_open": True}
+        trial = self.breaker.state == "half_open"
+
+        try:
+            for n in range(self.max_retries + 1):
+                async with self.limiter:
+                    result = await attempt()
+                if not result.get("retryable"):
+                    break
+                if n < self.max_retries:
+                    self.retries += 1
+                    await asyncio.sleep(self.backoff(n))
+        except BaseException:
+            # 취소 등으로 중단되면 업스트림 상태를 알 수 없으므로 실패로 세지 않고, 시험 요청이었다면 자리만 풀어 줍니다.
+            if trial:
+                self.breaker.abandon_trial()
+            raise
+
+        # 인증 오류나 NO_DATA처럼 재시도 대상이 아닌 응답은 업스트림이 정상 동작한 것으로 봅니다.
+        self.breaker.record(success=not result.get("retryable"))
+        return result
+
+    def stats(self) -> dict:
+        return {"limiter": self.limiter.stats(), "breaker": self.breaker.stats(), "retries": self.retries}